@@ -5,7 +5,6 @@ Uses a web browser to search and collect event websites.
 
 import csv
 import logging
-import random
 import time
 import os
 import sys
@@ -21,9 +20,15 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 
 # Import from this directory
 from Web_Browser_Configuration import create_chrome_options
+from Webpage_Reader import check_for_no_results, extract_event_links_from_html, extract_pagination_info
 
 # Import from other directories
-from Shared_Tools_Both_Steps_Use.File_Manager import ensure_directory_exists
+from Shared_Tools_Both_Steps_Use.File_Manager import ensure_directory_exists, event_links_file_name
+from Shared_Tools_Both_Steps_Use.Diagnostics import DiagnosticsRecorder
+from Shared_Tools_Both_Steps_Use.Rate_Limiter import AdaptiveRateController
+from Shared_Tools_Both_Steps_Use.Run_Statistics import RunStatistics
+from Shared_Tools_Both_Steps_Use.Render_Profiles import apply_render_profile_to_driver, measure_driver_page
+from Shared_Tools_Both_Steps_Use.Url_Tools import dedupe_event_links, event_key
 import Main_Settings
 
 class EventbriteFinder:
@@ -32,13 +37,25 @@ class EventbriteFinder:
     Uses a web browser to automatically search through pages of results.
     """
     
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, render_profile=Main_Settings.DEFAULT_RENDER_PROFILE, diagnostics=None):
         """
         Set up the event finder tool with a web browser.
         
         Args:
             headless (bool): Whether to show the browser window (False) or hide it (True)
+            render_profile (str): What the browser downloads ("text-only" or "full")
+            diagnostics (DiagnosticsRecorder, optional): Where screenshots of failed (or sampled)
+                                                         pages go (default from Main_Settings.py)
         """
+        self.render_profile = render_profile
+        self.stats = RunStatistics()
+        self.diagnostics = diagnostics or DiagnosticsRecorder(
+            Main_Settings.OUTPUT_DIRS["screenshots"],
+            mode=Main_Settings.DIAGNOSTICS_MODE,
+            sample_every=Main_Settings.DIAGNOSTICS_SAMPLE_EVERY,
+            max_mb=Main_Settings.DIAGNOSTICS_MAX_MB
+        )
+        
         # Get standard chrome options (with experimental options)
         chrome_options = create_chrome_options(headless)
         
@@ -82,111 +99,254 @@ class EventbriteFinder:
             })
             
             logging.info("Using standard ChromeDriver")
+        
+        # Skip images, fonts, videos, analytics and ads (only the text is needed)
+        apply_render_profile_to_driver(self.driver, self.render_profile)
 
-    def search_multiple_pages(self, base_url, start=1, end=3, run_date="run", delay=5, retry=1):
+    def search_multiple_pages(self, base_url, start=1, end=None, run_date="run", delay=5, retry=1):
         """
         Search multiple pages of Eventbrite results to find comedy events.
         
+        The last page is read from the first results page. The search stops early
+        when a page says there are no results or doesn't add any new events, including
+        a page that still shows no event links after every retry.
+        
         Args:
             base_url (str): The Eventbrite search URL
             start (int): The page number to start from
-            end (int): The page number to end at
+            end (int, optional): The last page to search at most (None to search up to the last results page)
             run_date (str): Timestamp for this search
-            delay (int): How many seconds to wait between page loads
+            delay (int): Shortest wait between page loads in seconds (the pace starts a little slower
+                         and adapts to how Eventbrite responds)
             retry (int): How many times to retry if a page fails to load
             
         Returns:
             list: A list of unique event website addresses
         """
-        logging.info(f"📄 Starting search from page {start} to {end}")
+        logging.info(f"📄 Starting search from page {start}" + (f" to at most page {end}" if end else ""))
+        # Starts at the pace of the old fixed waits (delay to delay + 3 seconds), with some
+        # randomness to look human, and never goes faster than one page every `delay` seconds
+        pacing = AdaptiveRateController(
+            60 / delay if delay > 0 else 0,
+            start_rate=60 / (delay + 1.5) if delay > 0 else None,
+            jitter=0.3,
+            state_file=os.path.join(Main_Settings.OUTPUT_DIRS["pacing"], "host_pace.json"),
+            name="search pages"
+        )
         all_urls = []
+        seen_events = set()
+        last_page = end or start
         
-        # Ensure screenshots directory exists
-        screenshots_dir = f"{Main_Settings.OUTPUT_DIRS['screenshots']}"
-        ensure_directory_exists(screenshots_dir)
-        
-        for i in range(start, end + 1):
+        i = start
+        while i <= last_page:
             url = f"{base_url}?page={i}"
+            stop_reason = None
             logging.info(f"🔍 Searching: {url}")
             
             for attempt in range(retry):
+                pacing.wait_blocking(url)
+                load_started = time.perf_counter()
+                recorded = False
                 try:
                     # Navigate to the page
                     self.driver.get(url)
+                    measure_driver_page(self.driver, self.stats, self.render_profile)
                     
-                    # Wait for page to load with random delay to appear more human-like
-                    time.sleep(random.uniform(delay, delay + 3))
-                    
-                    # Take screenshot for reference
-                    self.driver.save_screenshot(f"{screenshots_dir}/{run_date}_page_{i}_screenshot.png")
+                    # Read all event links from the page's HTML in one go
+                    self._wait_for_event_cards()
+                    extraction_started = time.perf_counter()
+                    html = self.driver.page_source
+                    page_urls = extract_event_links_from_html(html)
+                    extraction_time = time.perf_counter() - extraction_started
+                    self.stats.add_time("link_extraction_time", extraction_time)
+                    self.stats.increment("link_extraction_pages")
+                    rate_limited = is_rate_limit_page(self.driver.title, html)
+                    no_results = check_for_no_results(html)
+                    pacing.record(
+                        url,
+                        status=429 if rate_limited else 0,
+                        latency=extraction_started - load_started,
+                        error=not page_urls and not no_results
+                    )
+                    recorded = True
                     
-                    # Try to find event links with multiple strategies
-                    links = self._extract_links_from_page()
+                    logging.info(f"✅ Found {len(page_urls)} links on page {i} "
+                                 f"(read in {extraction_time * 1000:.0f} ms)")
                     
-                    # Extract URLs
-                    page_urls = [link.get_attribute("href") for link in links if link.get_attribute("href")]
+                    # A page without event links is most likely a bot check or an error page
+                    self.diagnostics.capture_driver(
+                        self.driver,
+                        f"{run_date}_page_{i}" + ("" if page_urls else "_no_links"),
+                        failed=not page_urls
+                    )
                     
-                    logging.info(f"✅ Found {len(page_urls)} links on page {i}")
-                    all_urls.extend(page_urls)
+                    # A "too many requests" or bot check page is not the end of the results:
+                    # try it again (the pace has already slowed down)
+                    if rate_limited or not (page_urls or no_results):
+                        raise PageNotLoadedError("too many requests" if rate_limited else "no event links on the page")
                     
-                    # Wait before moving to next page to be polite to the server
-                    time.sleep(2)
+                    # The first page tells how many pages there are
+                    if i == start:
+                        last_page = choose_last_page(html, start, end)
+                    stop_reason = page_stop_reason(html, page_urls, seen_events)
+                    if not no_results:
+                        all_urls.extend(page_urls)
                     
                     # Break retry loop if successful
                     break
                 
                 except Exception as e:
+                    if not recorded:
+                        pacing.record(url, latency=time.perf_counter() - load_started, error=True)
                     logging.error(f"❌ Failed to extract page {i} on attempt {attempt + 1}: {e}")
-                    self.driver.save_screenshot(f"{screenshots_dir}/{run_date}_error_page_{i}_attempt_{attempt + 1}.png")
+                    if not isinstance(e, PageNotLoadedError):
+                        # Pages without links were already captured above
+                        self.diagnostics.capture_driver(self.driver, f"{run_date}_error_page_{i}_attempt_{attempt + 1}",
+                                                        failed=True)
                     
-                    # If this was the last retry, continue to next page
+                    # If this was the last retry, continue to next page, unless the page kept
+                    # loading without any event links: then there are no new links to find
                     if attempt == retry - 1:
-                        logging.warning(f"⚠️ All {retry} attempts failed for page {i}, moving to next page")
+                        if isinstance(e, PageNotLoadedError):
+                            stop_reason = f"{e} after {retry} attempt{'s' if retry != 1 else ''}"
+                        else:
+                            logging.warning(f"⚠️ All {retry} attempts failed for page {i}, moving to next page")
+                            if i == start:
+                                last_page = choose_last_page("", start, end)
+            
+            if stop_reason:
+                logging.info(f"🛑 Stopping after page {i}: {stop_reason}")
+                break
+            i += 1
+        
+        pacing.close()
+        pages = self.stats.get("link_extraction_pages")
+        if pages:
+            logging.info(f"⏱️ Link extraction: average {self.stats.timings['link_extraction_time'] / pages * 1000:.0f} ms "
+                         f"per page over {pages} pages")
         
         # Return de-duplicated list of URLs
-        return list(set(all_urls))
+        # Keep each event once (by event ID), in the order it was found
+        return dedupe_event_links(all_urls)
 
-    def _extract_links_from_page(self):
-        """
-        Extract event links from the current page using different strategies.
-        
-        Returns:
-            list: WebElement objects representing links
-        """
+    def _wait_for_event_cards(self):
+        """Wait (up to 20 seconds) for the event cards to appear on the current page."""
         try:
-            # Strategy 1: Wait for specific event card links (preferred method)
+            # Wait for specific event card links (preferred method)
             wait = WebDriverWait(self.driver, 20)
-            links = wait.until(EC.presence_of_all_elements_located(
+            wait.until(EC.presence_of_element_located(
                 (By.CSS_SELECTOR, "a.eds-event-card-content__action-link")
             ))
-            return links
         except TimeoutException:
+            # The page reader falls back to any link to an event page
             logging.warning("⚠️ Primary link selector failed, trying alternative method")
-            
-            # Strategy 2: Broader link search as fallback
-            return self.driver.find_elements(By.XPATH, "//a[contains(@href, 'eventbrite.ca/e/')]")
 
-    def save_to_csv(self, urls, filename="event_links.csv", run_date="run"):
+    def save_to_csv(self, urls, filename=None, run_date="run"):
         """
         Save the found event websites to a CSV file.
         
         Args:
             urls (list): List of event website addresses
-            filename (str): Name of the output file
+            filename (str, optional): Name of the output file (event_links_<run_date>.csv by default)
             run_date (str): Timestamp for this run
+            
+        Returns:
+            str: Path of the saved file
         """
-        # Ensure the output directory exists
-        ensure_directory_exists(Main_Settings.OUTPUT_DIRS["links"])
+        return save_links_to_csv(urls, filename=filename, run_date=run_date)
+
+    def close(self):
+        """Close the browser when finished, after the last diagnostic captures are written."""
+        self.driver.quit()
+        self.diagnostics.close()
+
+class PageNotLoadedError(Exception):
+    """A results page loaded, but showed a "too many requests", bot check or error page instead of events."""
+
+def is_rate_limit_page(title, html):
+    """
+    Check whether the browser was shown a "too many requests" page instead of results
+    (the browser doesn't tell us the HTTP status).
+    
+    Args:
+        title (str): Title of the page
+        html (str): The HTML content of the page
         
-        output_path = f"{Main_Settings.OUTPUT_DIRS['links']}/{run_date}_{filename}"
-        logging.info(f"💾 Saving {len(urls)} links to {output_path}")
+    Returns:
+        bool: True if the page says there were too many requests
+    """
+    text = f"{title or ''} {(html or '')[:5000]}".lower()
+    return "too many requests" in text or "429" in (title or "")
+
+def choose_last_page(html, start, end=None):
+    """
+    Decide which page to stop at, using the page count on the first results page.
+    
+    Args:
+        html (str): HTML of the first results page ("" if it could not be loaded)
+        start (int): The page number the search started from
+        end (int, optional): The last page to search at most
         
-        with open(output_path, mode="w", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=["event_link"])
-            writer.writeheader()
-            for url in urls:
-                writer.writerow({"event_link": url})
+    Returns:
+        int: The last page number to search
+    """
+    pagination = extract_pagination_info(html)
+    if pagination["found"]:
+        last_page = min(pagination["total_pages"], end) if end else pagination["total_pages"]
+        logging.info(f"📑 The search has {pagination['total_pages']} pages, searching up to page {last_page}")
+    else:
+        # Page count unknown: search until a page comes back empty, up to the limit
+        last_page = end or start + Main_Settings.MAX_PAGES - 1
+        logging.info(f"📑 Could not read the number of pages, searching up to page {last_page}")
+    return max(start, last_page)
 
-    def close(self):
-        """Close the browser when finished."""
-        self.driver.quit()
\ No newline at end of file
+def page_stop_reason(html, page_urls, seen_events):
+    """
+    Check whether the search should stop after this page.
+    
+    A "no results" page can still show suggested events, so its links should not be kept.
+    A page without any event links is not a reason to stop yet: it is most likely a bot check
+    or a "too many requests" page, which is tried again first. The search only stops on it
+    once every retry came back without links.
+    
+    Args:
+        html (str): HTML of the results page
+        page_urls (list): Event links found on the page
+        seen_events (set): Event keys found on earlier pages (updated with this page's events)
+        
+    Returns:
+        str: Why the search should stop, or "" to go on
+    """
+    if check_for_no_results(html):
+        return "the page says there are no results"
+    
+    page_events = {event_key(url) for url in page_urls}
+    new_events = page_events - seen_events
+    seen_events.update(page_events)
+    if page_events and not new_events:
+        return "the page has no new events"
+    return ""
+
+def save_links_to_csv(urls, filename=None, run_date="run"):
+    """
+    Save event websites to a CSV file in the discovered links folder.
+    
+    Args:
+        urls (list): List of event website addresses
+        filename (str, optional): Name of the output file (event_links_<run_date>.csv by default)
+        run_date (str): Timestamp for this run
+        
+    Returns:
+        str: Path of the saved file
+    """
+    # Ensure the output directory exists
+    ensure_directory_exists(Main_Settings.OUTPUT_DIRS["links"])
+    
+    output_path = f"{Main_Settings.OUTPUT_DIRS['links']}/{filename or event_links_file_name(run_date)}"
+    logging.info(f"💾 Saving {len(urls)} links to {output_path}")
+    
+    with open(output_path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=["event_link"])
+        writer.writeheader()
+        for url in urls:
+            writer.writerow({"event_link": url})
\ No newline at end of file
@@ -0,0 +1,331 @@
+"""
+Tool for finding comedy events on Eventbrite by loading several search result pages at the same time.
+
+Each results page is first downloaded directly (without a browser), which takes
+milliseconds. Pages that don't contain any event links that way are loaded in a
+browser tab instead. A shared rate limiter keeps the total number of page loads
+per minute polite, no matter how many pages are in flight, and slows the
+search down when Eventbrite starts refusing or failing pages.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from typing import Dict, List
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+
+# Import from this directory
+from Event_Finder import choose_last_page, is_rate_limit_page, page_stop_reason
+from Search_Seeds import log_seed_yield
+from Webpage_Reader import check_for_no_results, extract_event_links_from_html
+
+# Import from other directories
+from Shared_Tools_Both_Steps_Use.Diagnostics import DiagnosticsRecorder
+from Shared_Tools_Both_Steps_Use.Http_Client import HttpClient
+from Shared_Tools_Both_Steps_Use.Rate_Limiter import AdaptiveRateController
+from Shared_Tools_Both_Steps_Use.Render_Profiles import attach_render_profile
+from Shared_Tools_Both_Steps_Use.Run_Statistics import RunStatistics
+from Shared_Tools_Both_Steps_Use.Url_Tools import dedupe_event_links
+from Shared_Tools_Both_Steps_Use.Web_Browser_Launcher import get_browser_config
+import Main_Settings
+
+# How pages are loaded: "auto" downloads first and uses the browser only when needed
+FETCH_TIERS = ("auto", "http", "browser")
+
+class ParallelEventFinder:
+    """
+    Searches several pages of Eventbrite results at the same time and collects the event website addresses.
+    """
+
+    def __init__(self, headless=True, render_profile=Main_Settings.DEFAULT_RENDER_PROFILE,
+                 concurrency=4, max_rate=30, fetch_tier="auto", diagnostics=None):
+        """
+        Set up the event finder. The browser is only started if a page needs it.
+
+        Args:
+            headless (bool): Whether to show the browser window (False) or hide it (True)
+            render_profile (str): What the browser downloads ("text-only" or "full")
+            concurrency (int): Maximum number of search pages loaded at the same time
+            max_rate (float): Maximum number of page loads started per minute (0 for no limit);
+                              the actual pace adapts to how Eventbrite responds
+            fetch_tier (str): "auto", "http" (never use the browser) or "browser" (always use the browser)
+            diagnostics (DiagnosticsRecorder, optional): Where HTML snapshots of failed (or sampled)
+                                                         pages go (default from Main_Settings.py)
+        """
+        self.headless = headless
+        self.render_profile = render_profile
+        self.concurrency = max(1, concurrency)
+        self.fetch_tier = fetch_tier
+        self.stats = RunStatistics()
+        self.rate_limiter = AdaptiveRateController(
+            max_rate,
+            max_concurrency=self.concurrency,
+            state_file=os.path.join(Main_Settings.OUTPUT_DIRS["pacing"], "host_pace.json"),
+            name="search pages"
+        )
+        self.http_client = HttpClient(max_connections=self.concurrency)
+        self.diagnostics = diagnostics or DiagnosticsRecorder(
+            Main_Settings.OUTPUT_DIRS["screenshots"],
+            mode=Main_Settings.DIAGNOSTICS_MODE,
+            sample_every=Main_Settings.DIAGNOSTICS_SAMPLE_EVERY,
+            max_mb=Main_Settings.DIAGNOSTICS_MAX_MB
+        )
+        self.run_date = "run"
+        self.seed_results = []
+        self._semaphore = None
+        self._crawler = None
+        self._crawler_lock = None
+
+    async def search_multiple_pages(self, base_url, start=1, end=None, run_date="run", retry=1, on_links=None):
+        """
+        Search multiple pages of Eventbrite results to find comedy events.
+
+        The first page is loaded on its own to read the number of pages; the rest
+        are then loaded at the same time. No more pages are started once a page
+        says there are no results or doesn't add any new events, including a page
+        that still shows no event links after every retry.
+
+        Args:
+            base_url (str): The Eventbrite search URL
+            start (int): The page number to start from
+            end (int, optional): The last page to search at most (None to search up to the last results page)
+            run_date (str): Timestamp for this search
+            retry (int): How many times to retry if a page fails to load
+            on_links (Callable, optional): Called with the links of each page as soon as the page
+                                           is read (pages can finish in any order)
+
+        Returns:
+            list: A list of unique event website addresses, in page order
+        """
+        return await self.search_seeds([base_url], start=start, end=end, run_date=run_date,
+                                       retry=retry, on_links=on_links)
+
+    async def search_seeds(self, seeds, start=1, end=None, run_date="run", retry=1, on_links=None):
+        """
+        Run several Eventbrite searches at the same time.
+
+        All searches share the page limit (--concurrency), the rate limiter and the
+        browser, so adding searches doesn't raise the load on the site.
+
+        Args:
+            seeds (list): Eventbrite search URLs
+            start (int): The page number to start each search from
+            end (int, optional): The last page of each search to load at most
+            run_date (str): Timestamp for this search
+            retry (int): How many times to retry if a page fails to load
+            on_links (Callable, optional): Called with the links of each page as soon as the page is read
+
+        Returns:
+            list: A list of unique event website addresses (searches in the given order, pages in order)
+        """
+        logging.info(f"📄 Starting parallel search of {len(seeds)} "
+                     f"search{'es' if len(seeds) != 1 else ''} from page {start}" +
+                     (f" to at most page {end}" if end else "") + f" ({self.concurrency} pages at a time)")
+        self.run_date = run_date
+        self._crawler_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.perf_counter()
+
+        try:
+            results = await asyncio.gather(*(
+                self._search_seed(seed, start, end, retry, on_links) for seed in seeds
+            ))
+        finally:
+            await self.close()
+
+        elapsed = time.perf_counter() - started
+        logging.info(f"⏱️ Searched {sum(pages for _, pages in results)} pages in {elapsed:.1f}s "
+                     f"({self.stats.get('search_http_pages')} downloaded directly, "
+                     f"{self.stats.get('search_browser_pages')} loaded in the browser, "
+                     f"{self.stats.get('search_failed_pages')} failed)")
+        read_pages = self.stats.get("link_extraction_pages")
+        if read_pages:
+            logging.info(f"⏱️ Link extraction: average "
+                         f"{self.stats.timings['link_extraction_time'] / read_pages * 1000:.0f} ms "
+                         f"per page over {read_pages} pages")
+
+        self.seed_results = [(seed, links, pages) for seed, (links, pages) in zip(seeds, results)]
+        if len(seeds) > 1:
+            log_seed_yield(self.seed_results)
+
+        # Keep each event once (by event ID), in the order it was found
+        return dedupe_event_links([url for links, _ in results for url in links])
+
+    async def _search_seed(self, base_url, start, end, retry, on_links):
+        """
+        Search all pages of one Eventbrite search.
+
+        Args:
+            base_url (str): The Eventbrite search URL
+            start (int): The page number to start from
+            end (int, optional): The last page to search at most
+            retry (int): How many times to retry if a page fails to load
+            on_links (Callable, optional): Called with the links of each page as soon as the page is read
+
+        Returns:
+            tuple: The search's event links in page order, and the number of pages loaded
+        """
+        page_links: Dict[int, List[str]] = {}
+        seen_events = set()
+        stop_after = None
+
+        def finish_page(page_number, links, html):
+            nonlocal stop_after
+            page_links[page_number] = [] if check_for_no_results(html) else links
+            # A page that could not be loaded says nothing about the end of the results, but one
+            # that loaded without any event links on every retry has no new links to give
+            stop_reason = page_stop_reason(html, links, seen_events) if html else ""
+            if html and not links and not stop_reason:
+                stop_reason = f"no event links on the page after {retry} attempt{'s' if retry != 1 else ''}"
+            if on_links and page_links[page_number] and (stop_after is None or page_number <= stop_after):
+                on_links(page_links[page_number])
+            if stop_reason and (stop_after is None or page_number < stop_after):
+                logging.info(f"🛑 No more pages of {base_url} after page {page_number}: {stop_reason}")
+                stop_after = page_number
+
+        async def search_page(page_number):
+            async with self._semaphore:
+                # Don't start pages past the end of the results
+                if stop_after is not None and page_number > stop_after:
+                    return
+                links, html = await self._search_page(f"{base_url}?page={page_number}", page_number, retry)
+                finish_page(page_number, links, html)
+
+        # The first page tells how many pages there are
+        async with self._semaphore:
+            links, html = await self._search_page(f"{base_url}?page={start}", start, retry)
+        last_page = choose_last_page(html, start, end)
+        finish_page(start, links, html)
+        if stop_after is None:
+            await asyncio.gather(*(search_page(i) for i in range(start + 1, last_page + 1)))
+
+        # Put the pages back in order (leaving out any that finished after the end was found),
+        # so the links come out the same as a one-by-one search
+        links = [
+            url for i in sorted(page_links) if stop_after is None or i <= stop_after
+            for url in page_links[i]
+        ]
+        return links, len(page_links)
+
+    async def _search_page(self, url, page_number, retry):
+        """
+        Load one search results page and read its event links, trying again if it fails.
+
+        Args:
+            url (str): Website address of the results page
+            page_number (int): Number of the results page
+            retry (int): How many times to try
+
+        Returns:
+            tuple: Event website addresses found on the page (empty if every attempt failed),
+                   and the page's HTML
+        """
+        html = ""
+        for attempt in range(max(1, retry)):
+            logging.info(f"🔍 Searching: {url}")
+            try:
+                links, html = await self._load_links(url)
+                if check_for_no_results(html):
+                    return [], html
+                rate_limited = is_rate_limit_page("", html)
+                if links and not rate_limited:
+                    logging.info(f"✅ Found {len(links)} links on page {page_number}")
+                    if self.diagnostics.should_capture(failed=False):
+                        self.diagnostics.capture(f"{self.run_date}_page_{page_number}", html=html)
+                    return links, html
+                logging.warning(f"⚠️ {'Too many requests page' if rate_limited else 'No event links found'} "
+                                f"on page {page_number} (attempt {attempt + 1})")
+                if self.diagnostics.should_capture(failed=True):
+                    self.diagnostics.capture(f"{self.run_date}_page_{page_number}_attempt_{attempt + 1}_no_links",
+                                             html=html)
+            except Exception as e:
+                logging.error(f"❌ Failed to extract page {page_number} on attempt {attempt + 1}: {e}")
+
+        logging.warning(f"⚠️ All {retry} attempts failed for page {page_number}, moving to next page")
+        self.stats.increment("search_failed_pages")
+        return [], html
+
+    async def _load_links(self, url):
+        """
+        Get the event links of a results page, downloading it directly first when allowed.
+
+        Args:
+            url (str): Website address of the results page
+
+        Returns:
+            tuple: Event website addresses found on the page, and the page's HTML
+        """
+        if self.fetch_tier != "browser" and self.http_client.available:
+            await self.rate_limiter.wait(url)
+            self.stats.increment("search_http_fetches")
+            try:
+                with self.stats.timer("search_http_time"):
+                    response = await self.http_client.get(url)
+            except BaseException:
+                self.rate_limiter.release(url)
+                raise
+            self.rate_limiter.record_response(url, response)
+            html = response.text if response.ok else ""
+            links = self._read_links(html) if html else []
+            # A "no results" page is a real answer, the browser wouldn't find more
+            if links or self.fetch_tier == "http" or check_for_no_results(html):
+                if links:
+                    self.stats.increment("search_http_pages")
+                return links, html
+            logging.info(f"🌐 Download of {url} had no event links "
+                         f"({response.error or f'status {response.status}'}), using the browser")
+
+        crawler = await self._get_crawler()
+        await self.rate_limiter.wait(url)
+        self.stats.increment("search_browser_fetches")
+        result = None
+        started = time.perf_counter()
+        try:
+            with self.stats.timer("search_browser_time"):
+                result = await crawler.arun(url=url, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS))
+        finally:
+            if result is not None and is_rate_limit_page("", result.html):
+                # The browser doesn't always get the 429 status of a "too many requests" page
+                self.rate_limiter.record(url, status=429, latency=time.perf_counter() - started)
+            else:
+                self.rate_limiter.record_crawl_result(url, result, time.perf_counter() - started)
+        if not result.success:
+            raise RuntimeError(result.error_message or "Page could not be loaded")
+
+        html = result.html or ""
+        links = self._read_links(html)
+        if links:
+            self.stats.increment("search_browser_pages")
+        return links, html
+
+    def _read_links(self, html):
+        """Find the event links in a page's HTML, timing how long it takes."""
+        with self.stats.timer("link_extraction_time"):
+            links = extract_event_links_from_html(html)
+        self.stats.increment("link_extraction_pages")
+        return links
+
+    async def _get_crawler(self) -> AsyncWebCrawler:
+        """Start the shared browser the first time a page needs it (each page then opens its own tab)."""
+        async with self._crawler_lock:
+            if self._crawler is None:
+                crawler = AsyncWebCrawler(config=get_browser_config(self.headless))
+                attach_render_profile(crawler, self.render_profile, self.stats)
+                await crawler.start()
+                self._crawler = crawler
+            return self._crawler
+
+    async def close(self):
+        """Close the browser (if it was started), all open connections and the diagnostics writer."""
+        self.rate_limiter.close()
+        if self._crawler is not None:
+            await self._crawler.close()
+            self._crawler = None
+        await self.http_client.close()
+        self.diagnostics.close()
@@ -5,6 +5,7 @@ Run this script first to collect the websites of all comedy events.
 """
 
 import argparse
+import asyncio
 import logging
 from datetime import datetime
 import sys
@@ -14,27 +15,63 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import from this directory
-from Event_Finder import EventbriteFinder
+from Event_Finder import EventbriteFinder, save_links_to_csv
+from Parallel_Event_Finder import FETCH_TIERS, ParallelEventFinder
+from Search_Seeds import build_search_urls
 
 # Import from other directories
 from Shared_Tools_Both_Steps_Use.File_Manager import ensure_directory_exists
+from Shared_Tools_Both_Steps_Use.Render_Profiles import RENDER_PROFILES, log_render_summary
+from Shared_Tools_Both_Steps_Use.Event_Id_Index import EventIdIndex
+from Shared_Tools_Both_Steps_Use.Diagnostics import DIAGNOSTICS_MODES, DiagnosticsRecorder
 import Main_Settings
 
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Find comedy events on Eventbrite")
     parser.add_argument("--start", type=int, default=1, help="Start page number")
-    parser.add_argument("--end", type=int, default=3, help="End page number")
+    parser.add_argument("--end", type=int, default=None,
+                      help="Last page number to search at most (by default the search stops at the last results page)")
     parser.add_argument("--base-url", type=str, 
                       default=Main_Settings.BASE_URL, 
                       help="Base URL to search")
+    parser.add_argument("--all-searches", action="store_true",
+                      help="Search every location in every category from Main_Settings.py at the same time, "
+                           "instead of only --base-url")
+    parser.add_argument("--locations", type=str,
+                      help="With --all-searches, comma-separated Eventbrite locations instead of SEARCH_LOCATIONS "
+                           "(e.g. canada--toronto,canada--ottawa)")
+    parser.add_argument("--categories", type=str,
+                      help="With --all-searches, comma-separated search terms instead of SEARCH_CATEGORIES "
+                           "(e.g. improv,open-mic-comedy)")
     parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
     parser.add_argument("--retry", type=int, default=Main_Settings.DEFAULT_RETRIES, 
                       help="Number of retries per page")
     parser.add_argument("--browser", type=str, choices=["chrome", "firefox"], 
                       default="chrome", help="Browser to use")
     parser.add_argument("--delay", type=int, default=Main_Settings.DEFAULT_DELAY, 
-                      help="Delay in seconds between requests")
+                      help="Shortest wait in seconds between search pages in the one-by-one search "
+                           "(the pace adapts to how Eventbrite responds)")
+    parser.add_argument("--render-profile", type=str, choices=list(RENDER_PROFILES),
+                      default=Main_Settings.DEFAULT_RENDER_PROFILE,
+                      help="What the browser downloads: " +
+                           "; ".join(f"{name} = {description}" for name, description in RENDER_PROFILES.items()))
+    parser.add_argument("--concurrency", type=int, default=1,
+                      help="Number of search pages to load at the same time (1 keeps the one-by-one browser search)")
+    parser.add_argument("--max-rate", type=float, default=30,
+                      help="Maximum number of search pages to start per minute when --concurrency is above 1 "
+                           "(0 for no limit); the pace adapts to how Eventbrite responds")
+    parser.add_argument("--fetch-tier", type=str, choices=list(FETCH_TIERS), default="auto",
+                      help="When --concurrency is above 1: auto = download pages directly and use the browser only "
+                           "when a page has no event links; http = never use the browser; browser = always use the browser")
+    parser.add_argument("--diagnostics", type=str, choices=list(DIAGNOSTICS_MODES),
+                      default=Main_Settings.DIAGNOSTICS_MODE,
+                      help="When to save screenshots and HTML snapshots of search pages: " +
+                           "; ".join(f"{name} = {description}" for name, description in DIAGNOSTICS_MODES.items()))
+    parser.add_argument("--diagnostics-sample-every", type=int, default=Main_Settings.DIAGNOSTICS_SAMPLE_EVERY,
+                      help="With --diagnostics sampled, capture 1 in this many pages that work")
+    parser.add_argument("--diagnostics-max-mb", type=float, default=Main_Settings.DIAGNOSTICS_MAX_MB,
+                      help="Maximum disk space for captures in megabytes (oldest are deleted first)")
     return parser.parse_args()
 
 def setup_logging(run_date):
@@ -63,34 +100,74 @@ def main():
     setup_logging(run_date)
     
     logging.info("🚀 Starting Event Finder (Step 1)")
-    logging.info(f"📄 Will search pages {args.start} to {args.end}")
+    logging.info(f"📄 Will search from page {args.start} " +
+                 (f"to at most page {args.end}" if args.end else "until the last results page"))
     
     try:
-        # Create and run the event finder
-        finder = EventbriteFinder(headless=args.headless)
-        
-        links = finder.search_multiple_pages(
-            base_url=args.base_url,
-            start=args.start,
-            end=args.end,
-            run_date=run_date,
-            delay=args.delay,
-            retry=args.retry
+        diagnostics = DiagnosticsRecorder(
+            Main_Settings.OUTPUT_DIRS["screenshots"],
+            mode=args.diagnostics,
+            sample_every=args.diagnostics_sample_every,
+            max_mb=args.diagnostics_max_mb
         )
         
+        if args.all_searches or args.concurrency > 1:
+            # Load several search pages at the same time
+            finder = ParallelEventFinder(
+                headless=args.headless,
+                render_profile=args.render_profile,
+                concurrency=args.concurrency,
+                max_rate=args.max_rate,
+                fetch_tier=args.fetch_tier,
+                diagnostics=diagnostics
+            )
+            seeds = [args.base_url]
+            if args.all_searches:
+                seeds = build_search_urls(
+                    args.locations.split(",") if args.locations else None,
+                    args.categories.split(",") if args.categories else None
+                )
+            links = asyncio.run(finder.search_seeds(
+                seeds,
+                start=args.start,
+                end=args.end,
+                run_date=run_date,
+                retry=args.retry
+            ))
+        else:
+            # Create and run the event finder
+            finder = EventbriteFinder(headless=args.headless, render_profile=args.render_profile,
+                                      diagnostics=diagnostics)
+            
+            links = finder.search_multiple_pages(
+                base_url=args.base_url,
+                start=args.start,
+                end=args.end,
+                run_date=run_date,
+                delay=args.delay,
+                retry=args.retry
+            )
+            
+            # Close the browser
+            finder.close()
+        
         # Save the collected links
-        output_file = f"event_links_{run_date}.csv"
-        finder.save_to_csv(links, filename=output_file, run_date=run_date)
+        output_file = save_links_to_csv(links, run_date=run_date)
+        
+        # Remember every event found, so Step 2 can tell which ones it already has
+        event_index = EventIdIndex(os.path.join(Main_Settings.OUTPUT_DIRS["event_index"], "event_index.sqlite3"))
+        new_links = event_index.record_discovered(links, source=os.path.basename(output_file))
+        logging.info(f"🆔 {len(new_links)} new events, {len(links) - len(new_links)} already found by earlier runs")
+        event_index.close()
         
-        # Close the browser
-        finder.close()
+        log_render_summary(finder.stats, args.render_profile)
         
         logging.info(f"🎉 Successfully found {len(links)} event websites")
-        logging.info(f"📁 Results saved to {Main_Settings.OUTPUT_DIRS['links']}/{run_date}_{output_file}")
+        logging.info(f"📁 Results saved to {output_file}")
         
         print("\n================================================")
         print(f"✅ FOUND {len(links)} COMEDY EVENTS!")
-        print(f"✅ SAVED TO: {Main_Settings.OUTPUT_DIRS['links']}/{run_date}_{output_file}")
+        print(f"✅ SAVED TO: {output_file}")
         print("================================================")
         print("🚀 Now you can run STEP 2 to collect detailed information about these events.")
         print("🚀 Run: python Second_Step_Get_Event_Details/Run_This_Second_To_Get_Event_Details.py")
@@ -0,0 +1,61 @@
+"""
+Tools for running many Eventbrite searches (locations and categories) in one go,
+and for seeing which searches are worth their page loads.
+"""
+
+import logging
+import os
+import sys
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Shared_Tools_Both_Steps_Use.Url_Tools import event_key
+import Main_Settings
+
+def build_search_urls(locations=None, categories=None):
+    """
+    Make one Eventbrite search URL for every location in every category.
+
+    Args:
+        locations (list, optional): Eventbrite location names, e.g. "canada--toronto"
+                                    (default: SEARCH_LOCATIONS from Main_Settings.py)
+        categories (list, optional): Eventbrite search terms, e.g. "improv"
+                                     (default: SEARCH_CATEGORIES from Main_Settings.py)
+
+    Returns:
+        list: Search URLs, grouped by location
+    """
+    locations = locations or Main_Settings.SEARCH_LOCATIONS
+    categories = categories or Main_Settings.SEARCH_CATEGORIES
+    return [
+        f"https://www.eventbrite.ca/d/{location.strip()}/{category.strip()}/"
+        for location in locations
+        for category in categories
+    ]
+
+def log_seed_yield(seed_results):
+    """
+    Write how many events each search found to the log, and how many of them
+    no earlier search (in the given order) had already found.
+
+    Args:
+        seed_results (list): (search URL, event links, pages loaded) for each search
+    """
+    all_events = {}
+    for seed, links, _ in seed_results:
+        for key in {event_key(link) for link in links}:
+            all_events.setdefault(key, set()).add(seed)
+
+    found_before = set()
+    logging.info(f"🌱 Yield per search ({len(all_events)} different events in total)")
+    for seed, links, pages in seed_results:
+        events = {event_key(link) for link in links}
+        new_events = events - found_before
+        only_here = [key for key in events if all_events[key] == {seed}]
+        found_before |= events
+        per_page = len(new_events) / pages if pages else 0.0
+        logging.info(f"   {seed}: {pages} pages, {len(events)} events, {len(new_events)} new "
+                     f"({per_page:.1f} new per page), {len(only_here)} found by no other search")
+        if pages and not only_here:
+            logging.info(f"   💡 Every event of {seed} was also found by another search")
@@ -2,9 +2,20 @@
 Tools for reading and extracting information from Eventbrite web pages.
 """
 
+import re
 from bs4 import BeautifulSoup
 from typing import List, Dict
 
+# Page count in the search data Eventbrite embeds in results pages
+PAGE_COUNT_PATTERN = re.compile(r'"page_count"\s*:\s*(\d+)')
+PAGE_NUMBER_PATTERN = re.compile(r'"page_number"\s*:\s*(\d+)')
+
+# Pagination bar of the results page, and the "1 of 12" text in it
+PAGINATION_SELECTORS = "[data-testid*='pagination'], [data-spec*='paginator'], nav[aria-label*='agination'], " \
+                       ".eds-pagination, .pagination-element"
+PAGE_POSITION_PATTERN = re.compile(r"\b(\d+)\s+of\s+(\d+)\b")
+PAGE_LINK_PATTERN = re.compile(r"[?&]page=(\d+)")
+
 def extract_event_links_from_html(html_content: str) -> List[str]:
     """
     Find all event links in the HTML of an Eventbrite search results page.
@@ -19,6 +30,9 @@ def extract_event_links_from_html(html_content: str) -> List[str]:
     
     # Find all links to event detail pages
     anchor_tags = soup.select("a.eds-event-card-content__action-link")
+    if not anchor_tags:
+        # Fallback: any link to an event page (same as the browser's second strategy)
+        anchor_tags = soup.select("a[href*='/e/']")
     
     links = []
     for tag in anchor_tags:
@@ -37,27 +51,56 @@ def extract_pagination_info(html_content: str) -> Dict:
     """
     Find information about page numbers in search results.
     
+    The page count is read from the search data Eventbrite puts in the page
+    ("page_count"), or else from the pagination bar ("1 of 12") or its page links.
+    
     Args:
         html_content (str): The HTML content of the page
         
     Returns:
-        dict: Information about current page and total pages
+        dict: current_page, total_pages and found (False if no page count was found,
+              in which case total_pages is 1)
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-    
-    # This is a placeholder implementation - actual selectors would need to be determined
-    # by examining the Eventbrite HTML structure
     pagination_info = {
         "current_page": 1,
-        "total_pages": 1
+        "total_pages": 1,
+        "found": False
     }
+    if not html_content:
+        return pagination_info
     
-    # Try to find pagination elements
-    pagination_elements = soup.select(".pagination-element")
-    if pagination_elements:
-        # Extract pagination information based on site-specific structure
-        # This would need to be adapted based on actual Eventbrite HTML
-        pass
+    # 1. The search data embedded in the page (most reliable)
+    page_count = PAGE_COUNT_PATTERN.search(html_content)
+    if page_count:
+        page_number = PAGE_NUMBER_PATTERN.search(html_content)
+        pagination_info["total_pages"] = max(1, int(page_count.group(1)))
+        pagination_info["current_page"] = int(page_number.group(1)) if page_number else 1
+        pagination_info["found"] = True
+        return pagination_info
+    
+    soup = BeautifulSoup(html_content, "html.parser")
+    pagination_elements = soup.select(PAGINATION_SELECTORS)
+    
+    # 2. The "1 of 12" text of the pagination bar
+    for element in pagination_elements:
+        position = PAGE_POSITION_PATTERN.search(element.get_text(" "))
+        if position:
+            pagination_info["current_page"] = int(position.group(1))
+            pagination_info["total_pages"] = max(1, int(position.group(2)))
+            pagination_info["found"] = True
+            return pagination_info
+    
+    # 3. The highest page number linked from the pagination bar
+    page_numbers = [
+        int(match.group(1))
+        for element in pagination_elements
+        for link in element.select("a[href]")
+        for match in [PAGE_LINK_PATTERN.search(link["href"])]
+        if match
+    ]
+    if page_numbers:
+        pagination_info["total_pages"] = max(page_numbers)
+        pagination_info["found"] = True
     
     return pagination_info
 
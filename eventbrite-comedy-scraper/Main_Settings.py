@@ -5,6 +5,29 @@ Main settings for the Eventbrite comedy events finder and information collector.
 # Base URL for search results
 BASE_URL = "https://www.eventbrite.ca/d/canada--ontario/stand-up-comedy/"
 
+# Searches run with --all-searches (Step 1) or --discover --all-searches (Step 2):
+# every location is searched in every category, all at the same time
+SEARCH_LOCATIONS = [
+    "canada--ontario",
+    "canada--toronto",
+    "canada--ottawa",
+    "canada--quebec",
+    "canada--montreal",
+    "canada--british-columbia",
+    "canada--vancouver",
+    "canada--alberta",
+    "canada--calgary",
+    "canada--edmonton",
+    "canada--manitoba",
+    "canada--nova-scotia",
+]
+SEARCH_CATEGORIES = [
+    "stand-up-comedy",
+    "improv",
+    "open-mic-comedy",
+    "comedy-festival",
+]
+
 # CSS selector for event cards on search results pages
 CSS_SELECTOR = "div[data-testid='event-card']"
 
@@ -36,9 +59,52 @@ OUTPUT_DIRS = {
     "links": "Collected_Data/Discovered_Event_Websites",
     "details": "Collected_Data/Complete_Event_Descriptions",
     "logs": "Logs",
-    "screenshots": "Logs/Screenshots"
+    "screenshots": "Logs/Screenshots",
+    "page_cache": "Collected_Data/Page_Cache",
+    "extraction_memo": "Collected_Data/Extraction_Memo",
+    "work_queue": "Collected_Data/Work_Queue",
+    "event_versions": "Collected_Data/Event_Versions",
+    "event_index": "Collected_Data/Event_Index",
+    "pacing": "Collected_Data/Pacing"
 }
 
+# Saved event pages (Step 2): how long a saved page stays fresh, and how much disk space the saved pages may use
+PAGE_CACHE_TTL_HOURS = 24
+PAGE_CACHE_MAX_MB = 200
+
+# Maximum number of tokens of each event page sent to the AI (Step 2), after menus, footers
+# and related listings are removed (0 sends the whole page)
+LLM_TOKEN_BUDGET = 1500
+
+# AI models for extracting event details (Step 2), cheapest and fastest first. Each event
+# is sent to the first model; its answer is only sent on to the next model when required
+# fields are missing or don't look right (a model cascade). One model turns the cascade off.
+LLM_MODELS = [
+    "groq/llama-3.1-8b-instant",
+    "groq/deepseek-r1-distill-llama-70b",
+]
+
+# AI provider quotas (Step 2), for each model (Groq's free tier for the default model):
+# requests and tokens per minute, AI calls running at the same time, and the tokens expected
+# in each answer (reasoning models write long answers)
+LLM_REQUESTS_PER_MINUTE = 30
+LLM_TOKENS_PER_MINUTE = 6000
+LLM_MAX_IN_FLIGHT = 2
+LLM_EXPECTED_OUTPUT_TOKENS = 1000
+
+# Events whose details were collected less than this many hours ago are not loaded again (Step 2)
+RECOLLECT_AFTER_HOURS = 24
+
+# Render profile used by both steps: "text-only" blocks images, fonts, videos, scripts from
+# other websites, analytics, ads and map tiles; "full" loads everything like a normal browser
+DEFAULT_RENDER_PROFILE = "text-only"
+
+# Diagnostic captures (screenshots and HTML snapshots): "off", "on-failure" or "sampled"
+# (failures plus 1 in every DIAGNOSTICS_SAMPLE_EVERY pages), kept within DIAGNOSTICS_MAX_MB of disk space
+DIAGNOSTICS_MODE = "on-failure"
+DIAGNOSTICS_SAMPLE_EVERY = 10
+DIAGNOSTICS_MAX_MB = 50
+
 # File paths
 DEFAULT_LINKS_FILE = "event_links.csv"
 DEFAULT_DETAILS_FILE = "detailed_events.csv"
@@ -0,0 +1,138 @@
+"""
+Tools for extracting several events with a single smart text analyzer (AI/LLM) call.
+
+The trimmed pages of a few events are packed into one prompt, and the AI returns
+a list with one entry per event. This sends the instructions and information
+structure once instead of once per event, and uses fewer of the AI provider's
+requests-per-minute. Any event whose entry is missing or incomplete is
+extracted again on its own. In a model cascade the batch goes to the first
+model, and an entry that doesn't look right goes on to the next model.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Event_Detail_Stages import (
+    ExtractionJob,
+    FetchedPage,
+    StageContext,
+    complete_extraction,
+    extract_job_with_llm,
+    prepare_extraction,
+    run_llm,
+)
+from Event_Information_Collector import find_invalid_fields
+from Shared_Tools_Both_Steps_Use.Url_Tools import event_key
+
+def pack_event_sections(jobs: List[ExtractionJob]) -> str:
+    """
+    Put the trimmed pages of several events into one piece of text.
+
+    Args:
+        jobs (List[ExtractionJob]): Prepared jobs that need the AI
+
+    Returns:
+        str: One section per event, each starting with its number and event_link
+    """
+    sections = []
+    for number, job in enumerate(jobs, start=1):
+        sections.append(f"### EVENT {number}\nevent_link: {job.page.url}\n\n{job.content}")
+    return "\n\n---\n\n".join(sections)
+
+async def extract_event_details_batch(context: StageContext, pages: List[FetchedPage]) -> List[Optional[Dict]]:
+    """
+    Extract the event details of several pages, using one AI call for all pages that need it.
+
+    Args:
+        context (StageContext): Shared stage context
+        pages (List[FetchedPage]): The loaded event pages
+
+    Returns:
+        List[Optional[Dict]]: Event data for each page, in the same order (None where extraction failed)
+    """
+    jobs = [prepare_extraction(context, page) for page in pages]
+    pending = [job for job in jobs if not job.done]
+    answers = {}
+
+    if len(pending) == 1:
+        answers[id(pending[0])] = await extract_job_with_llm(context, pending[0])
+    elif pending:
+        answers = await _extract_pending_batch(context, pending)
+
+    return [job.event if job.done else answers.get(id(job)) for job in jobs]
+
+async def _extract_pending_batch(context: StageContext, pending: List[ExtractionJob]) -> Dict[int, Optional[Dict]]:
+    """
+    Run one AI call for several jobs and match each answer to its event.
+
+    Args:
+        context (StageContext): Shared stage context
+        pending (List[ExtractionJob]): Prepared jobs that need the AI
+
+    Returns:
+        Dict[int, Optional[Dict]]: Event data for each job, keyed by id(job)
+    """
+    # Ask for every field that any of the events is missing
+    fields = [key for key in context.required_keys if any(key in job.missing for job in pending)]
+    strategy = context.llm_strategy.for_batch(fields)
+    content = pack_event_sections(pending)
+
+    logging.info(f"📦 Extracting {len(pending)} events with one AI call")
+    context.stats.increment("llm_batches")
+    context.stats.increment("llm_batched_events", len(pending))
+
+    # The one AI call is counted for each event in the batch
+    address = strategy.batch_address([job.page.url for job in pending])
+
+    items = []
+    started = time.perf_counter()
+    try:
+        with context.stats.timer("extract_time"):
+            extracted = await run_llm(context, strategy, address, content)
+        items = [item for item in extracted if isinstance(item, dict)]
+    except Exception as e:
+        logging.error(f"❌ Batch AI call failed: {e}")
+
+    seconds_per_event = (time.perf_counter() - started) / len(pending)
+
+    by_link = {}
+    for item in items:
+        link = item.get("event_link")
+        if isinstance(link, str) and link:
+            by_link.setdefault(event_key(link), item)
+
+    answers = {}
+    for job in pending:
+        item = by_link.get(event_key(job.page.url))
+        invalid = find_invalid_fields(item, [key for key in job.missing if key != "event_link"]) if item else []
+        complete = bool(item) and not any(reason.endswith("(missing)") for reason in invalid)
+        if complete and (not invalid or strategy.next_tier is None):
+            strategy.cascade.record(strategy.provider, seconds_per_event, accepted=True)
+            answers[id(job)] = complete_extraction(context, job, item, json.dumps([item]))
+            continue
+
+        if item:
+            strategy.cascade.record(strategy.provider, seconds_per_event, accepted=False)
+        if item and job.strategy.next_tier is not None:
+            # This model already answered for the event; go straight to the next one
+            job.strategy = job.strategy.next_tier
+            logging.info(f"🪜 Batch answer for {job.page.url} not kept ({', '.join(invalid)}), "
+                         f"asking {job.strategy.provider}")
+        else:
+            # Missing or malformed entry: extract this event on its own
+            logging.warning(f"⚠️ Batch answer missing or incomplete for {job.page.url}, extracting it on its own")
+        context.stats.increment("llm_batch_fallbacks")
+        try:
+            answers[id(job)] = await extract_job_with_llm(context, job)
+        except Exception as e:
+            logging.error(f"❌ Error extracting {job.page.url}: {e}")
+            answers[id(job)] = None
+
+    return answers
@@ -0,0 +1,214 @@
+"""
+A pool of long-lived browsers for collecting event details.
+
+Starting a browser takes several seconds, so instead of starting a new one for
+every small batch of links, a few browsers are kept running and shared.
+A browser is replaced (recycled) when it has served a set number of pages,
+when its memory use grows too large, or after several errors in a row.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, List, Optional, Set
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+# psutil is listed in requirements.txt; without it, browsers are not recycled based on memory use
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+class PooledBrowser:
+    """
+    One browser in the pool, with the numbers used to decide when to recycle it.
+    """
+
+    def __init__(self, number: int):
+        """
+        Set up an empty pool slot.
+
+        Args:
+            number (int): Slot number (for log messages)
+        """
+        self.number = number
+        self.crawler: Optional[AsyncWebCrawler] = None
+        self.pages_served = 0
+        self.error_streak = 0
+        self.in_use = 0
+        self.process_ids: Set[int] = set()
+        self.recycle_reason = ""
+
+    def record_result(self, success: bool) -> None:
+        """
+        Record a page load with this browser and whether it worked.
+
+        Args:
+            success (bool): True if the page loaded
+        """
+        self.pages_served += 1
+        self.error_streak = 0 if success else self.error_streak + 1
+
+    def memory_mb(self) -> float:
+        """
+        Get the memory used by this browser's processes.
+
+        Returns:
+            float: Resident memory in megabytes (0 if it can't be measured)
+        """
+        if not psutil:
+            return 0.0
+
+        total = 0
+        for pid in self.process_ids:
+            try:
+                process = psutil.Process(pid)
+                total += process.memory_info().rss
+                total += sum(child.memory_info().rss for child in process.children(recursive=True))
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+
+class BrowserPool:
+    """
+    Keeps a few browsers running and hands them out to workers, recycling them on a policy.
+    """
+
+    def __init__(
+        self,
+        browser_config_factory: Callable[[], BrowserConfig],
+        size: int = 1,
+        max_pages: int = 50,
+        max_memory_mb: float = 1500,
+        max_error_streak: int = 3,
+        setup: Optional[Callable[[AsyncWebCrawler], None]] = None,
+    ):
+        """
+        Set up the pool.
+
+        Args:
+            browser_config_factory (Callable): Returns the configuration for a new browser
+            size (int): Number of browsers to keep running
+            max_pages (int): Recycle a browser after this many pages (0 for never)
+            max_memory_mb (float): Recycle a browser using more memory than this (0 for never)
+            max_error_streak (int): Recycle a browser after this many failed pages in a row (0 for never)
+            setup (Callable, optional): Called with each new crawler before it starts (e.g. to add hooks)
+        """
+        self.browser_config_factory = browser_config_factory
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.max_error_streak = max_error_streak
+        self.setup = setup
+        self.browsers: List[PooledBrowser] = [PooledBrowser(number) for number in range(1, max(1, size) + 1)]
+
+        self.cold_starts = 0
+        self.launch_seconds = 0.0
+        self.recycles = {}
+        self._lock = asyncio.Lock()
+        self._available = asyncio.Condition(self._lock)
+
+    def _child_process_ids(self) -> Set[int]:
+        """Get the IDs of all processes started by this program."""
+        if not psutil:
+            return set()
+        return {child.pid for child in psutil.Process().children(recursive=False)}
+
+    async def _launch(self, browser: PooledBrowser) -> None:
+        """Start a browser in a pool slot (called with the lock held, so launches never overlap)."""
+        before = self._child_process_ids()
+        started = time.perf_counter()
+
+        crawler = AsyncWebCrawler(config=self.browser_config_factory())
+        if self.setup:
+            self.setup(crawler)
+        await crawler.start()
+
+        elapsed = time.perf_counter() - started
+        self.cold_starts += 1
+        self.launch_seconds += elapsed
+
+        browser.crawler = crawler
+        browser.pages_served = 0
+        browser.error_streak = 0
+        browser.recycle_reason = ""
+        browser.process_ids = self._child_process_ids() - before
+        logging.info(f"🚀 Started browser {browser.number} in {elapsed:.1f}s")
+
+    async def _shut_down(self, browser: PooledBrowser) -> None:
+        """Close the browser in a pool slot, leaving the slot empty and ready for a new browser."""
+        crawler, browser.crawler = browser.crawler, None
+        browser.process_ids = set()
+        browser.pages_served = 0
+        browser.error_streak = 0
+        browser.recycle_reason = ""
+        if crawler:
+            try:
+                await crawler.close()
+            except Exception as e:
+                logging.warning(f"⚠️ Error closing browser {browser.number}: {e}")
+
+    def _check_recycle(self, browser: PooledBrowser) -> None:
+        """Mark a browser for recycling if it has reached any limit of the policy."""
+        if browser.recycle_reason:
+            return
+        if self.max_pages and browser.pages_served >= self.max_pages:
+            browser.recycle_reason = "pages served"
+        elif self.max_error_streak and browser.error_streak >= self.max_error_streak:
+            browser.recycle_reason = "error streak"
+        elif self.max_memory_mb and browser.memory_mb() > self.max_memory_mb:
+            browser.recycle_reason = "memory"
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        Borrow a browser from the pool for one or more page loads.
+
+        Yields:
+            PooledBrowser: The browser (use its .crawler, and call record_result() after each page)
+        """
+        async with self._available:
+            while True:
+                # Browsers waiting to be recycled are restarted once nobody is using them
+                for browser in self.browsers:
+                    if browser.recycle_reason and browser.in_use == 0:
+                        reason = browser.recycle_reason
+                        self.recycles[reason] = self.recycles.get(reason, 0) + 1
+                        logging.info(f"♻️ Recycling browser {browser.number} ({reason}, "
+                                     f"{browser.pages_served} pages served)")
+                        await self._shut_down(browser)
+
+                usable = [browser for browser in self.browsers if not browser.recycle_reason]
+                if usable:
+                    break
+                await self._available.wait()
+
+            # Hand out the least busy browser, starting it if needed
+            browser = min(usable, key=lambda item: item.in_use)
+            if not browser.crawler:
+                await self._launch(browser)
+            browser.in_use += 1
+
+        try:
+            yield browser
+        except Exception:
+            browser.record_result(False)
+            raise
+        finally:
+            async with self._available:
+                browser.in_use -= 1
+                self._check_recycle(browser)
+                self._available.notify_all()
+
+    async def close(self) -> None:
+        """Close every browser in the pool."""
+        async with self._lock:
+            for browser in self.browsers:
+                await self._shut_down(browser)
+
+    def log_stats(self) -> None:
+        """Write browser start and recycling statistics to the log."""
+        recycles = ", ".join(f"{count} for {reason}" for reason, count in self.recycles.items()) or "none"
+        logging.info(f"🚀 Browser pool: {len(self.browsers)} browsers, {self.cold_starts} cold starts, "
+                     f"{self.launch_seconds:.1f}s spent starting browsers, recycles: {recycles}")
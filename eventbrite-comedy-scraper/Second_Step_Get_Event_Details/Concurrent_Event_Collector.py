@@ -0,0 +1,105 @@
+"""
+Tools for collecting event details from several event pages at the same time.
+All pages share one browser, and a rate limiter keeps the total request rate polite.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+from Event_Detail_Stages import StageContext, collect_event_details, record_failure
+
+class OrderedResultBuffer:
+    """
+    Holds results that finish out of order and releases them in the
+    original order of the links.
+    """
+
+    def __init__(self):
+        """Set up an empty buffer."""
+        self._pending = {}
+        self._next_index = 0
+
+    def add(self, index: int, event: Optional[Dict]) -> List[Dict]:
+        """
+        Store the result for one link.
+
+        Args:
+            index (int): Position of the link in the original list
+            event (Optional[Dict]): Extracted event data (None if extraction failed)
+
+        Returns:
+            List[Dict]: Events that are now ready to be saved, in link order
+        """
+        self._pending[index] = event
+        ready = []
+        while self._next_index in self._pending:
+            event = self._pending.pop(self._next_index)
+            if event:
+                ready.append(event)
+            self._next_index += 1
+        return ready
+
+async def collect_events_concurrently(
+    links: List[str],
+    context: StageContext,
+    concurrency: int,
+    on_ready: Optional[Callable[[List[Dict]], None]] = None,
+) -> List[Dict]:
+    """
+    Collect event details from many links with several pages in flight at once.
+    The context's rate limiter (if any) limits how often new pages are started.
+
+    Args:
+        links (List[str]): Event links to process
+        context (StageContext): Shared stage context (crawler, AI strategy, statistics)
+        concurrency (int): Maximum number of pages in flight
+        on_ready (Callable, optional): Called with each group of events that is ready
+                                       to be saved, always in link order
+
+    Returns:
+        List[Dict]: Successfully extracted events, in the same order as the links
+    """
+    work = asyncio.Queue()
+    for index, link in enumerate(links):
+        work.put_nowait((index, link))
+
+    results = [None] * len(links)
+    buffer = OrderedResultBuffer()
+
+    async def worker(worker_num):
+        while True:
+            try:
+                index, link = work.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            logging.info(f"🔍 [worker {worker_num}] Processing {index + 1}/{len(links)}: {link}")
+            event = None
+            error = ""
+            try:
+                # No session ID, so the browser tab is closed as soon as the page is done
+                event = await collect_event_details(context, link)
+
+                if event:
+                    logging.info(f"✅ Successfully extracted details for event: {event.get('title', 'Unknown')}")
+                else:
+                    logging.warning(f"⚠️ Failed to extract details from: {link}")
+
+            except Exception as e:
+                # One broken link should never stop the other workers
+                logging.error(f"❌ Error processing {link}: {e}")
+                error = str(e)
+
+            if not event:
+                record_failure(context, link, error)
+
+            results[index] = event
+            ready = buffer.add(index, event)
+            if ready and on_ready:
+                on_ready(ready)
+
+    worker_count = max(1, min(concurrency, len(links)))
+    await asyncio.gather(*(worker(num) for num in range(1, worker_count + 1)))
+
+    return [event for event in results if event]
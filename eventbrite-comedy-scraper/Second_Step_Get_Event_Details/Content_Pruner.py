@@ -0,0 +1,126 @@
+"""
+Tools for trimming an event page down to the parts the smart text analyzer (AI/LLM) needs.
+
+An Eventbrite event page converted to markdown also contains menus, footers,
+"more events" carousels and related listings. None of that helps the AI, but
+every word of it costs tokens and time. This keeps only the event title block,
+the date/location block, the event description and the organizer section,
+within a set token budget.
+"""
+
+import math
+import re
+from typing import List, Tuple
+
+# Rough number of characters per token for English text
+CHARS_PER_TOKEN = 4
+
+# Sections worth keeping, from most to least important.
+# If the budget runs out, the least important sections are trimmed first.
+KEEP_SECTIONS = [
+    ("date", re.compile(r"date|time|when", re.IGNORECASE)),
+    ("location", re.compile(r"location|where|venue", re.IGNORECASE)),
+    ("organizer", re.compile(r"organi[sz]ed by|organi[sz]er|host|presented by|contact", re.IGNORECASE)),
+    ("about", re.compile(r"about|description|overview|details|good to know|highlights|agenda|line-?up", re.IGNORECASE)),
+]
+
+# Sections that are never about this event
+DROP_SECTIONS = re.compile(
+    r"more events|other events|you may like|similar|related|popular|tags|refund|report this event|"
+    r"share (this|with)|site navigation|use eventbrite|plan events|find events|connect with us|"
+    r"follow|frequently asked|cookie",
+    re.IGNORECASE,
+)
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*)$")
+IMAGE_PATTERN = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+LINK_PATTERN = re.compile(r"\[([^\]]*)\]\((?!mailto:)[^)]*\)")
+LINK_ONLY_LINE = re.compile(r"^\s*([*+-]\s*)?(\[[^\]]*\]\([^)]*\)\s*[|·•]?\s*)+$")
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate how many tokens a piece of text will use.
+
+    Args:
+        text (str): The text to measure
+
+    Returns:
+        int: Approximate number of tokens
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+def prune_event_markdown(markdown: str, token_budget: int = 1500) -> str:
+    """
+    Keep only the parts of an event page that describe the event.
+
+    Args:
+        markdown (str): The event page as markdown
+        token_budget (int): Maximum number of tokens to keep (0 or less keeps everything)
+
+    Returns:
+        str: The trimmed page
+    """
+    if not markdown or token_budget <= 0:
+        return markdown
+
+    sections = _split_sections(_clean_lines(markdown))
+
+    # Pick the sections to keep: the title block (first top-level heading) first, then by importance
+    title_index = next((index for index, (level, _, _) in enumerate(sections) if level == 1), 0)
+    chosen = []
+    for index, (level, heading, text) in enumerate(sections):
+        if index == title_index:
+            chosen.append((0, index, text))
+            continue
+        if not heading or DROP_SECTIONS.search(heading):
+            continue
+        for priority, (_, pattern) in enumerate(KEEP_SECTIONS, start=1):
+            if pattern.search(heading):
+                chosen.append((priority, index, text))
+                break
+
+    # Nothing recognizable on the page: fall back to the cleaned page
+    if len(chosen) <= 1:
+        chosen = [(0, index, text) for index, (_, _, text) in enumerate(sections)]
+
+    # Fill the budget in order of importance, trimming the section that doesn't fit
+    kept = []
+    remaining = token_budget * CHARS_PER_TOKEN
+    for _, index, text in sorted(chosen):
+        if remaining <= 0:
+            break
+        if len(text) > remaining:
+            text = text[:remaining].rsplit(" ", 1)[0] + " …"
+        kept.append((index, text))
+        remaining -= len(text)
+
+    # Put the kept sections back in page order
+    return "\n\n".join(text for _, text in sorted(kept)).strip()
+
+def _clean_lines(markdown: str) -> List[str]:
+    """Remove images, menu lines made only of links, and link addresses."""
+    lines = []
+    for line in markdown.splitlines():
+        line = IMAGE_PATTERN.sub("", line)
+        if LINK_ONLY_LINE.match(line):
+            continue
+        line = LINK_PATTERN.sub(r"\1", line).rstrip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return lines
+
+def _split_sections(lines: List[str]) -> List[Tuple[int, str, str]]:
+    """Split markdown lines into (heading level, heading, text) sections."""
+    sections = []
+    level, heading, current = 0, "", []
+    for line in lines:
+        match = HEADING_PATTERN.match(line)
+        if match:
+            if any(part.strip() for part in current):
+                sections.append((level, heading, "\n".join(current).strip()))
+            level, heading, current = len(match.group(1)), match.group(2).strip(), [line]
+        else:
+            current.append(line)
+    if any(part.strip() for part in current):
+        sections.append((level, heading, "\n".join(current).strip()))
+    return sections
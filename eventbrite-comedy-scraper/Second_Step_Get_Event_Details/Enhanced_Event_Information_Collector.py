@@ -51,7 +51,7 @@ def get_enhanced_browser_config(headless: bool = True) -> BrowserConfig:
         slowMo=random.randint(50, 100),  # Random slight delay between actions
     )
 
-def add_anti_detection_scripts(page):
+async def add_anti_detection_scripts(page):
     """
     Add JavaScript-based anti-detection measures to a page.
     
@@ -94,7 +94,7 @@ def add_anti_detection_scripts(page):
     
     # Execute each script
     for script in scripts:
-        page.evaluate(script)
+        await page.evaluate(script)
 
 async def visit_with_random_behavior(crawler, url, config):
     """
@@ -0,0 +1,590 @@
+"""
+The two stages of collecting event details:
+1. Fetch stage: download the event page (or load it in the browser when the
+   downloaded page is incomplete) and turn it into markdown
+2. Extract stage: read the page's structured data, then ask the smart text analyzer (AI/LLM)
+   for any event details that are still missing
+
+Keeping the stages separate lets the browser and the AI work at the same time
+on different events (see Event_Pipeline.py).
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+from Event_Information_Collector import find_invalid_fields, parse_extracted_content
+from Extraction_Memo import memo_key
+from Event_Version_Store import content_fingerprint
+from Structured_Data_Reader import extract_structured_event_data, has_structured_event_data
+from Content_Pruner import estimate_tokens, prune_event_markdown
+
+# A downloaded page with less text than this is treated as incomplete (e.g. a loading or bot-check page)
+MIN_EVENT_BODY_CHARS = 400
+
+@dataclass
+class FetchedPage:
+    """
+    An event page that has been loaded and converted to text.
+    """
+    url: str
+    markdown: str = ""
+    html: str = ""
+    success: bool = True
+    error_message: str = ""
+    from_cache: bool = False
+    # Headers and content fingerprint, remembered for the next run's incremental re-crawl
+    etag: str = ""
+    last_modified: str = ""
+    fingerprint: str = ""
+    # The record collected last time, when the page hasn't changed since
+    previous_event: Optional[Dict] = None
+    # True when the page wasn't loaded at all because the event was collected recently
+    skipped: bool = False
+
+@dataclass
+class StageContext:
+    """
+    Everything the fetch and extract stages need, shared by all workers.
+    """
+    crawler: AsyncWebCrawler
+    llm_strategy: object
+    required_keys: List[str]
+    stats: object
+    rate_limiter: Optional[object] = None
+    page_cache: Optional[object] = None
+    extraction_memo: Optional[object] = None
+    # Read JSON-LD/OpenGraph data before calling the AI
+    use_structured_data: bool = True
+    # Maximum number of page tokens sent to the AI (0 sends the whole page)
+    token_budget: int = 0
+    # Function used to visit pages, called as visit(crawler, url, config). Defaults to crawler.arun.
+    visit: Optional[Callable[..., Awaitable]] = None
+    # Long-lived browsers to borrow from instead of using the crawler above (see Browser_Pool.py)
+    browser_pool: Optional[object] = None
+    # Lightweight downloader tried before the browser (None always uses the browser)
+    http_client: Optional[object] = None
+    # Durable record of which links are done (see Work_Queue.py)
+    work_queue: Optional[object] = None
+    # Last collected version of each event, for incremental re-crawls (see Event_Version_Store.py)
+    version_store: Optional[object] = None
+    # Every known event by event ID, shared with Step 1 (see Event_Id_Index.py)
+    event_index: Optional[object] = None
+    # Events collected less than this many hours ago are not loaded again (0 always loads them)
+    recollect_after_hours: float = 0
+    # Keeps AI calls within the provider's quotas and retries refused calls (see LLM_Dispatcher.py)
+    llm_dispatcher: Optional[object] = None
+
+def _markdown_text(markdown) -> str:
+    """
+    Get plain markdown text from a crawl result, whichever markdown format it uses.
+
+    Args:
+        markdown: The markdown attribute of a crawl result
+
+    Returns:
+        str: The markdown text
+    """
+    if markdown is None:
+        return ""
+    return getattr(markdown, "raw_markdown", None) or str(markdown)
+
+async def _load_page(context: StageContext, crawler: AsyncWebCrawler, url: str, config: CrawlerRunConfig):
+    """Visit a page with the given crawler, using the context's visit function if it has one."""
+    if context.visit:
+        return await context.visit(crawler, url, config)
+    return await crawler.arun(url=url, config=config)
+
+async def _load_and_report(context: StageContext, crawler: AsyncWebCrawler, url: str, config: CrawlerRunConfig):
+    """
+    Wait for the rate controller's go-ahead, visit a page, and tell the controller how long
+    it took and how the website answered.
+
+    Called with the browser already leased, so no request slot is held while waiting for
+    a browser, and every slot taken is given back even if the visit fails.
+    """
+    if context.rate_limiter:
+        await context.rate_limiter.wait(url)
+    result = None
+    started = time.perf_counter()
+    try:
+        result = await _load_page(context, crawler, url, config)
+        return result
+    finally:
+        if context.rate_limiter:
+            context.rate_limiter.record_crawl_result(url, result, time.perf_counter() - started)
+
+async def fetch_event_page(context: StageContext, url: str, session_id: Optional[str] = None) -> FetchedPage:
+    """
+    Load an event page and convert it to markdown, without calling the AI.
+    
+    A fresh copy from the page cache is used when available. Otherwise the page is
+    downloaded without a browser first, and only loaded in the browser if the
+    downloaded page is missing the event description or structured data.
+    If the page hasn't changed since the last run, the previous record is attached
+    to it so the extract stage can skip the AI.
+
+    Args:
+        context (StageContext): Shared stage context
+        url (str): Website address of the event page
+        session_id (str, optional): Browser session to reuse (None opens and closes a fresh tab)
+
+    Returns:
+        FetchedPage: The loaded page (success is False if the page could not be loaded)
+    """
+    if context.work_queue:
+        context.work_queue.mark_in_flight(url)
+
+    # Collected recently (in this run or an earlier one): don't load it again
+    if context.event_index and context.version_store and \
+            context.event_index.collected_within(url, context.recollect_after_hours):
+        version = context.version_store.get(url)
+        if version:
+            logging.info(f"🆔 {url} was collected recently, reusing its record without loading it")
+            context.stats.increment("events_already_collected")
+            return FetchedPage(url=url, previous_event=version["record"], skipped=True)
+
+    page = None
+    if context.page_cache:
+        cached = await context.page_cache.get(url)
+        if cached:
+            logging.info(f"💾 Using cached copy of {url}")
+            page = FetchedPage(url=url, markdown=cached["markdown"], html=cached.get("html", ""), from_cache=True)
+
+    if page is None and context.http_client:
+        page = await _fetch_with_http(context, url)
+    if page is None:
+        page = await _fetch_with_browser(context, url, session_id)
+
+    if page.success and page.markdown and not page.from_cache and context.page_cache:
+        await context.page_cache.put(url, page.markdown, page.html)
+
+    if context.version_store and page.success and page.previous_event is None:
+        _compare_with_last_version(context, page)
+
+    return page
+
+def _compare_with_last_version(context: StageContext, page: FetchedPage) -> None:
+    """
+    Fingerprint the page's event content and, if it matches the last run, attach the previous record.
+
+    Args:
+        context (StageContext): Shared stage context
+        page (FetchedPage): The loaded event page
+    """
+    page.fingerprint = page_fingerprint(page)
+    version = context.version_store.get(page.url)
+    if not version:
+        context.version_store.count("new")
+    elif version["fingerprint"] == page.fingerprint:
+        logging.info(f"🔂 {page.url} has the same content as last time, reusing its record")
+        context.version_store.count("same_fingerprint")
+        page.previous_event = version["record"]
+    else:
+        context.version_store.count("changed")
+
+def page_fingerprint(page: FetchedPage) -> str:
+    """
+    Fingerprint a loaded page the same way whichever way it was loaded.
+
+    The browser makes its own markdown, which differs from the markdown made for
+    downloaded pages, so the fingerprint is taken from the page's HTML converted
+    with html_to_markdown(). A page downloaded on one run and loaded in the browser
+    on the next then still counts as unchanged.
+
+    Args:
+        page (FetchedPage): The loaded event page
+
+    Returns:
+        str: Fingerprint of the event content
+    """
+    markdown = html_to_markdown(page.html, page.url) if page.html else page.markdown
+    return content_fingerprint(markdown)
+
+async def _fetch_with_http(context: StageContext, url: str) -> Optional[FetchedPage]:
+    """
+    Download an event page without a browser.
+
+    Args:
+        context (StageContext): Shared stage context
+        url (str): Website address of the event page
+
+    Returns:
+        Optional[FetchedPage]: The page, or None if it has to be loaded in the browser instead
+    """
+    # Ask the server to send the page only if it changed since the last run
+    version = context.version_store.get(url) if context.version_store else None
+    headers = {}
+    if version and version["etag"]:
+        headers["If-None-Match"] = version["etag"]
+    if version and version["last_modified"]:
+        headers["If-Modified-Since"] = version["last_modified"]
+
+    if context.rate_limiter:
+        await context.rate_limiter.wait(url)
+    try:
+        with context.stats.timer("http_fetch_time"):
+            response = await context.http_client.get(url, headers=headers or None)
+    except BaseException:
+        if context.rate_limiter:
+            context.rate_limiter.release(url)
+        raise
+    context.stats.increment("http_fetches", link=url)
+    if context.rate_limiter:
+        context.rate_limiter.record_response(url, response)
+
+    if response.status == 304 and version:
+        logging.info(f"🔂 {url} not modified since last time, reusing its record")
+        context.version_store.count("not_modified")
+        context.stats.increment("http_pages")
+        return FetchedPage(
+            url=url,
+            etag=response.headers.get("etag") or version["etag"] or "",
+            last_modified=response.headers.get("last-modified") or version["last_modified"] or "",
+            fingerprint=version["fingerprint"] or "",
+            previous_event=version["record"],
+        )
+
+    html = response.text if response.ok else ""
+    markdown = html_to_markdown(html, url) if html else ""
+    problem = _incomplete_page_reason(response, html, markdown)
+    if problem:
+        logging.info(f"🌐 Downloaded page for {url} is incomplete ({problem}), loading it in the browser")
+        context.stats.increment("http_escalations")
+        return None
+
+    logging.info(f"⚡ Downloaded {url} without the browser in {response.elapsed * 1000:.0f}ms")
+    context.stats.increment("http_pages")
+    return FetchedPage(
+        url=url,
+        markdown=markdown,
+        html=html,
+        etag=response.headers.get("etag", ""),
+        last_modified=response.headers.get("last-modified", ""),
+    )
+
+def _incomplete_page_reason(response, html: str, markdown: str) -> str:
+    """
+    Check whether a downloaded page has what the extract stage needs.
+
+    Returns:
+        str: Why the page is incomplete (empty if it is complete)
+    """
+    if not response.ok:
+        return response.error or f"status {response.status}"
+    if not has_structured_event_data(html):
+        return "no structured data"
+    if len(markdown) < MIN_EVENT_BODY_CHARS:
+        return "no event description"
+    return ""
+
+def html_to_markdown(html: str, url: str = "") -> str:
+    """
+    Convert a downloaded page to markdown, the same way crawl4ai does for browser pages.
+
+    Args:
+        html (str): The HTML content of the page
+        url (str): Website address of the page (for relative links)
+
+    Returns:
+        str: The page as markdown
+    """
+    result = DefaultMarkdownGenerator().generate_markdown(html, base_url=url, citations=False)
+    return _markdown_text(result)
+
+async def _fetch_with_browser(context: StageContext, url: str, session_id: Optional[str] = None) -> FetchedPage:
+    """
+    Load an event page in the browser.
+
+    Args:
+        context (StageContext): Shared stage context
+        url (str): Website address of the event page
+        session_id (str, optional): Browser session to reuse
+
+    Returns:
+        FetchedPage: The loaded page (success is False if the page could not be loaded)
+    """
+    context.stats.increment("browser_fetches", link=url)
+    config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,  # Don't use cached results
+        session_id=session_id,
+    )
+
+    with context.stats.timer("browser_fetch_time"):
+        if context.browser_pool:
+            async with context.browser_pool.lease() as browser:
+                result = await _load_and_report(context, browser.crawler, url, config)
+                browser.record_result(result.success)
+        else:
+            result = await _load_and_report(context, context.crawler, url, config)
+
+    markdown = _markdown_text(result.markdown)
+    if not (result.success and markdown):
+        logging.error(f"❌ Failed to load {url}: {result.error_message}")
+        return FetchedPage(url=url, success=False, error_message=result.error_message or "No content")
+
+    context.stats.increment("browser_pages")
+    return FetchedPage(url=url, markdown=markdown, html=result.html or "")
+
+@dataclass
+class ExtractionJob:
+    """
+    The extraction work for one event page: what is already known and what the AI still has to find.
+    """
+    page: FetchedPage
+    known: Dict = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+    strategy: object = None
+    content: str = ""
+    memo_key: Optional[str] = None
+    # Set when the job finished without a new AI call
+    done: bool = False
+    event: Optional[Dict] = None
+
+async def extract_event_details(context: StageContext, page: FetchedPage) -> Optional[Dict]:
+    """
+    Extract the event details from a loaded page.
+    
+    Fields found in the page's structured data (JSON-LD/OpenGraph) are used as they are.
+    The smart text analyzer is only asked for the fields that are still missing,
+    and is not called at all when nothing is missing.
+
+    Args:
+        context (StageContext): Shared stage context
+        page (FetchedPage): The loaded event page
+
+    Returns:
+        Optional[Dict]: Extracted event data or None if extraction failed
+    """
+    job = prepare_extraction(context, page)
+    if job.done:
+        return job.event
+    return await extract_job_with_llm(context, job)
+
+def prepare_extraction(context: StageContext, page: FetchedPage) -> ExtractionJob:
+    """
+    Do all the extraction work that doesn't need a new AI call: read the structured data,
+    choose the fields and analyzer for the AI, trim the page, and check for an earlier AI answer.
+
+    Args:
+        context (StageContext): Shared stage context
+        page (FetchedPage): The loaded event page
+
+    Returns:
+        ExtractionJob: The job (already done if no AI call is needed)
+    """
+    job = ExtractionJob(page=page)
+    if not page.success:
+        job.done = True
+        return job
+
+    # Unchanged since the last run: carry the previous record forward
+    if page.previous_event:
+        context.stats.increment("events_unchanged")
+        job.done = True
+        job.event = {key: page.previous_event.get(key, "") for key in context.required_keys}
+        job.event["event_link"] = page.url
+        if not page.skipped:
+            _remember_version(context, page, job.event)
+        return job
+
+    if context.use_structured_data and page.html:
+        job.known = extract_structured_event_data(page.html, page.url)
+    job.missing = [key for key in context.required_keys if not job.known.get(key)]
+
+    if not job.missing:
+        logging.info(f"📋 All details found in structured data for {page.url}")
+        context.stats.increment("events_without_llm")
+        job.done = True
+        job.event = {key: job.known[key] for key in context.required_keys}
+        _remember_version(context, page, job.event)
+        return job
+
+    # Only ask the AI for what is missing
+    job.strategy = context.llm_strategy
+    if job.known and hasattr(job.strategy, "for_fields"):
+        job.strategy = job.strategy.for_fields(job.missing)
+        context.stats.increment("llm_fields_skipped", len(context.required_keys) - len(job.missing))
+
+    job.content = _prune_for_llm(context, page)
+
+    if context.extraction_memo:
+        job.memo_key = memo_key(job.content, job.strategy)
+        stored = context.extraction_memo.get(job.memo_key)
+        event = parse_extracted_content(stored, page.url, job.missing) if stored else None
+        if event:
+            logging.info(f"🧠 Reusing earlier AI answer for {page.url}")
+            job.done = True
+            job.event = complete_extraction(context, job, event)
+
+    return job
+
+async def extract_job_with_llm(context: StageContext, job: ExtractionJob) -> Optional[Dict]:
+    """
+    Ask the smart text analyzer for the missing fields of one event page.
+
+    In a model cascade the cheapest model is asked first, and the page is only sent
+    to the next model when fields are missing or don't look right. The last model's
+    answer is kept as long as no field is missing.
+
+    Args:
+        context (StageContext): Shared stage context
+        job (ExtractionJob): A prepared job that still needs the AI
+
+    Returns:
+        Optional[Dict]: Extracted event data or None if extraction failed
+    """
+    url = job.page.url
+    strategy = job.strategy
+
+    while strategy is not None:
+        started = time.perf_counter()
+        with context.stats.timer("extract_time"):
+            extracted = await run_llm(context, strategy, url, job.content)
+        seconds = time.perf_counter() - started
+
+        extracted_content = json.dumps(extracted)
+        event = parse_extracted_content(extracted_content, url, job.missing)
+        invalid = find_invalid_fields(event, job.missing) if event else ["missing fields"]
+        next_tier = getattr(strategy, "next_tier", None)
+        accepted = bool(event) and (not invalid or next_tier is None)
+
+        cascade = getattr(strategy, "cascade", None)
+        if cascade is not None:
+            cascade.record(strategy.provider, seconds, accepted)
+        if accepted:
+            # Remember which model gave the answer that was kept
+            job.strategy = strategy
+            return complete_extraction(context, job, event, extracted_content)
+        if next_tier is not None:
+            logging.info(f"🪜 Answer of {strategy.provider} for {url} not kept ({', '.join(invalid)}), "
+                         f"asking {next_tier.provider}")
+        strategy = next_tier
+
+    return None
+
+async def run_llm(context: StageContext, strategy, url: str, content: str):
+    """
+    Run one smart text analyzer call, through the context's dispatcher if it has one.
+
+    Args:
+        context (StageContext): Shared stage context
+        strategy (LLMExtractionStrategy): The analyzer to call
+        url (str): Website address the content belongs to
+        content (str): The content to send
+
+    Returns:
+        What the analyzer extracted
+    """
+    if context.llm_dispatcher:
+        return await context.llm_dispatcher.run(strategy, url, content)
+    # The AI client is blocking, so run it in a thread to keep the event loop free
+    return await asyncio.to_thread(strategy.run, url, [content])
+
+def complete_extraction(context: StageContext, job: ExtractionJob, event: Dict,
+                        extracted_content: Optional[str] = None) -> Dict:
+    """
+    Combine the AI's answer with what was already known, and remember the answer.
+
+    Args:
+        context (StageContext): Shared stage context
+        job (ExtractionJob): The job the answer belongs to
+        event (Dict): Fields extracted by the AI
+        extracted_content (str, optional): The AI's JSON answer to remember (None if it was reused)
+
+    Returns:
+        Dict: The complete event record
+    """
+    # Only complete answers get here, so failed extractions are tried again next time
+    if extracted_content and job.memo_key:
+        context.extraction_memo.put(job.memo_key, extracted_content, url=job.page.url,
+                                    provider=getattr(job.strategy, "provider", ""))
+
+    # A reused answer cost no AI call
+    context.stats.increment("events_with_llm" if extracted_content else "events_from_memo")
+    event = dict(event)
+    event.update(job.known)
+    event["event_link"] = job.page.url
+    record = {key: event.get(key, "") for key in context.required_keys}
+    _remember_version(context, job.page, record)
+    return record
+
+def _remember_version(context: StageContext, page: FetchedPage, record: Dict) -> None:
+    """
+    Save the finished record with the page's headers and fingerprint for the next run.
+
+    Pages from the browser or the page cache come without headers, so the headers
+    saved last time are kept for them (otherwise the next run couldn't ask the server
+    whether the page changed).
+    """
+    if context.event_index:
+        context.event_index.mark_collected(page.url)
+    if context.version_store:
+        etag, last_modified = page.etag, page.last_modified
+        if not (etag or last_modified):
+            version = context.version_store.get(page.url)
+            if version:
+                etag = version["etag"] or ""
+                last_modified = version["last_modified"] or ""
+        context.version_store.put(
+            page.url,
+            record,
+            fingerprint=page.fingerprint or page_fingerprint(page),
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+def _prune_for_llm(context: StageContext, page: FetchedPage) -> str:
+    """
+    Trim the page down to the event itself before it is sent to the AI.
+
+    Args:
+        context (StageContext): Shared stage context
+        page (FetchedPage): The loaded event page
+
+    Returns:
+        str: The content to send to the AI
+    """
+    if context.token_budget <= 0:
+        return page.markdown
+
+    content = prune_event_markdown(page.markdown, context.token_budget)
+    tokens_before = estimate_tokens(page.markdown)
+    tokens_after = estimate_tokens(content)
+    context.stats.increment("llm_input_tokens_before_pruning", tokens_before)
+    context.stats.increment("llm_input_tokens_after_pruning", tokens_after)
+    logging.info(f"✂️ Trimmed {page.url} from ~{tokens_before} to ~{tokens_after} tokens")
+    return content
+
+def record_failure(context: StageContext, url: str, error: str = "") -> None:
+    """
+    Record in the work queue that a link produced no event, so --resume tries it again.
+
+    Args:
+        context (StageContext): Shared stage context
+        url (str): Website address of the event page
+        error (str): What went wrong
+    """
+    if context.work_queue:
+        context.work_queue.mark_failed(url, error or "No event details extracted")
+
+async def collect_event_details(context: StageContext, url: str, session_id: Optional[str] = None) -> Optional[Dict]:
+    """
+    Run both stages, one after the other, for a single event page.
+
+    Args:
+        context (StageContext): Shared stage context
+        url (str): Website address of the event page
+        session_id (str, optional): Browser session to reuse
+
+    Returns:
+        Optional[Dict]: Extracted event data or None if extraction failed
+    """
+    page = await fetch_event_page(context, url, session_id=session_id)
+    return await extract_event_details(context, page)
@@ -4,80 +4,51 @@ Tools for extracting detailed information from individual event pages.
 
 import json
 import logging
+import re
 from typing import Dict, List, Optional
 
-from crawl4ai import (
-    AsyncWebCrawler,
-    CacheMode,
-    CrawlerRunConfig,
-    LLMExtractionStrategy,
-)
+# Answers that only say the AI found nothing
+PLACEHOLDER_VALUES = {"n/a", "na", "none", "null", "unknown", "not found", "not available", "not specified", "tbd", "-"}
 
-async def scrape_event_details_from_url(
-    crawler: AsyncWebCrawler,
-    url: str,
-    session_id: str,
-    llm_strategy: LLMExtractionStrategy,
-    required_keys: List[str],
-) -> Optional[Dict]:
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+def parse_extracted_content(extracted_content: str, url: str, required_keys: List[str]) -> Optional[Dict]:
     """
-    Extract detailed information from a single event page.
+    Turn the smart text analyzer's JSON answer into an event record.
     
     Args:
-        crawler (AsyncWebCrawler): The crawler instance
+        extracted_content (str): JSON text returned by the smart text analyzer
         url (str): Website address of the event page
-        session_id (str): Unique session identifier
-        llm_strategy (LLMExtractionStrategy): Smart text analyzer configuration
         required_keys (List[str]): List of required information fields
         
     Returns:
         Optional[Dict]: Extracted event data or None if extraction failed
     """
+    # Convert the extracted text to a dictionary
     try:
-        # Visit the event page and extract information using the smart text analyzer
-        result = await crawler.arun(
-            url=url,
-            config=CrawlerRunConfig(
-                cache_mode=CacheMode.BYPASS,  # Don't use cached results
-                extraction_strategy=llm_strategy,
-                session_id=session_id,
-            ),
-        )
-        
-        # Check if the visit was successful
-        if not (result.success and result.extracted_content):
-            logging.error(f"❌ Failed to extract content from {url}: {result.error_message}")
-            return None
+        data = json.loads(extracted_content)
         
-        # Convert the extracted text to a dictionary
-        try:
-            data = json.loads(result.extracted_content)
+        # Sometimes the AI returns a list instead of a single object
+        if isinstance(data, list):
+            if not data:  # Empty list
+                logging.warning(f"⚠️ AI returned empty list for {url}")
+                return None
+            data = data[0]  # Take the first item
             
-            # Sometimes the AI returns a list instead of a single object
-            if isinstance(data, list):
-                if not data:  # Empty list
-                    logging.warning(f"⚠️ AI returned empty list for {url}")
-                    return None
-                data = data[0]  # Take the first item
-                
-        except json.JSONDecodeError:
-            logging.error(f"❌ Failed to parse JSON from {url}")
-            return None
-        
-        # Check if all required information was found
-        if not _is_complete_event(data, required_keys):
-            logging.warning(f"⚠️ Incomplete event data from {url}")
-            _log_missing_fields(data, required_keys)
-            return None
-        
-        # Make sure the event_link field is set
-        data["event_link"] = url
-        
-        return data
-        
-    except Exception as e:
-        logging.error(f"❌ Exception while processing {url}: {str(e)}")
+    except json.JSONDecodeError:
+        logging.error(f"❌ Failed to parse JSON from {url}")
+        return None
+    
+    # Check if all required information was found
+    if not _is_complete_event(data, required_keys):
+        logging.warning(f"⚠️ Incomplete event data from {url}")
+        _log_missing_fields(data, required_keys)
         return None
+    
+    # Make sure the event_link field is set
+    data["event_link"] = url
+    
+    return data
 
 def _is_complete_event(event: Dict, required_keys: List[str]) -> bool:
     """
@@ -109,3 +80,33 @@ def _log_missing_fields(event: Dict, required_keys: List[str]) -> None:
     
     if missing:
         logging.warning(f"Missing or empty fields: {', '.join(missing)}")
+
+def find_invalid_fields(event: Dict, required_keys: List[str]) -> List[str]:
+    """
+    Check that the AI's answers look like real values, not just that they are there.
+    
+    Args:
+        event (Dict): Event data dictionary
+        required_keys (List[str]): Fields to check
+        
+    Returns:
+        List[str]: The fields that are missing or don't look right, with the reason
+    """
+    invalid = []
+    for key in required_keys:
+        value = event.get(key)
+        if not value:
+            invalid.append(f"{key} (missing)")
+            continue
+        text = str(value).strip()
+        if key == "email":
+            # "Not provided" is what the AI is asked to say when there is no email
+            if text.lower() != "not provided" and not _EMAIL.match(text):
+                invalid.append(f"{key} (not an email address)")
+        elif text.lower().strip(".") in PLACEHOLDER_VALUES or text.lower().startswith("not provided"):
+            invalid.append(f"{key} (placeholder)")
+        elif key == "date" and not any(character.isdigit() for character in text):
+            invalid.append(f"{key} (no day or time)")
+        elif key in ("city", "province") and (len(text) > 40 or "," in text):
+            invalid.append(f"{key} (more than a name)")
+    return invalid
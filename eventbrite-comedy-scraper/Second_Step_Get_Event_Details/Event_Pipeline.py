@@ -0,0 +1,284 @@
+"""
+Two-stage pipeline for collecting event details.
+
+Fetch workers load event pages in the browser and put them on a bounded queue.
+Extract workers take pages off the queue and send them to the smart text analyzer (AI/LLM).
+Because the two stages run at the same time, the browser keeps loading pages
+while the AI is busy, and the AI always has a page waiting for it.
+
+Links can be given as a list, or as a stream (an async iterator) that yields
+links while they are still being found, so detail collection can start before
+the search has finished.
+"""
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+
+from Event_Detail_Stages import FetchedPage, StageContext, extract_event_details, fetch_event_page, record_failure
+from Concurrent_Event_Collector import OrderedResultBuffer
+from Batched_Event_Extraction import extract_event_details_batch
+
+class EventPipeline:
+    """
+    Runs the fetch stage and the extract stage side by side, joined by a bounded queue.
+    Keeps track of queue depth and how busy each stage was, so each side can be sized.
+    """
+
+    def __init__(
+        self,
+        context: StageContext,
+        fetch_concurrency: int = 2,
+        extract_concurrency: int = 2,
+        queue_size: int = 4,
+        report_interval: float = 30.0,
+        llm_batch_size: int = 1,
+        batch_wait: float = 2.0,
+    ):
+        """
+        Set up the pipeline.
+
+        Args:
+            context (StageContext): Shared stage context
+            fetch_concurrency (int): Number of pages loaded at the same time
+            extract_concurrency (int): Number of AI extractions running at the same time
+            queue_size (int): Maximum number of loaded pages waiting for the AI
+            report_interval (float): Seconds between queue depth log lines (0 to turn off)
+            llm_batch_size (int): Number of events each extract worker sends to the AI in one call
+            batch_wait (float): Seconds an extract worker waits for more pages to fill a batch
+        """
+        self.context = context
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.extract_concurrency = max(1, extract_concurrency)
+        self.queue_size = max(1, queue_size)
+        self.report_interval = report_interval
+        self.llm_batch_size = max(1, llm_batch_size)
+        self.batch_wait = batch_wait
+
+        self.page_queue = None
+        self.fetch_busy = 0.0      # Time fetch workers spent loading pages
+        self.fetch_blocked = 0.0   # Time fetch workers waited for room in the queue
+        self.extract_busy = 0.0    # Time extract workers spent on AI calls
+        self.extract_idle = 0.0    # Time extract workers waited for a page
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self.wall_time = 0.0
+
+    def _sample_depth(self) -> None:
+        """Record the current queue depth."""
+        depth = self.page_queue.qsize()
+        self.depth_samples += 1
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    async def run(
+        self,
+        links: Union[Iterable[str], AsyncIterator[str]],
+        on_ready: Optional[Callable[[List[Dict]], None]] = None,
+    ) -> List[Dict]:
+        """
+        Collect event details for all links.
+
+        Args:
+            links (Iterable[str] or AsyncIterator[str]): Event links to process, either a list
+                                                         or a stream of links that are still being found
+            on_ready (Callable, optional): Called with each group of events that is ready
+                                           to be saved, always in link order
+
+        Returns:
+            List[Dict]: Successfully extracted events, in the same order as the links
+        """
+        streaming = hasattr(links, "__aiter__")
+        total = len(links) if hasattr(links, "__len__") else "?"
+
+        # Room for a few links per fetch worker; a stream waits here until the workers catch up
+        link_queue = asyncio.Queue(maxsize=self.fetch_concurrency * 2)
+
+        async def end_links():
+            # Tell each fetch worker there is nothing more to come
+            for _ in range(self.fetch_concurrency):
+                await link_queue.put(None)
+
+        async def feed_links():
+            index = 0
+            try:
+                if streaming:
+                    async for link in links:
+                        await link_queue.put((index, link))
+                        index += 1
+                else:
+                    for link in links:
+                        await link_queue.put((index, link))
+                        index += 1
+            except asyncio.CancelledError:
+                # The run is stopping and the fetch workers are cancelled too
+                raise
+            except Exception:
+                # The fetch workers still finish the links they have, then the failure is raised
+                await end_links()
+                raise
+            await end_links()
+
+        self.page_queue = asyncio.Queue(maxsize=self.queue_size)
+        results = {}
+        buffer = OrderedResultBuffer()
+
+        async def fetch_worker(worker_num):
+            while True:
+                item = await link_queue.get()
+                if item is None:
+                    return
+                index, link = item
+
+                logging.info(f"🌐 [fetch {worker_num}] Loading {index + 1}/{total}: {link}")
+                started = time.perf_counter()
+                try:
+                    page = await fetch_event_page(self.context, link)
+                except Exception as e:
+                    logging.error(f"❌ Error loading {link}: {e}")
+                    page = FetchedPage(url=link, success=False, error_message=str(e))
+                self.fetch_busy += time.perf_counter() - started
+
+                started = time.perf_counter()
+                await self.page_queue.put((index, page))
+                self.fetch_blocked += time.perf_counter() - started
+                self._sample_depth()
+
+        def deliver(index, event):
+            results[index] = event
+            ready = buffer.add(index, event)
+            if ready and on_ready:
+                on_ready(ready)
+
+        async def next_batch():
+            """Wait for a page, then gather up to llm_batch_size pages. Returns (batch, finished)."""
+            started = time.perf_counter()
+            item = await self.page_queue.get()
+            self.extract_idle += time.perf_counter() - started
+            if item is None:
+                return [], True
+
+            batch = [item]
+            while len(batch) < self.llm_batch_size:
+                started = time.perf_counter()
+                try:
+                    item = await asyncio.wait_for(self.page_queue.get(), timeout=self.batch_wait)
+                except asyncio.TimeoutError:
+                    break
+                finally:
+                    self.extract_idle += time.perf_counter() - started
+                if item is None:
+                    return batch, True
+                batch.append(item)
+            return batch, False
+
+        async def extract_worker(worker_num):
+            finished = False
+            while not finished:
+                batch, finished = await next_batch()
+                if not batch:
+                    return
+                self._sample_depth()
+
+                pages = [page for _, page in batch]
+                events = [None] * len(batch)
+                error = ""
+                started = time.perf_counter()
+                try:
+                    if len(batch) > 1:
+                        events = await extract_event_details_batch(self.context, pages)
+                    else:
+                        events = [await extract_event_details(self.context, pages[0])]
+                except Exception as e:
+                    logging.error(f"❌ Error extracting {', '.join(page.url for page in pages)}: {e}")
+                    error = str(e)
+                self.extract_busy += time.perf_counter() - started
+
+                for (index, page), event in zip(batch, events):
+                    if event:
+                        logging.info(f"✅ [extract {worker_num}] Extracted details for event: "
+                                     f"{event.get('title', 'Unknown')}")
+                    elif page.success:
+                        logging.warning(f"⚠️ Failed to extract details from: {page.url}")
+                    if not event:
+                        record_failure(self.context, page.url, page.error_message or error)
+                    deliver(index, event)
+
+        async def fetch_stage():
+            await asyncio.gather(*fetch_tasks)
+            await feeder
+
+            # Tell each extract worker there is nothing more to come
+            for _ in extract_tasks:
+                await self.page_queue.put(None)
+
+        run_started = time.perf_counter()
+        tasks = []
+        if self.report_interval > 0:
+            tasks.append(asyncio.create_task(self._monitor()))
+        feeder = asyncio.create_task(feed_links())
+        fetch_tasks = [asyncio.create_task(fetch_worker(num)) for num in range(1, self.fetch_concurrency + 1)]
+        extract_tasks = [asyncio.create_task(extract_worker(num)) for num in range(1, self.extract_concurrency + 1)]
+        stage = asyncio.create_task(fetch_stage())
+        tasks += [feeder, *fetch_tasks, *extract_tasks, stage]
+        try:
+            # Stop at the first failure in either stage: the other stage would otherwise
+            # wait forever on a queue that nobody fills or empties any more
+            done, _ = await asyncio.wait([stage, *extract_tasks], return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.wall_time = time.perf_counter() - run_started
+
+        self.log_report()
+        return [results[index] for index in sorted(results) if results[index]]
+
+    async def _monitor(self) -> None:
+        """Log the queue depth every few seconds while the pipeline runs."""
+        while True:
+            await asyncio.sleep(self.report_interval)
+            logging.info(f"📦 Pipeline queue depth: {self.page_queue.qsize()}/{self.queue_size}")
+
+    def report(self) -> Dict:
+        """
+        Summarize how the pipeline performed.
+
+        Returns:
+            Dict: Queue depth and utilisation of each stage (0.0 to 1.0)
+        """
+        wall = self.wall_time or 1e-9
+        return {
+            "fetch_workers": self.fetch_concurrency,
+            "extract_workers": self.extract_concurrency,
+            "queue_size": self.queue_size,
+            "max_queue_depth": self.max_depth,
+            "average_queue_depth": self.depth_total / self.depth_samples if self.depth_samples else 0.0,
+            "fetch_utilisation": self.fetch_busy / (self.fetch_concurrency * wall),
+            "fetch_blocked_share": self.fetch_blocked / (self.fetch_concurrency * wall),
+            "extract_utilisation": self.extract_busy / (self.extract_concurrency * wall),
+            "extract_idle_share": self.extract_idle / (self.extract_concurrency * wall),
+            "wall_time": self.wall_time,
+        }
+
+    def log_report(self) -> None:
+        """Write the pipeline summary to the log, with a hint about which stage to grow."""
+        report = self.report()
+        logging.info("📊 Pipeline summary")
+        logging.info(f"   Fetch stage: {report['fetch_workers']} workers, "
+                     f"{report['fetch_utilisation']:.0%} busy, "
+                     f"{report['fetch_blocked_share']:.0%} waiting for queue space")
+        logging.info(f"   Extract stage: {report['extract_workers']} workers, "
+                     f"{report['extract_utilisation']:.0%} busy, "
+                     f"{report['extract_idle_share']:.0%} waiting for pages")
+        logging.info(f"   Queue depth: average {report['average_queue_depth']:.1f}, "
+                     f"max {report['max_queue_depth']}/{report['queue_size']}")
+
+        if report["fetch_blocked_share"] > 0.25:
+            logging.info("💡 Fetch workers often waited for the AI - consider more extract workers")
+        elif report["extract_idle_share"] > 0.25:
+            logging.info("💡 Extract workers often waited for pages - consider more fetch workers")
@@ -0,0 +1,138 @@
+"""
+Memory of the last version of every event page that was collected.
+
+For each event the store keeps the ETag and Last-Modified headers the server sent,
+a fingerprint of the event's content, and the finished event record. On the next
+run the page is requested with those headers (a conditional request), and when the
+server says it hasn't changed, or its content fingerprint is the same, the previous
+record is carried forward without loading the page in the browser or calling the AI.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Content_Pruner import prune_event_markdown
+from Shared_Tools_Both_Steps_Use.Shared_Database import connect_shared_database
+from Shared_Tools_Both_Steps_Use.Url_Tools import event_key
+
+# Large enough that no event section is ever cut, so only the event's own content is fingerprinted
+FINGERPRINT_TOKEN_BUDGET = 1_000_000
+
+def content_fingerprint(markdown: str) -> str:
+    """
+    Fingerprint the event content of a page, ignoring menus, footers and related listings
+    (which change often without the event itself changing).
+
+    Args:
+        markdown (str): The event page as markdown
+
+    Returns:
+        str: Fingerprint of the event content
+    """
+    content = prune_event_markdown(markdown or "", FINGERPRINT_TOKEN_BUDGET)
+    return hashlib.sha256(" ".join(content.split()).encode("utf-8")).hexdigest()
+
+class EventVersionStore:
+    """
+    Stores the last collected version of each event in a small SQLite database.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the store.
+
+        Args:
+            path (str): Path to the SQLite file
+        """
+        self.path = path
+        self.stats = {"not_modified": 0, "same_fingerprint": 0, "changed": 0, "new": 0}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = connect_shared_database(path)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS event_versions (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fingerprint TEXT,
+                record TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up the last version of an event.
+
+        Args:
+            url (str): Event website address
+
+        Returns:
+            Optional[Dict]: etag, last_modified, fingerprint and record (the event data), or None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, fingerprint, record FROM event_versions WHERE url = ?",
+                (event_key(url),),
+            ).fetchone()
+        if not row:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "fingerprint": row[2], "record": json.loads(row[3])}
+
+    def put(self, url: str, record: Dict, fingerprint: str = "", etag: str = "", last_modified: str = "") -> None:
+        """
+        Save the latest version of an event.
+
+        Args:
+            url (str): Event website address
+            record (Dict): The finished event data
+            fingerprint (str): Fingerprint of the page (see page_fingerprint() in Event_Detail_Stages.py)
+            etag (str): ETag header the server sent
+            last_modified (str): Last-Modified header the server sent
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO event_versions (url, etag, last_modified, fingerprint, record, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (event_key(url), etag, last_modified, fingerprint, json.dumps(record), time.time()),
+            )
+            self._connection.commit()
+
+    def count(self, outcome: str) -> None:
+        """
+        Count how a page compared to its last version.
+
+        Args:
+            outcome (str): "not_modified", "same_fingerprint", "changed" or "new"
+        """
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def log_stats(self) -> None:
+        """Write how many events were unchanged, changed or new to the log."""
+        unchanged = self.stats["not_modified"] + self.stats["same_fingerprint"]
+        logging.info(f"🔂 Incremental re-crawl: {unchanged} events unchanged "
+                     f"({self.stats['not_modified']} confirmed by the server, "
+                     f"{self.stats['same_fingerprint']} by content fingerprint), "
+                     f"{self.stats['changed']} changed, {self.stats['new']} new")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
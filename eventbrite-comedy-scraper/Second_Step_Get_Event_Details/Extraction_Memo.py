@@ -0,0 +1,145 @@
+"""
+Memory of earlier smart text analyzer (AI/LLM) answers.
+
+An answer is stored under a fingerprint of everything that went into the AI call:
+the page content, the information structure (schema), the instructions and the AI model.
+If all of those are unchanged, the stored answer is reused and the AI is not called again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Shared_Tools_Both_Steps_Use.Shared_Database import connect_shared_database
+
+def memo_key(content: str, llm_strategy) -> str:
+    """
+    Build the fingerprint for one AI call.
+
+    Args:
+        content (str): Page content sent to the AI
+        llm_strategy: The smart text analyzer configuration (provider, schema, instruction)
+
+    Returns:
+        str: Fingerprint of the AI call
+    """
+    parts = [
+        getattr(llm_strategy, "provider", "") or "",
+        json.dumps(getattr(llm_strategy, "schema", None), sort_keys=True),
+        getattr(llm_strategy, "instruction", "") or "",
+        content,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+class ExtractionMemo:
+    """
+    Stores AI answers in a small SQLite database, keyed by memo_key().
+    """
+
+    def __init__(self, path: str, mode: str = "read-write"):
+        """
+        Open (or create) the memory database.
+
+        Args:
+            path (str): Path to the SQLite file
+            mode (str): "read-write", "read-only", "refresh" or "off" (same meaning as the page cache)
+        """
+        self.path = path
+        self.mode = mode
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = connect_shared_database(path)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extraction_memo (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                provider TEXT,
+                extracted_content TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+
+    @property
+    def can_read(self) -> bool:
+        """Whether stored answers may be used in this mode."""
+        return self.mode in ("read-write", "read-only")
+
+    @property
+    def can_write(self) -> bool:
+        """Whether new answers may be stored in this mode."""
+        return self.mode in ("read-write", "refresh")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a stored AI answer.
+
+        Args:
+            key (str): Fingerprint from memo_key()
+
+        Returns:
+            Optional[str]: The stored JSON answer, or None if there is none
+        """
+        if not self.can_read:
+            return None
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT extracted_content FROM extraction_memo WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row:
+            self.stats["hits"] += 1
+            return row[0]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, extracted_content: str, url: str = "", provider: str = "") -> None:
+        """
+        Store an AI answer.
+
+        Args:
+            key (str): Fingerprint from memo_key()
+            extracted_content (str): The JSON answer from the AI
+            url (str): Event website address (for reference only)
+            provider (str): AI model that gave the answer (for reference only)
+        """
+        if not self.can_write:
+            return
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO extraction_memo (key, url, provider, extracted_content, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, url, provider, extracted_content, time.time()),
+            )
+            self._connection.commit()
+        self.stats["writes"] += 1
+
+    def log_stats(self) -> None:
+        """Write memory hit/miss statistics to the log."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / lookups if lookups else 0.0
+        logging.info(f"🧠 AI answer memory ({self.mode}): {self.stats['hits']} reused, "
+                     f"{self.stats['misses']} new ({hit_rate:.0%} of AI calls saved), "
+                     f"{self.stats['writes']} stored")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
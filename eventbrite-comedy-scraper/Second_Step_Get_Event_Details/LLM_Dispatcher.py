@@ -0,0 +1,419 @@
+"""
+Sends the smart text analyzer (AI/LLM) calls within the AI provider's quotas.
+
+Groq limits both the number of requests and the number of tokens per minute,
+separately for every model. Every AI call goes through the dispatcher, which:
+
+- keeps two token buckets for each model, one for requests and one for tokens
+  per minute, and waits until both have room before starting a call,
+- caps the number of calls in flight at the same time,
+- retries calls that were refused for going over the quota, waiting as long as
+  the provider says (Retry-After, or x-ratelimit-reset-requests/-tokens such as
+  "2m59.56s"), instead of giving up on the event after its page was already loaded.
+
+When litellm (installed with crawl4ai) is available, the dispatcher also reads the
+quota the provider reports after every call, so its buckets follow the real quota
+rather than its own token estimates.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from Content_Pruner import estimate_tokens
+
+# litellm makes the actual AI calls for crawl4ai; without it, the dispatcher
+# works from its own estimates and from the error messages alone
+try:
+    import litellm
+    from litellm.integrations.custom_logger import CustomLogger
+except ImportError:
+    litellm = None
+    CustomLogger = object
+
+# Tokens crawl4ai adds around the page and the instructions (its prompt template)
+PROMPT_OVERHEAD_TOKENS = 600
+
+# Waits between retries when the provider doesn't say how long to wait
+BASE_RETRY_WAIT = 2.0
+MAX_RETRY_WAIT = 60.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_TRY_AGAIN = re.compile(r"try again in\s+((?:\d+(?:\.\d+)?(?:ms|h|m|s))+)", re.IGNORECASE)
+
+class LLMRateLimitError(Exception):
+    """The AI provider kept refusing a call for going over the quota."""
+
+def parse_reset_duration(value) -> Optional[float]:
+    """
+    Read a quota reset time as the AI provider sends it.
+
+    Args:
+        value: Seconds ("30"), or a duration such as "2m59.56s", "7.66s" or "120ms"
+
+    Returns:
+        Optional[float]: Seconds until the quota resets, or None if the value can't be read
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if not parts or "".join(number + unit for number, unit in parts) != text.replace(" ", ""):
+        return None
+    seconds_per_unit = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(number) * seconds_per_unit[unit] for number, unit in parts)
+
+def _header(headers: Dict, name: str):
+    """Get a header, also under litellm's "llm_provider-" prefix."""
+    return headers.get(name) or headers.get(f"llm_provider-{name}")
+
+def retry_wait_from_error(message: str, headers: Optional[Dict] = None) -> Optional[float]:
+    """
+    Work out how long the provider asked us to wait after refusing a call.
+
+    Args:
+        message (str): The error message (Groq says "Please try again in 2m59.56s")
+        headers (Dict, optional): The response headers, with lower-case names
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the provider didn't say
+    """
+    headers = {str(name).lower(): value for name, value in (headers or {}).items()}
+    retry_after = parse_reset_duration(_header(headers, "retry-after"))
+    if retry_after is not None:
+        return retry_after
+
+    # Wait for the quota that ran out; if the message doesn't say which, for both
+    lowered = (message or "").lower()
+    resets = {
+        "requests": parse_reset_duration(_header(headers, "x-ratelimit-reset-requests")),
+        "tokens": parse_reset_duration(_header(headers, "x-ratelimit-reset-tokens")),
+    }
+    if "tokens per" in lowered and resets["tokens"] is not None:
+        return resets["tokens"]
+    if "requests per" in lowered and resets["requests"] is not None:
+        return resets["requests"]
+    known = [seconds for seconds in resets.values() if seconds is not None]
+    if known:
+        return max(known)
+
+    match = _TRY_AGAIN.search(message or "")
+    return parse_reset_duration(match.group(1)) if match else None
+
+def is_rate_limit_error(error) -> bool:
+    """Whether an exception or error message means the provider refused the call for going over the quota."""
+    if isinstance(error, BaseException) and "ratelimit" in type(error).__name__.lower():
+        return True
+    text = str(error).lower()
+    return "rate limit" in text or "rate_limit" in text or "429" in text or "too many requests" in text
+
+def _error_blocks(extracted) -> List[str]:
+    """The error messages crawl4ai put in an extraction result instead of raising."""
+    if not isinstance(extracted, list):
+        return []
+    errors = []
+    for block in extracted:
+        if isinstance(block, dict) and (block.get("error") or "error" in (block.get("tags") or [])):
+            errors.append(json.dumps(block.get("content", "")))
+    return errors
+
+class TokenBucket:
+    """
+    Allows up to `per_minute` units per minute, refilled continuously.
+    Units are reserved up front; a reservation larger than what is left waits for the refill.
+    """
+
+    def __init__(self, per_minute: float, now: Optional[float] = None):
+        """
+        Args:
+            per_minute (float): Units allowed per minute (0 or less means no limit)
+            now (float, optional): The current time (defaults to time.monotonic())
+        """
+        self.capacity = float(per_minute) if per_minute > 0 else 0.0
+        self.level = self.capacity
+        self._updated = time.monotonic() if now is None else now
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Reserve units.
+
+        Args:
+            amount (float): Units needed (capped at the bucket size, so it can always be served)
+            now (float): The current time (same clock as when the bucket was made)
+
+        Returns:
+            float: Seconds to wait before using them
+        """
+        if not self.capacity:
+            return 0.0
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level * 60.0 / self.capacity)
+
+    def sync(self, remaining: Optional[float], now: float) -> None:
+        """Lower the bucket to what the provider says is left of the quota."""
+        if not self.capacity or remaining is None:
+            return
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+def model_name(model) -> str:
+    """The model's own name, without the provider ("groq/llama-3.1-8b-instant" -> "llama-3.1-8b-instant")."""
+    return str(model or "").split("/")[-1]
+
+class _ModelQuota:
+    """The quota of one model: its buckets, and any pause after the provider refused a call."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, now: float):
+        self.requests = TokenBucket(requests_per_minute, now)
+        self.tokens = TokenBucket(tokens_per_minute, now)
+        self.paused_until = 0.0
+        # Set when the provider asked to wait longer than max_wait (e.g. a daily quota)
+        self.exhausted_until = 0.0
+        self.last_rate_limit = (0.0, None)
+
+class _QuotaListener(CustomLogger):
+    """Passes the quota headers of every AI call made through litellm to the dispatcher."""
+
+    def __init__(self, dispatcher: "LLMDispatcher"):
+        super().__init__()
+        self.dispatcher = dispatcher
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        hidden = getattr(response_obj, "_hidden_params", None) or {}
+        self.dispatcher.note_quota(hidden.get("additional_headers") or {}, kwargs.get("model"))
+
+    def log_failure_event(self, kwargs, response_obj, start_time, end_time):
+        error = kwargs.get("exception") if isinstance(kwargs, dict) else None
+        if error is None or not is_rate_limit_error(error):
+            return
+        headers = getattr(error, "litellm_response_headers", None) or \
+            getattr(getattr(error, "response", None), "headers", None) or {}
+        self.dispatcher.note_rate_limit(str(error), dict(headers), kwargs.get("model"))
+
+class LLMDispatcher:
+    """
+    Runs smart text analyzer calls within the requests-per-minute and tokens-per-minute quotas.
+    Each model has its own quota, so a cheaper model can be called while another one waits.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_in_flight: int = 2,
+        max_retries: int = 8,
+        max_wait: float = 600.0,
+        expected_output_tokens: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable] = asyncio.sleep,
+    ):
+        """
+        Set up the dispatcher.
+
+        Args:
+            requests_per_minute (float): AI calls allowed per minute for each model (0 for no limit)
+            tokens_per_minute (float): Tokens (sent and received) allowed per minute for each model (0 for no limit)
+            max_in_flight (int): Most AI calls running at the same time
+            max_retries (int): How many times a refused call is tried again
+            max_wait (float): Longest wait in seconds for the quota to reset; if the provider
+                              asks for longer (e.g. a daily quota), the call fails instead
+            expected_output_tokens (int): Tokens expected in each answer (reasoning models write a lot)
+            clock (Callable): Returns the current time in seconds (tests pass their own)
+            sleep (Callable): Waits a number of seconds (tests pass their own)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.expected_output_tokens = expected_output_tokens
+        self._clock = clock
+        self._sleep = sleep
+        self.stats = {"calls": 0, "rate_limited": 0, "retries": 0, "gave_up": 0,
+                      "estimated_tokens": 0, "quota_wait": 0.0, "retry_wait": 0.0}
+        self._in_flight = None
+        self._quotas: Dict[str, _ModelQuota] = {}
+        # Quota reports come from litellm's threads
+        self._lock = threading.Lock()
+
+        self._listener = None
+        if litellm is not None:
+            self._listener = _QuotaListener(self)
+            litellm.callbacks = list(getattr(litellm, "callbacks", None) or []) + [self._listener]
+
+    def estimate_tokens(self, strategy, content: str) -> int:
+        """Estimate the tokens one call uses: the page, the instructions, and the answer."""
+        instructions = (getattr(strategy, "instruction", "") or "") + json.dumps(getattr(strategy, "schema", "") or "")
+        return (estimate_tokens(content) + estimate_tokens(instructions)
+                + PROMPT_OVERHEAD_TOKENS + self.expected_output_tokens)
+
+    def _quota(self, model) -> _ModelQuota:
+        """The quota of a model, set up on its first call. Call with the lock held."""
+        name = model_name(model)
+        if name not in self._quotas:
+            self._quotas[name] = _ModelQuota(self.requests_per_minute, self.tokens_per_minute, self._clock())
+        return self._quotas[name]
+
+    def note_quota(self, headers: Dict, model=None) -> None:
+        """Follow the quota the provider reported after a call to a model (x-ratelimit-remaining-*)."""
+        headers = {str(name).lower(): value for name, value in headers.items()}
+        with self._lock:
+            quota = self._quota(model)
+            now = self._clock()
+            for bucket, name in ((quota.requests, "requests"), (quota.tokens, "tokens")):
+                try:
+                    remaining = float(_header(headers, f"x-ratelimit-remaining-{name}"))
+                except (TypeError, ValueError):
+                    continue
+                bucket.sync(remaining, now)
+
+    def note_rate_limit(self, message: str, headers: Optional[Dict] = None, model=None) -> None:
+        """Remember a refused call, and hold back the model's calls until its quota resets."""
+        wait = retry_wait_from_error(message, headers)
+        with self._lock:
+            quota = self._quota(model)
+            quota.last_rate_limit = (self._clock(), wait)
+            if wait is not None and wait <= self.max_wait:
+                quota.paused_until = max(quota.paused_until, self._clock() + wait)
+
+    async def _wait_for_quota(self, quota: _ModelQuota, tokens: int) -> None:
+        """Wait until both buckets have room for a call (and any pause after a refused call is over)."""
+        with self._lock:
+            now = self._clock()
+            delay = max(
+                quota.paused_until - now,
+                quota.requests.reserve(1, now),
+                quota.tokens.reserve(tokens, now),
+                0.0,
+            )
+        if delay > 0:
+            self.stats["quota_wait"] += delay
+            await self._sleep(delay)
+
+    async def run(self, strategy, url: str, content: str) -> List:
+        """
+        Run one smart text analyzer call, within the quotas, retrying if the provider refuses it.
+
+        Args:
+            strategy (LLMExtractionStrategy): The analyzer to call
+            url (str): Website address the content belongs to
+            content (str): The content to send
+
+        Returns:
+            List: What the analyzer extracted
+
+        Raises:
+            LLMRateLimitError: If the provider still refused the call after all retries
+        """
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        tokens = self.estimate_tokens(strategy, content)
+        model = getattr(strategy, "provider", "")
+        with self._lock:
+            quota = self._quota(model)
+
+        # Don't spend calls the provider will refuse; the events are tried again with --resume
+        remaining = quota.exhausted_until - self._clock()
+        if remaining > 0:
+            self.stats["gave_up"] += 1
+            raise LLMRateLimitError(f"AI quota of {model_name(model)} used up for another {remaining:.0f}s, "
+                                    "try again later with --resume")
+
+        for attempt in range(self.max_retries + 1):
+            async with self._in_flight:
+                await self._wait_for_quota(quota, tokens)
+                self.stats["calls"] += 1
+                self.stats["estimated_tokens"] += tokens
+                started = self._clock()
+                error = None
+                try:
+                    # The AI client is blocking, so run it in a thread to keep the event loop free
+                    extracted = await asyncio.to_thread(strategy.run, url, [content])
+                    refusals = [message for message in _error_blocks(extracted) if "rate limit" in message.lower()]
+                    if refusals:
+                        error = refusals[0]
+                except Exception as e:
+                    error = e
+                    if not (is_rate_limit_error(e) or self._rate_limited_since(quota, started)):
+                        raise
+
+            if error is None:
+                return extracted
+
+            # Refused for going over the quota: wait as long as the provider says, then try again
+            self.stats["rate_limited"] += 1
+            wait = self._retry_wait(quota, str(error), started, attempt)
+            if wait is None:
+                logging.error(f"❌ AI quota of {model_name(model)} used up for longer than "
+                              f"{self.max_wait:.0f}s, the remaining events will be tried again with --resume")
+            if wait is None or attempt == self.max_retries:
+                self.stats["gave_up"] += 1
+                raise LLMRateLimitError(
+                    f"AI quota still used up after {attempt + 1} tries" if wait is not None
+                    else f"AI quota used up for longer than {self.max_wait:.0f}s"
+                )
+            self.stats["retries"] += 1
+            self.stats["retry_wait"] += wait
+            with self._lock:
+                quota.paused_until = max(quota.paused_until, self._clock() + wait)
+            logging.warning(f"⏳ AI quota of {model_name(model)} reached for {url}, trying again in {wait:.1f}s "
+                            f"(retry {attempt + 1}/{self.max_retries})")
+            await self._sleep(wait)
+
+        raise LLMRateLimitError("AI quota still used up")  # Not reached
+
+    def _rate_limited_since(self, quota: _ModelQuota, started: float) -> bool:
+        """Whether litellm reported a refused call since `started` (crawl4ai hides the original error)."""
+        with self._lock:
+            return quota.last_rate_limit[0] >= started
+
+    def _retry_wait(self, quota: _ModelQuota, message: str, started: float, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before trying a refused call again.
+
+        Returns:
+            Optional[float]: Seconds to wait, or None if the provider asked for longer than max_wait
+        """
+        wait = retry_wait_from_error(message)
+        with self._lock:
+            reported_at, reported_wait = quota.last_rate_limit
+        if wait is None and reported_at >= started:
+            wait = reported_wait
+        if wait is None:
+            # The provider didn't say: back off exponentially, with some randomness so
+            # calls that were refused together don't all come back at the same moment
+            return min(MAX_RETRY_WAIT, BASE_RETRY_WAIT * 2 ** attempt) * random.uniform(1.0, 1.25)
+        if wait > self.max_wait:
+            with self._lock:
+                quota.exhausted_until = max(quota.exhausted_until, self._clock() + wait)
+            return None
+        return wait + random.uniform(0.1, 0.5)
+
+    def log_stats(self) -> None:
+        """Write how the AI calls went against the quotas to the log."""
+        if not self.stats["calls"]:
+            return
+        logging.info(f"🤖 AI calls: {self.stats['calls']} sent (~{self.stats['estimated_tokens']} tokens), "
+                     f"{self.stats['rate_limited']} refused for the quota, {self.stats['retries']} retried, "
+                     f"{self.stats['gave_up']} given up; waited {self.stats['quota_wait']:.0f}s for quota "
+                     f"and {self.stats['retry_wait']:.0f}s after refusals")
+
+    def close(self) -> None:
+        """Stop listening to litellm's quota reports."""
+        if self._listener is not None and litellm is not None:
+            litellm.callbacks = [callback for callback in (litellm.callbacks or []) if callback is not self._listener]
+            self._listener = None
@@ -0,0 +1,258 @@
+"""
+On-disk cache of loaded event pages.
+
+Each event page is saved (compressed) under its event ID (see Url_Tools.event_key), so
+re-runs and retries can reuse a page loaded recently instead of opening it
+in the browser again. Saved pages expire after a set time, and the least
+recently used pages are deleted when the cache grows past its size budget.
+
+Worker processes started with --workers share the cache folder. Each one looks
+on disk for pages it doesn't know about yet, and counts the files on disk again
+every RESCAN_SECONDS (or as soon as its own count is over the size budget), so
+the budget holds for all workers together without scanning the folder on every save.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Shared_Tools_Both_Steps_Use.File_Manager import ensure_directory_exists
+from Shared_Tools_Both_Steps_Use.Url_Tools import canonicalize_event_url, event_key
+
+# How the cache may be used during a run
+CACHE_MODES = {
+    "read-write": "Use saved pages when fresh and save newly loaded pages",
+    "read-only": "Use saved pages when fresh but never save new ones",
+    "refresh": "Always load pages again and save the new copies",
+    "off": "Don't use the cache at all",
+}
+
+# How often the cache folder is counted again to include pages saved by other worker processes
+RESCAN_SECONDS = 60
+
+class PageContentCache:
+    """
+    Saves loaded event pages (markdown and HTML) as compressed files on disk.
+    """
+
+    def __init__(self, directory: str, ttl_hours: float = 24, max_mb: float = 200, mode: str = "read-write",
+                 rescan_seconds: float = RESCAN_SECONDS):
+        """
+        Set up the cache.
+
+        Args:
+            directory (str): Folder where saved pages are kept
+            ttl_hours (float): How many hours a saved page stays fresh
+            max_mb (float): Maximum total size of saved pages in megabytes
+            mode (str): One of CACHE_MODES
+            rescan_seconds (float): How often to count the pages other worker processes saved
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}'. Choose from: {', '.join(CACHE_MODES)}")
+
+        self.directory = directory
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.mode = mode
+        self.rescan_seconds = rescan_seconds
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0}
+
+        # Size and last-use time of every saved page this process knows about
+        # (refreshed from the folder now and then, as other workers save pages too)
+        self._entries = {}
+        self._total_bytes = 0
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+        if mode != "off":
+            ensure_directory_exists(directory)
+            self._load_entries()
+
+    @property
+    def can_read(self) -> bool:
+        """Whether saved pages may be used in this mode."""
+        return self.mode in ("read-write", "read-only")
+
+    @property
+    def can_write(self) -> bool:
+        """Whether newly loaded pages may be saved in this mode."""
+        return self.mode in ("read-write", "refresh")
+
+    def _load_entries(self) -> None:
+        """Find all pages saved on disk (by this or any other worker process)."""
+        entries = {}
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json.gz"):
+                continue
+            try:
+                info = entry.stat()
+            except FileNotFoundError:
+                # Deleted by another worker meanwhile
+                continue
+            entries[entry.path] = (info.st_mtime, info.st_size)
+        self._entries = entries
+        self._total_bytes = sum(size for _, size in entries.values())
+        self._last_scan = time.monotonic()
+
+    def _path_for(self, url: str) -> str:
+        """
+        Get the file path used for an event page.
+
+        Args:
+            url (str): Event website address
+
+        Returns:
+            str: Path of the cache file
+        """
+        key = hashlib.sha256(event_key(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def _read(self, url: str) -> Optional[Dict]:
+        """Read a saved page from disk (blocking)."""
+        path = self._path_for(url)
+        if path not in self._entries:
+            # Another worker process may have saved it since this one last looked
+            try:
+                info = os.stat(path)
+            except FileNotFoundError:
+                self.stats["misses"] += 1
+                return None
+            self._entries[path] = (info.st_mtime, info.st_size)
+            self._total_bytes += info.st_size
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            # Evicted by another worker process
+            _, size = self._entries.pop(path, (0, 0))
+            self._total_bytes -= size
+            self.stats["misses"] += 1
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ Could not read cached page for {url}: {e}")
+            self._remove(path)
+            self.stats["misses"] += 1
+            return None
+
+        if time.time() - entry.get("fetched_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        # Mark the page as recently used so it is evicted last (by every worker, as they all read the file times)
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except FileNotFoundError:
+            pass
+        self._entries[path] = (now, self._entries[path][1])
+        self.stats["hits"] += 1
+        return entry
+
+    def _write(self, url: str, markdown: str, html: str) -> None:
+        """Save a page to disk (blocking)."""
+        path = self._path_for(url)
+        entry = {
+            "url": url,
+            "canonical_url": canonicalize_event_url(url),
+            "fetched_at": time.time(),
+            "markdown": markdown,
+            "html": html,
+        }
+
+        # Write to a temporary file first so a crash never leaves half a file behind
+        # (one per process, as worker processes share the cache folder)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+            json.dump(entry, file)
+        os.replace(temp_path, path)
+
+        if path in self._entries:
+            self._total_bytes -= self._entries[path][1]
+        size = os.path.getsize(path)
+        self._entries[path] = (time.time(), size)
+        self._total_bytes += size
+        self.stats["writes"] += 1
+
+        self._evict()
+
+    def _locked(self, function, *args):
+        """Run a cache function while holding the cache lock (workers share one cache)."""
+        with self._lock:
+            return function(*args)
+
+    def _remove(self, path: str) -> None:
+        """Delete one saved page."""
+        _, size = self._entries.pop(path, (0, 0))
+        self._total_bytes -= size
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Delete the least recently used pages until the cache fits its size budget."""
+        # Count the pages of every worker process, not just the ones this process saved.
+        # The whole folder is only scanned when needed, as that gets slower the bigger the cache is
+        if self._total_bytes > self.max_bytes or time.monotonic() - self._last_scan >= self.rescan_seconds:
+            self._load_entries()
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        for path, _ in sorted(self._entries.items(), key=lambda item: item[1][0]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            self.stats["evictions"] += 1
+
+    async def get(self, url: str) -> Optional[Dict]:
+        """
+        Get a fresh saved copy of an event page.
+
+        Args:
+            url (str): Event website address
+
+        Returns:
+            Optional[Dict]: Saved page with "markdown" and "html", or None if there is no fresh copy
+        """
+        if not self.can_read:
+            return None
+        return await asyncio.to_thread(self._locked, self._read, url)
+
+    async def put(self, url: str, markdown: str, html: str) -> None:
+        """
+        Save a newly loaded event page.
+
+        Args:
+            url (str): Event website address
+            markdown (str): Page content as markdown
+            html (str): Page content as HTML
+        """
+        if not self.can_write:
+            return
+        try:
+            await asyncio.to_thread(self._locked, self._write, url, markdown, html)
+        except OSError as e:
+            logging.warning(f"⚠️ Could not save page for {url} to cache: {e}")
+
+    def log_stats(self) -> None:
+        """Write cache hit/miss statistics to the log."""
+        if self.mode == "off":
+            return
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / lookups if lookups else 0.0
+        logging.info(f"💾 Page cache ({self.mode}): {self.stats['hits']} hits, {self.stats['misses']} misses "
+                     f"({hit_rate:.0%} hit rate), {self.stats['expired']} expired, "
+                     f"{self.stats['writes']} saved, {self.stats['evictions']} evicted, "
+                     f"{self._total_bytes / (1024 * 1024):.1f} MB on disk")
@@ -5,6 +5,7 @@ Run this script after Step 1 to get full details about the events found.
 Enhanced with better anti-detection measures.
 """
 
+import copy
 import csv
 import asyncio
 import logging
@@ -12,62 +13,211 @@ import argparse
 import sys
 import os
 import random
+from dataclasses import replace
 from datetime import datetime
 
 # Add parent directory to path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Import from crawl4ai
-from crawl4ai import AsyncWebCrawler
+# Step 1's search tools, used by --discover
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "First_Step_Find_All_Events"))
 
 # Import from this directory
-from Event_Information_Collector import scrape_event_details_from_url
+from Event_Detail_Stages import StageContext, collect_event_details, record_failure
+from Event_Pipeline import EventPipeline
+from Browser_Pool import BrowserPool
+from Page_Content_Cache import PageContentCache, CACHE_MODES
+from Extraction_Memo import ExtractionMemo
+from Work_Queue import WorkQueue
+from Event_Version_Store import EventVersionStore
 from Smart_Text_Analyzer_Configuration import get_event_detail_llm_strategy
-from Enhanced_Event_Information_Collector import get_enhanced_browser_config, visit_with_random_behavior, add_anti_detection_scripts
+from LLM_Dispatcher import LLMDispatcher
+from Enhanced_Event_Information_Collector import get_enhanced_browser_config, visit_with_random_behavior
+from Concurrent_Event_Collector import collect_events_concurrently
+from Sharded_Crawl import (
+    default_worker_name, run_coordinator, run_worker, start_worker_processes, stop_worker_processes
+)
 
 # Import from other directories
-from Shared_Tools_Both_Steps_Use.File_Manager import ensure_directory_exists, find_newest_file
+from Shared_Tools_Both_Steps_Use.File_Manager import ensure_directory_exists, event_links_file_name, find_newest_file
+from Shared_Tools_Both_Steps_Use.Run_Statistics import RunStatistics
+from Shared_Tools_Both_Steps_Use.Rate_Limiter import AdaptiveRateController
+from Shared_Tools_Both_Steps_Use.Http_Client import HttpClient
+from Shared_Tools_Both_Steps_Use.Event_Id_Index import EventIdIndex
+from Shared_Tools_Both_Steps_Use.Url_Tools import dedupe_event_links, event_key
+from Shared_Tools_Both_Steps_Use.Render_Profiles import RENDER_PROFILES, attach_render_profile, log_render_summary
 
 # Import main settings
-from Main_Settings import REQUIRED_KEYS
+from Main_Settings import (
+    REQUIRED_KEYS, OUTPUT_DIRS, PAGE_CACHE_TTL_HOURS, PAGE_CACHE_MAX_MB, LLM_TOKEN_BUDGET, DEFAULT_RENDER_PROFILE,
+    RECOLLECT_AFTER_HOURS, BASE_URL, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_MAX_IN_FLIGHT,
+    LLM_EXPECTED_OUTPUT_TOKENS, LLM_MODELS
+)
 
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Collect detailed information about comedy events")
     parser.add_argument("input_csv", nargs="?", type=str, help="Name or path to CSV file with event links")
+    parser.add_argument("--all-link-files", action="store_true",
+                      help="Merge every event links file from Step 1 into one list (each event once) and use that as input")
+    parser.add_argument("--discover", action="store_true",
+                      help="Search Eventbrite for event links (like Step 1) at the same time as collecting their details, "
+                           "instead of reading a links file (turns on pipeline mode)")
+    parser.add_argument("--base-url", type=str, default=BASE_URL,
+                      help="With --discover, the Eventbrite search to find events in")
+    parser.add_argument("--all-searches", action="store_true",
+                      help="With --discover, search every location in every category from Main_Settings.py "
+                           "at the same time, instead of only --base-url")
+    parser.add_argument("--locations", type=str,
+                      help="With --all-searches, comma-separated Eventbrite locations instead of SEARCH_LOCATIONS")
+    parser.add_argument("--categories", type=str,
+                      help="With --all-searches, comma-separated search terms instead of SEARCH_CATEGORIES")
+    parser.add_argument("--search-end", type=int, default=None,
+                      help="With --discover, the last search page to load at most (by default up to the last results page)")
+    parser.add_argument("--search-concurrency", type=int, default=2,
+                      help="With --discover, number of search pages loaded at the same time")
+    parser.add_argument("--search-max-rate", type=float, default=30,
+                      help="With --discover, maximum number of search pages to start per minute (0 for no limit)")
     parser.add_argument("--output", type=str, help="Path to output CSV file for event details")
+    parser.add_argument("--coordinator", action="store_true",
+                      help="Put the input file's links in the shared work queue, wait for workers to process them, "
+                           "then write the output file (add --worker to also work in this process)")
+    parser.add_argument("--worker", action="store_true",
+                      help="Take batches of links from the shared work queue (started by --coordinator) until none are left")
+    parser.add_argument("--work-queue", type=str, default=os.path.join(OUTPUT_DIRS["work_queue"], "work_queue.sqlite3"),
+                      help="Path to the work queue database (use a shared folder for workers on other computers)")
+    parser.add_argument("--workers", type=int, default=0,
+                      help="Number of worker processes to start on this computer, each with its own browsers; "
+                           "this process coordinates them (0 runs everything in this process)")
+    parser.add_argument("--worker-name", type=str, default=default_worker_name(),
+                      help="Name of this worker in the shared work queue")
+    parser.add_argument("--lease-seconds", type=float, default=300,
+                      help="How long a worker keeps its links without a heartbeat before they are given to another worker")
     parser.add_argument("--start-index", type=int, default=0, 
-                      help="Starting index in the links list (for resuming)")
+                      help="Starting index in the links list")
+    parser.add_argument("--resume", action="store_true",
+                      help="Continue the previous run of this input file, skipping links that are already done")
+    parser.add_argument("--max-attempts", type=int, default=3,
+                      help="With --resume, failed links are tried again until they have been tried this many times")
     parser.add_argument("--max-links", type=int, default=0, 
                       help="Maximum number of links to process (0 for all)")
     parser.add_argument("--delay", type=int, default=2, 
-                      help="Delay between requests in seconds")
+                      help="Shortest wait between event pages in seconds when loading one page at a time "
+                           "(the pace adapts to how the website responds)")
     parser.add_argument("--batch-size", type=int, default=8,
-                      help="Number of links to process per browser session")
+                      help="Number of links to process before saving progress")
     parser.add_argument("--headless", action="store_true", default=True,
                       help="Run browser in headless mode")
+    parser.add_argument("--concurrency", type=int, default=1,
+                      help="Number of event pages to load at the same time (1 keeps the one-by-one batch mode)")
+    parser.add_argument("--max-rate", type=float, default=20,
+                      help="Maximum number of event pages to start per minute (0 for no limit); "
+                           "the pace adapts to how the website responds")
+    parser.add_argument("--pipeline", action="store_true",
+                      help="Load pages and run the AI in separate stages joined by a queue")
+    parser.add_argument("--fetch-concurrency", type=int, default=2,
+                      help="Number of pages loaded at the same time in pipeline mode")
+    parser.add_argument("--extract-concurrency", type=int, default=2,
+                      help="Number of AI extractions running at the same time in pipeline mode")
+    parser.add_argument("--queue-size", type=int, default=4,
+                      help="Maximum number of loaded pages waiting for the AI in pipeline mode")
+    parser.add_argument("--llm-models", type=str, default=",".join(LLM_MODELS),
+                      help="Comma-separated AI models, cheapest first; an answer only goes to the next model "
+                           "when fields are missing or don't look right")
+    parser.add_argument("--llm-rpm", type=float, default=LLM_REQUESTS_PER_MINUTE,
+                      help="AI calls allowed per minute for each model by the provider's quota (0 for no limit)")
+    parser.add_argument("--llm-tpm", type=float, default=LLM_TOKENS_PER_MINUTE,
+                      help="Tokens (sent and received) allowed per minute for each model by the provider's quota (0 for no limit)")
+    parser.add_argument("--llm-in-flight", type=int, default=LLM_MAX_IN_FLIGHT,
+                      help="Most AI calls running at the same time")
+    parser.add_argument("--llm-batch-size", type=int, default=1,
+                      help="Number of events sent to the AI in one call in pipeline mode")
+    parser.add_argument("--no-structured-data", action="store_true",
+                      help="Always ask the AI for every field instead of reading the page's structured data first")
+    parser.add_argument("--token-budget", type=int, default=LLM_TOKEN_BUDGET,
+                      help="Maximum number of page tokens sent to the AI after removing menus and related listings (0 sends the whole page)")
+    parser.add_argument("--cache-mode", type=str, choices=list(CACHE_MODES), default="read-write",
+                      help="How to use saved copies of event pages and earlier AI answers: " +
+                           "; ".join(f"{mode} = {description}" for mode, description in CACHE_MODES.items()))
+    parser.add_argument("--cache-ttl-hours", type=float, default=PAGE_CACHE_TTL_HOURS,
+                      help="How many hours a saved event page stays fresh")
+    parser.add_argument("--cache-max-mb", type=float, default=PAGE_CACHE_MAX_MB,
+                      help="Maximum disk space for saved event pages in megabytes")
+    parser.add_argument("--browsers", type=int, default=1,
+                      help="Number of browsers kept running and shared by all workers")
+    parser.add_argument("--recycle-after-pages", type=int, default=50,
+                      help="Restart a browser after it has loaded this many pages (0 for never)")
+    parser.add_argument("--recycle-above-mb", type=float, default=1500,
+                      help="Restart a browser when it uses more memory than this in megabytes (0 for never, needs psutil)")
+    parser.add_argument("--recycle-after-errors", type=int, default=3,
+                      help="Restart a browser after this many failed pages in a row (0 for never)")
+    parser.add_argument("--full-recrawl", action="store_true",
+                      help="Collect every event again, even if its page hasn't changed since the last run")
+    parser.add_argument("--recollect-after-hours", type=float, default=RECOLLECT_AFTER_HOURS,
+                      help="Don't load events whose details were collected less than this many hours ago "
+                           "(0 always loads them; ignored with --cache-mode refresh or off)")
+    parser.add_argument("--fetch-tier", type=str, choices=["auto", "browser"], default="auto",
+                      help="auto = download pages without the browser first and only use the browser for incomplete pages; "
+                           "browser = always use the browser")
+    parser.add_argument("--render-profile", type=str, choices=list(RENDER_PROFILES), default=DEFAULT_RENDER_PROFILE,
+                      help="What the browser downloads: " +
+                           "; ".join(f"{name} = {description}" for name, description in RENDER_PROFILES.items()))
     return parser.parse_args()
 
-def setup_logging():
-    """Set up logging configuration."""
+def setup_logging(worker_name=None):
+    """
+    Set up logging configuration.
+    
+    Args:
+        worker_name (str, optional): Name of this worker, so each worker writes its own log file
+    """
     # Ensure logs directory exists
     ensure_directory_exists("Logs")
     
     # Generate a timestamp for this run
     run_date = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    log_name = f"detail_collector_{run_date}_{worker_name}" if worker_name else f"detail_collector_{run_date}"
     
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s | %(levelname)s | %(message)s",
         datefmt="%H:%M:%S",
         handlers=[
-            logging.FileHandler(f"Logs/detail_collector_{run_date}.log"),
+            logging.FileHandler(f"Logs/{log_name}.log"),
             logging.StreamHandler()
         ]
     )
     
     return run_date
 
+def find_input_file(csv_file):
+    """
+    Find the CSV file with event links.
+    
+    Args:
+        csv_file (str): Name or path of the file (None for the newest event_links file)
+        
+    Returns:
+        str: Path to the file, or None if it could not be found
+    """
+    # If no file specified, find the newest one
+    if not csv_file:
+        csv_file = find_newest_file("Collected_Data/Discovered_Event_Websites", "event_links")
+        if not csv_file:
+            logging.error("❌ No input file specified and no event_links file found")
+        return csv_file
+    
+    # Check if input is a filename or full path
+    if os.path.exists(csv_file):
+        return csv_file  # Use as is
+    if os.path.exists(f"Collected_Data/Discovered_Event_Websites/{csv_file}"):
+        return f"Collected_Data/Discovered_Event_Websites/{csv_file}"
+    
+    # Try finding a file containing the specified name
+    found_file = find_newest_file("Collected_Data/Discovered_Event_Websites", csv_file)
+    if not found_file:
+        logging.error(f"❌ Could not find input file: {csv_file}")
+    return found_file
+
 def read_event_links(csv_file):
     """
     Read event website addresses from a CSV file.
@@ -80,26 +230,9 @@ def read_event_links(csv_file):
     """
     links = []
     
-    # If no file specified, find the newest one
+    csv_file = find_input_file(csv_file)
     if not csv_file:
-        csv_file = find_newest_file("Collected_Data/Discovered_Event_Websites", "event_links")
-        if not csv_file:
-            logging.error("❌ No input file specified and no event_links file found")
-            return []
-    else:
-        # Check if input is a filename or full path
-        if os.path.exists(csv_file):
-            pass  # Use as is
-        elif os.path.exists(f"Collected_Data/Discovered_Event_Websites/{csv_file}"):
-            csv_file = f"Collected_Data/Discovered_Event_Websites/{csv_file}"
-        else:
-            # Try finding a file containing the specified name
-            found_file = find_newest_file("Collected_Data/Discovered_Event_Websites", csv_file)
-            if found_file:
-                csv_file = found_file
-            else:
-                logging.error(f"❌ Could not find input file: {csv_file}")
-                return []
+        return []
     
     logging.info(f"📂 Reading event links from: {csv_file}")
     
@@ -116,8 +249,32 @@ def read_event_links(csv_file):
         logging.error(f"❌ Error reading input file: {e}")
         return []
     
-    logging.info(f"📊 Found {len(links)} event links")
-    return links
+    # The same event can be linked with different tracking parameters; keep each event once
+    unique_links = dedupe_event_links(links)
+    if len(unique_links) < len(links):
+        logging.info(f"🆔 Removed {len(links) - len(unique_links)} duplicate links to the same events")
+    
+    logging.info(f"📊 Found {len(unique_links)} event links")
+    return unique_links
+
+def write_merged_link_file(event_index):
+    """
+    Merge every event links file from Step 1 into one file with each event once.
+    
+    Args:
+        event_index (EventIdIndex): The shared event index
+        
+    Returns:
+        str: Path to the merged file
+    """
+    merged_file = os.path.join(OUTPUT_DIRS["links"], "all_event_links.csv")
+    links = event_index.import_link_files(OUTPUT_DIRS["links"], exclude=[merged_file])
+    with open(merged_file, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=["event_link"])
+        writer.writeheader()
+        for link in links:
+            writer.writerow({"event_link": link})
+    return merged_file
 
 def write_event_data(events, csv_file):
     """
@@ -149,9 +306,12 @@ def update_csv_with_batch(events, csv_file):
     Args:
         events (list): List of event dictionaries to append
         csv_file (str): Path to the CSV file
+        
+    Returns:
+        bool: True if the events were saved
     """
     if not events:
-        return
+        return True
         
     file_exists = os.path.isfile(csv_file)
     
@@ -165,174 +325,809 @@ def update_csv_with_batch(events, csv_file):
                 writer.writerow(event)
         
         logging.info(f"💾 Saved batch of {len(events)} events to '{csv_file}'")
+        return True
     except Exception as e:
         logging.error(f"❌ Error writing batch to output file: {e}")
+        return False
+
+def save_events(events, csv_file, work_queue=None):
+    """
+    Append events to the output file, then mark their links as done in the work queue.
+    
+    Args:
+        events (list): List of event dictionaries to append
+        csv_file (str): Path to the CSV file
+        work_queue (WorkQueue, optional): Work queue of this run
+    """
+    if update_csv_with_batch(events, csv_file) and work_queue:
+        for event in events:
+            work_queue.mark_done(event["event_link"])
 
-async def process_batch(links_batch, crawler, llm_strategy, session_id, delay_base):
+async def process_batch(links_batch, context, session_id):
     """
-    Process a batch of links with a single browser instance.
+    Process a batch of links one at a time.
+    Each page is loaded with a browser leased from the pool, with random human-like behavior.
     
     Args:
         links_batch (list): List of links to process
-        crawler (AsyncWebCrawler): Crawler instance
-        llm_strategy: LLM extraction strategy
+        context (StageContext): Shared stage context (crawler, AI strategy, statistics)
         session_id (str): Session identifier
-        delay_base (int): Base delay between requests
         
     Returns:
         list: List of successfully extracted events
     """
     results = []
     
-    # Get the page for adding anti-detection scripts
-    page = await crawler.get_page()
-    await page.goto("about:blank")  # Navigate to blank page first
-    
-    # Add anti-detection scripts
-    await add_anti_detection_scripts(page)
-    
     for idx, link in enumerate(links_batch, start=1):
         logging.info(f"🔍 Processing {idx}/{len(links_batch)}: {link}")
         
         try:
-            # Create a new configuration for each request with random parameters
-            from crawl4ai import CrawlerRunConfig, CacheMode
-            
-            config = CrawlerRunConfig(
-                cache_mode=CacheMode.BYPASS,
-                extraction_strategy=llm_strategy,
+            # Visit the page once with random human-like behavior and extract event details
+            event = await collect_event_details(
+                context,
+                link,
                 session_id=f"{session_id}_{random.randint(1000, 9999)}",  # Randomize session ID
             )
             
-            # Visit the page with random human-like behavior
-            result = await visit_with_random_behavior(crawler, link, config)
-            
-            # Extract event details
-            event = await scrape_event_details_from_url(
-                crawler=crawler,
-                url=link,
-                session_id=session_id,
-                llm_strategy=llm_strategy,
-                required_keys=REQUIRED_KEYS
-            )
-            
             if event:
                 results.append(event)
                 logging.info(f"✅ Successfully extracted details for event: {event.get('title', 'Unknown')}")
             else:
                 logging.warning(f"⚠️ Failed to extract details from: {link}")
-            
-            # Random delay between requests
-            random_delay = delay_base + random.uniform(1, 4)
-            logging.info(f"⏱️ Waiting {random_delay:.2f} seconds before next request")
-            await asyncio.sleep(random_delay)
-            
-            # Occasionally perform random actions to appear more human-like
-            if random.random() < 0.3:  # 30% chance
-                await page.evaluate("""
-                    window.scrollTo({
-                        top: Math.floor(Math.random() * document.body.scrollHeight * 0.8),
-                        behavior: 'smooth'
-                    });
-                """)
-                await asyncio.sleep(random.uniform(0.5, 2))
+                record_failure(context, link)
             
         except Exception as e:
             logging.error(f"❌ Error processing {link}: {e}")
+            record_failure(context, link, str(e))
     
     return results
 
-async def main():
-    """Main function to run the event detail collector."""
-    print("🔍 STEP 2: COLLECTING DETAILED EVENT INFORMATION 🔍")
-    print("================================================")
+def log_link_work_summary(stats, links, llm_strategy):
+    """
+    Log how many page visits and AI calls each link needed.
     
-    args = parse_args()
-    run_date = setup_logging()
+    Downloads and browser loads are counted separately, because a downloaded page
+    that turns out to be incomplete is loaded in the browser once more on purpose.
     
-    logging.info("🚀 Starting Event Detail Collection (Step 2)")
+    Args:
+        stats (RunStatistics): Statistics collected during the run
+        links (list): Links that were processed
+        llm_strategy: LLM extraction strategy (counts AI calls per link)
+    """
+    llm_calls_by_url = getattr(llm_strategy, "llm_calls_by_url", {})
+    for link in links:
+        stats.per_link[link]["llm_calls"] = llm_calls_by_url.get(link, 0)
     
-    # Determine input file
-    input_file = args.input_csv
-    links = read_event_links(input_file)
-    if not links:
-        print("❌ ERROR: No event links found in the input file.")
-        return 1
+    http_fetches = stats.per_link_distribution("http_fetches", links)
+    browser_fetches = stats.per_link_distribution("browser_fetches", links)
+    llm_calls = stats.per_link_distribution("llm_calls", links)
+    logging.info(f"📊 Downloads per link (downloads: links): {http_fetches}")
+    logging.info(f"📊 Browser page loads per link (loads: links): {browser_fetches}")
+    logging.info(f"📊 AI calls per link (calls: links): {llm_calls}")
     
-    # Determine which links to process
-    start_idx = max(0, min(args.start_index, len(links) - 1))
-    end_idx = len(links)
-    if args.max_links > 0:
-        end_idx = min(start_idx + args.max_links, len(links))
+    extra_work = [
+        link for link in links
+        if any(stats.per_link[link].get(name, 0) > 1 for name in ("http_fetches", "browser_fetches", "llm_calls"))
+    ]
+    for link in extra_work:
+        logging.warning(f"⚠️ {link} needed {stats.per_link[link].get('http_fetches', 0)} downloads, "
+                        f"{stats.per_link[link].get('browser_fetches', 0)} browser page loads "
+                        f"and {stats.per_link[link].get('llm_calls', 0)} AI calls")
     
-    links_to_process = links[start_idx:end_idx]
-    logging.info(f"🔍 Processing {len(links_to_process)} links (from index {start_idx} to {end_idx-1})")
+    # Tokens saved by trimming pages before they were sent to the AI
+    tokens_before = stats.get("llm_input_tokens_before_pruning")
+    tokens_after = stats.get("llm_input_tokens_after_pruning")
+    if tokens_before:
+        logging.info(f"✂️ Page trimming sent ~{tokens_after} instead of ~{tokens_before} tokens to the AI "
+                     f"({1 - tokens_after / tokens_before:.0%} fewer)")
     
-    # Determine output file
-    output_file = args.output
-    if not output_file:
-        # Ensure output directory exists
-        ensure_directory_exists("Collected_Data/Complete_Event_Descriptions")
-        output_file = f"Collected_Data/Complete_Event_Descriptions/detailed_events_{run_date}.csv"
+    # Events that shared an AI call with other events
+    if stats.get("llm_batches"):
+        logging.info(f"📦 {stats.get('llm_batched_events')} events extracted in {stats.get('llm_batches')} "
+                     f"batched AI calls, {stats.get('llm_batch_fallbacks')} extracted again on their own")
     
-    # Initialize LLM strategy
-    llm_strategy = get_event_detail_llm_strategy()
+    # Events collected recently (see --recollect-after-hours) were not loaded at all
+    already_collected = stats.get("events_already_collected")
+    if already_collected:
+        logging.info(f"🆔 {already_collected} links not loaded because their event was collected recently "
+                     f"(their last record was reused)")
     
-    # Setup session ID with timestamp and random component
-    session_id = f"event_detail_scrape_{run_date}_{random.randint(1000, 9999)}"
+    # How pages were loaded: downloaded without the browser, or in the browser
+    http_fetches = stats.get("http_fetches")
+    if http_fetches:
+        http_pages = stats.get("http_pages")
+        logging.info(f"⚡ {http_pages} of {http_fetches} pages downloaded without the browser "
+                     f"(average {stats.timings['http_fetch_time'] / http_fetches * 1000:.0f}ms), "
+                     f"{stats.get('http_escalations')} were incomplete and loaded in the browser")
+    browser_fetches = stats.get("browser_fetches")
+    if browser_fetches:
+        logging.info(f"🌐 {browser_fetches} pages loaded in the browser "
+                     f"(average {stats.timings['browser_fetch_time'] / browser_fetches:.1f}s)")
     
-    # Process links in batches to restart browser regularly
+    # Events fully covered by the page's structured data never needed the AI,
+    # and events with an earlier AI answer for the same content reused it
+    without_llm = stats.get("events_without_llm")
+    from_memo = stats.get("events_from_memo")
+    with_llm = stats.get("events_with_llm")
+    extracted = without_llm + from_memo + with_llm
+    if extracted:
+        logging.info(f"📋 {without_llm} of {extracted} events ({without_llm / extracted:.0%}) "
+                     f"needed no AI call (all details found in structured data)")
+        logging.info(f"🧠 {from_memo} events ({from_memo / extracted:.0%}) reused an earlier AI answer, "
+                     f"{with_llm} ({with_llm / extracted:.0%}) needed a new AI call")
+
+async def run_batch_mode(links, base_context, output_file, session_id, args):
+    """
+    Process links one at a time, saving progress after every batch.
+    Browsers come from the shared pool, which restarts them on its recycling policy.
+    
+    Args:
+        links (list): Links to process
+        base_context (StageContext): Shared stage context with the browser pool
+        output_file (str): Path to the output CSV file
+        session_id (str): Session identifier
+        args (Namespace): Command line arguments
+        
+    Returns:
+        list: List of successfully extracted events
+    """
+    # Process links in batches to save progress regularly
     batch_size = args.batch_size
     all_results = []
     
     # Split links into batches
-    batches = [links_to_process[i:i+batch_size] for i in range(0, len(links_to_process), batch_size)]
+    batches = [links[i:i+batch_size] for i in range(0, len(links), batch_size)]
     
     for batch_num, batch in enumerate(batches, start=1):
         logging.info(f"🔄 Processing batch {batch_num}/{len(batches)} ({len(batch)} links)")
         
-        # Create a fresh browser instance for each batch
-        browser_config = get_enhanced_browser_config(headless=args.headless)
-        
         try:
-            # Create a new browser instance with enhanced config
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                # Process current batch
-                batch_results = await process_batch(
-                    links_batch=batch,
-                    crawler=crawler,
-                    llm_strategy=llm_strategy,
-                    session_id=f"{session_id}_batch_{batch_num}",
-                    delay_base=args.delay
-                )
-                
-                # Add results from this batch
-                all_results.extend(batch_results)
-                
-                # Update CSV after each batch to save progress
-                update_csv_with_batch(batch_results, output_file)
-                
-            # Add a longer delay between batches
-            between_batch_delay = random.uniform(10, 20)
-            logging.info(f"⏱️ Waiting {between_batch_delay:.2f} seconds before next batch")
-            await asyncio.sleep(between_batch_delay)
+            context = replace(base_context, visit=visit_with_random_behavior)
+            
+            # Process current batch
+            batch_results = await process_batch(
+                links_batch=batch,
+                context=context,
+                session_id=f"{session_id}_batch_{batch_num}"
+            )
+            
+            # Add results from this batch
+            all_results.extend(batch_results)
+            
+            # Update CSV after each batch to save progress
+            # (the pace between pages comes from the rate controller in the context)
+            save_events(batch_results, output_file, context.work_queue)
             
         except Exception as e:
             logging.error(f"❌ Error during batch {batch_num}: {e}")
     
+    return all_results
+
+async def run_concurrent_mode(links, base_context, output_file, args):
+    """
+    Process several links at the same time over the shared browser pool.
+    Results are saved in the same order as the input links.
+    
+    Args:
+        links (list): Links to process
+        base_context (StageContext): Shared stage context with the browser pool
+        output_file (str): Path to the output CSV file
+        args (Namespace): Command line arguments
+        
+    Returns:
+        list: List of successfully extracted events
+    """
+    logging.info(f"⚡ Concurrent mode: {args.concurrency} pages in flight, "
+                 f"at most {args.max_rate:g} new pages per minute")
+    
+    return await collect_events_concurrently(
+        links=links,
+        context=base_context,
+        concurrency=args.concurrency,
+        on_ready=lambda events: save_events(events, output_file, base_context.work_queue)
+    )
+
+async def run_pipeline_mode(links, base_context, output_file, args):
+    """
+    Load pages and run the AI in separate stages joined by a bounded queue,
+    so the browser and the AI are never waiting on each other.
+    Results are saved in the same order as the input links.
+    
+    Args:
+        links (list): Links to process
+        base_context (StageContext): Shared stage context with the browser pool
+        output_file (str): Path to the output CSV file
+        args (Namespace): Command line arguments
+        
+    Returns:
+        list: List of successfully extracted events
+    """
+    logging.info(f"⚡ Pipeline mode: {args.fetch_concurrency} fetch workers, "
+                 f"{args.extract_concurrency} extract workers, queue size {args.queue_size}, "
+                 f"up to {args.llm_batch_size} events per AI call")
+    
+    pipeline = EventPipeline(
+        base_context,
+        fetch_concurrency=args.fetch_concurrency,
+        extract_concurrency=args.extract_concurrency,
+        queue_size=args.queue_size,
+        llm_batch_size=args.llm_batch_size
+    )
+    return await pipeline.run(
+        links,
+        on_ready=lambda events: save_events(events, output_file, base_context.work_queue)
+    )
+
+async def run_discovery_mode(base_context, output_file, run_date, args):
+    """
+    Search for event links and collect their details at the same time.
+    Each new event found by the search goes straight to the pipeline, so the
+    browser and the AI start working while the search is still going.
+    The links file is written when the search is done, just like Step 1 does.
+    
+    Args:
+        base_context (StageContext): Shared stage context with the browser pool
+        output_file (str): Path to the output CSV file
+        run_date (str): Timestamp for this run
+        args (Namespace): Command line arguments
+        
+    Returns:
+        tuple: Successfully extracted events, and all links that were found
+    """
+    # Step 1's tools need selenium, so they are only loaded when searching
+    from Event_Finder import save_links_to_csv
+    from Parallel_Event_Finder import ParallelEventFinder
+    from Search_Seeds import build_search_urls
+    
+    links_file = event_links_file_name(run_date)
+    seeds = [args.base_url]
+    if args.all_searches:
+        seeds = build_search_urls(
+            args.locations.split(",") if args.locations else None,
+            args.categories.split(",") if args.categories else None
+        )
+    logging.info(f"🔭 Discovery mode: running {len(seeds)} search{'es' if len(seeds) != 1 else ''} "
+                 f"({args.search_concurrency} search pages at a time) while collecting details")
+    
+    found_links = asyncio.Queue()
+    seen_events = set()
+    
+    def on_links(page_links):
+        # Only events not found earlier in this search go to the pipeline
+        new_links = [link for link in dedupe_event_links(page_links) if event_key(link) not in seen_events]
+        seen_events.update(event_key(link) for link in new_links)
+        if not new_links:
+            return
+        base_context.event_index.record_discovered(new_links, source=links_file)
+        base_context.work_queue.add(new_links)
+        logging.info(f"🔭 {len(new_links)} new events found, {len(seen_events)} so far")
+        for link in new_links:
+            found_links.put_nowait(link)
+    
+    async def link_stream():
+        while True:
+            link = await found_links.get()
+            if link is None:
+                return
+            yield link
+    
+    finder = ParallelEventFinder(
+        headless=args.headless,
+        render_profile=args.render_profile,
+        concurrency=args.search_concurrency,
+        max_rate=args.search_max_rate
+    )
+    
+    async def search():
+        try:
+            return await finder.search_seeds(
+                seeds,
+                end=args.search_end,
+                run_date=run_date,
+                on_links=on_links
+            )
+        finally:
+            # End the stream, even if the search failed
+            found_links.put_nowait(None)
+    
+    search_task = asyncio.create_task(search())
+    pipeline = EventPipeline(
+        base_context,
+        fetch_concurrency=args.fetch_concurrency,
+        extract_concurrency=args.extract_concurrency,
+        queue_size=args.queue_size,
+        llm_batch_size=args.llm_batch_size
+    )
+    try:
+        all_results = await pipeline.run(
+            link_stream(),
+            on_ready=lambda events: save_events(events, output_file, base_context.work_queue)
+        )
+    except BaseException:
+        search_task.cancel()
+        raise
+    links = await search_task
+    
+    # Same links file Step 1 would have written (so this run can be resumed from it)
+    save_links_to_csv(links, filename=links_file)
+    return all_results, links
+
+def make_rate_controller(args):
+    """
+    Make the rate controller that paces the event page loads of this run.
+    
+    Args:
+        args (Namespace): Command line arguments
+        
+    Returns:
+        AdaptiveRateController: Starts at half of --max-rate and adapts to how the website responds
+    """
+    if args.pipeline and not (args.coordinator or args.worker):
+        concurrency = args.fetch_concurrency
+    else:
+        concurrency = args.concurrency
+    
+    max_rate = args.max_rate
+    start_rate = None
+    jitter = 0.0
+    if concurrency <= 1 and args.delay > 0:
+        # One page at a time: never faster than one page every --delay seconds, starting at
+        # the pace of the old fixed waits (--delay plus 1 to 4 seconds), with some randomness
+        max_rate = min(max_rate, 60 / args.delay) if max_rate > 0 else 60 / args.delay
+        start_rate = 60 / (args.delay + 2.5)
+        jitter = 0.3
+    
+    return AdaptiveRateController(
+        max_rate,
+        start_rate=start_rate,
+        max_concurrency=concurrency,
+        jitter=jitter,
+        state_file=os.path.join(OUTPUT_DIRS["pacing"], "host_pace.json"),
+        name="event pages"
+    )
+
+def local_worker_args(args, input_file):
+    """
+    Make the command line arguments of each worker process started with --workers.
+    
+    Args:
+        args (Namespace): Command line arguments of the coordinator
+        input_file (str): The links file the coordinator put in the work queue
+        
+    Returns:
+        list: One set of arguments per worker
+    """
+    worker_args = []
+    for number in range(1, args.workers + 1):
+        worker = copy.copy(args)
+        worker.coordinator = False
+        worker.worker = True
+        worker.workers = 0
+        worker.input_csv = input_file
+        worker.worker_name = f"{args.worker_name}-{number}"
+        # --max-rate and the AI quotas are limits for the whole run, so the workers share them
+        worker.max_rate = args.max_rate / args.workers
+        worker.llm_rpm = args.llm_rpm / args.workers
+        worker.llm_tpm = args.llm_tpm / args.workers
+        worker.llm_in_flight = max(1, args.llm_in_flight // args.workers)
+        worker_args.append(worker)
+    return worker_args
+
+def run_worker_process(args):
+    """Run one worker started with --workers (in its own process, with its own event loop and browsers)."""
+    sys.exit(asyncio.run(main(args)))
+
+async def run_sharded_mode(base_context, output_file, input_file, args):
+    """
+    Work on a shared work queue as coordinator, worker, or both.
+    The coordinator writes the output file from the shared results once every link is finished.
+    With --workers, the coordinator first starts its own worker processes.
+    
+    Args:
+        base_context (StageContext): Shared stage context with the browser pool and the shared work queue
+        output_file (str): Path to the output CSV file (written by the coordinator)
+        input_file (str): The links file in the work queue
+        args (Namespace): Command line arguments
+        
+    Returns:
+        tuple: Events collected (all events for the coordinator), and the links this process worked on
+    """
+    processes = []
+    if args.workers:
+        processes = start_worker_processes(run_worker_process, local_worker_args(args, input_file))
+    
+    worker_task = None
+    if args.worker:
+        worker_task = asyncio.create_task(run_worker(
+            base_context,
+            worker=args.worker_name,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            lease_seconds=args.lease_seconds,
+            max_attempts=args.max_attempts
+        ))
+    
+    def no_workers_left():
+        return (not any(process.is_alive() for process in processes)
+                and (worker_task is None or worker_task.done()))
+    
+    try:
+        all_events = await run_coordinator(
+            base_context.work_queue,
+            args.max_attempts,
+            stop_when=no_workers_left if processes else None
+        ) if args.coordinator else []
+        processed, collected = await worker_task if worker_task else ([], [])
+    except BaseException:
+        if worker_task:
+            worker_task.cancel()
+        stop_worker_processes(processes, timeout=0)
+        raise
+    stop_worker_processes(processes)
+    
+    if args.coordinator:
+        # Every event once, in input order, no matter which worker collected it
+        write_event_data(all_events, output_file)
+        return all_events, processed
+    return collected, processed
+
+def default_output_file(args, run_date):
+    """
+    Get the output file of this run.
+    
+    Args:
+        args (Namespace): Command line arguments
+        run_date (str): Timestamp for this run
+        
+    Returns:
+        str: --output, or a new file in the complete event descriptions folder
+    """
+    if args.output:
+        return args.output
+    ensure_directory_exists("Collected_Data/Complete_Event_Descriptions")
+    return f"Collected_Data/Complete_Event_Descriptions/detailed_events_{run_date}.csv"
+
+def prepare_worker_run(args):
+    """
+    Join the shared work queue a coordinator started (workers don't read a links file).
+    
+    Args:
+        args (Namespace): Command line arguments
+        
+    Returns:
+        tuple: Work queue, links to process (none, they are leased from the queue) and output file,
+               or None if no coordinator started a queue
+    """
+    input_file = find_input_file(args.input_csv) if args.input_csv else None
+    work_queue = WorkQueue(args.work_queue, input_file)
+    if not work_queue.queue:
+        print("❌ ERROR: No work queue found. Start a coordinator first (--coordinator).")
+        work_queue.close()
+        return None
+    
+    logging.info(f"👷 Working on the shared queue {work_queue.queue} in {work_queue.path}")
+    # Workers save their events in the shared queue; the coordinator writes this file
+    return work_queue, [], work_queue.output_file()
+
+def prepare_discovery_run(args, run_date):
+    """
+    Start a work queue for the links file this run writes when its search is done.
+    
+    Args:
+        args (Namespace): Command line arguments
+        run_date (str): Timestamp for this run
+        
+    Returns:
+        tuple: Work queue, links to process (none yet, they are found while the run goes on) and output file
+    """
+    if args.resume:
+        logging.warning("⚠️ --resume does not apply to --discover; to resume this run later, "
+                        "pass the links file it writes")
+        args.resume = False
+    
+    input_file = os.path.join(OUTPUT_DIRS["links"], event_links_file_name(run_date))
+    output_file = default_output_file(args, run_date)
+    work_queue = WorkQueue(args.work_queue, input_file)
+    work_queue.start([], output_file, max_attempts=args.max_attempts)
+    
+    logging.info(f"🔍 Processing links as they are found, saving to {output_file}")
+    return work_queue, [], output_file
+
+def prepare_links_file_run(args, run_date, event_index):
+    """
+    Read the input links file (or merge every links file with --all-link-files) into the work queue.
+    
+    Args:
+        args (Namespace): Command line arguments
+        run_date (str): Timestamp for this run
+        event_index (EventIdIndex): The shared event index
+        
+    Returns:
+        tuple: Work queue, links to process and output file, or None if the input file has no links
+    """
+    input_file = write_merged_link_file(event_index) if args.all_link_files else find_input_file(args.input_csv)
+    links = read_event_links(input_file) if input_file else []
+    if not links:
+        print("❌ ERROR: No event links found in the input file.")
+        return None
+    
+    # Record the state of every link, so an interrupted run can be resumed
+    output_file = default_output_file(args, run_date)
+    work_queue = WorkQueue(args.work_queue, input_file)
+    remaining, queue_output_file = work_queue.start(links, output_file, resume=args.resume,
+                                                    max_attempts=args.max_attempts)
+    
+    if args.resume:
+        output_file = args.output or queue_output_file
+        return work_queue, select_resumed_links(links, remaining, output_file, args), output_file
+    return work_queue, select_links_by_index(remaining, args), output_file
+
+def select_resumed_links(links, remaining, output_file, args):
+    """
+    Pick the links a resumed run processes: the ones not done yet, up to --max-links.
+    
+    Args:
+        links (list): Every link of the input file
+        remaining (list): Links of the input file not done yet
+        output_file (str): Output file of the run being resumed
+        args (Namespace): Command line arguments
+        
+    Returns:
+        list: Links to process
+    """
+    links_to_process = remaining[:args.max_links] if args.max_links > 0 else remaining
+    logging.info(f"🔁 Resuming: {len(links) - len(remaining)} of {len(links)} links already finished, "
+                 f"processing {len(links_to_process)} now, saving to {output_file}")
+    return links_to_process
+
+def select_links_by_index(remaining, args):
+    """
+    Pick the links of a new run: from --start-index, up to --max-links.
+    
+    Args:
+        remaining (list): Links of the input file still to process
+        args (Namespace): Command line arguments
+        
+    Returns:
+        list: Links to process
+    """
+    start_idx = max(0, min(args.start_index, len(remaining) - 1))
+    end_idx = len(remaining)
+    if args.max_links > 0:
+        end_idx = min(start_idx + args.max_links, len(remaining))
+    logging.info(f"🔍 Processing {end_idx - start_idx} links (from index {start_idx} to {end_idx-1})")
+    return remaining[start_idx:end_idx]
+
+def make_stage_context(args, work_queue, event_index):
+    """
+    Set up everything the stages share: the AI, caches, browsers, downloader and pacing.
+    
+    Args:
+        args (Namespace): Command line arguments
+        work_queue (WorkQueue): Work queue of this run
+        event_index (EventIdIndex): The shared event index
+        
+    Returns:
+        tuple: The stage context, and the page cache (kept for its statistics even with --cache-mode off)
+    """
+    # Initialize LLM strategy (one per model of the cascade, cheapest first)
+    llm_models = [model.strip() for model in args.llm_models.split(",") if model.strip()]
+    llm_strategy = get_event_detail_llm_strategy(models=llm_models)
+    
+    # Keeps the AI calls within the provider's quotas, retrying calls it refuses
+    llm_dispatcher = LLMDispatcher(
+        requests_per_minute=args.llm_rpm,
+        tokens_per_minute=args.llm_tpm,
+        max_in_flight=args.llm_in_flight,
+        expected_output_tokens=LLM_EXPECTED_OUTPUT_TOKENS
+    )
+    
+    stats = RunStatistics()
+    
+    # Saved copies of event pages from earlier runs
+    page_cache = PageContentCache(
+        directory=OUTPUT_DIRS["page_cache"],
+        ttl_hours=args.cache_ttl_hours,
+        max_mb=args.cache_max_mb,
+        mode=args.cache_mode
+    )
+    
+    # Earlier AI answers, reused when a page's content hasn't changed
+    extraction_memo = None
+    if args.cache_mode != "off":
+        extraction_memo = ExtractionMemo(
+            os.path.join(OUTPUT_DIRS["extraction_memo"], "extraction_memo.sqlite3"),
+            mode=args.cache_mode
+        )
+    
+    # Long-lived browsers shared by all modes, restarted on the recycling policy
+    # (each restart gets a fresh browser fingerprint from get_enhanced_browser_config)
+    browser_pool = BrowserPool(
+        lambda: get_enhanced_browser_config(headless=args.headless),
+        size=args.browsers,
+        max_pages=args.recycle_after_pages,
+        max_memory_mb=args.recycle_above_mb,
+        max_error_streak=args.recycle_after_errors,
+        setup=lambda crawler: attach_render_profile(crawler, args.render_profile, stats)
+    )
+    
+    # Lightweight downloader tried before the browser
+    http_client = None
+    if args.fetch_tier == "auto":
+        http_client = HttpClient(max_connections=max(args.concurrency, args.fetch_concurrency, 2))
+        if not http_client.available:
+            logging.warning("⚠️ aiohttp is not installed, loading every page in the browser")
+            http_client = None
+    
+    # Last collected version of each event, so unchanged events are carried forward
+    version_store = None
+    if not args.full_recrawl:
+        version_store = EventVersionStore(os.path.join(OUTPUT_DIRS["event_versions"], "event_versions.sqlite3"))
+    
+    # Recently collected events are only skipped when the run may reuse earlier work
+    recollect_after_hours = args.recollect_after_hours
+    if args.full_recrawl:
+        recollect_after_hours = 0
+    elif args.cache_mode in ("refresh", "off") and recollect_after_hours > 0:
+        logging.info(f"🆔 --cache-mode {args.cache_mode} loads every page again, "
+                     f"including events collected in the last {recollect_after_hours:g} hours")
+        recollect_after_hours = 0
+    
+    base_context = StageContext(
+        crawler=None,
+        llm_strategy=llm_strategy,
+        required_keys=REQUIRED_KEYS,
+        stats=stats,
+        # Paces the page loads from how Eventbrite responds
+        rate_limiter=make_rate_controller(args),
+        llm_dispatcher=llm_dispatcher,
+        page_cache=page_cache if args.cache_mode != "off" else None,
+        extraction_memo=extraction_memo,
+        use_structured_data=not args.no_structured_data,
+        token_budget=args.token_budget,
+        browser_pool=browser_pool,
+        http_client=http_client,
+        work_queue=work_queue,
+        version_store=version_store,
+        event_index=event_index,
+        recollect_after_hours=recollect_after_hours
+    )
+    return base_context, page_cache
+
+async def close_stage_context(context):
+    """
+    Close the browsers, downloader and databases of the stage context.
+    
+    Args:
+        context (StageContext): The stage context of this run
+    """
+    await context.browser_pool.close()
+    context.rate_limiter.close()
+    context.llm_dispatcher.close()
+    if context.http_client:
+        await context.http_client.close()
+    context.work_queue.log_stats()
+    context.work_queue.close()
+    if context.version_store:
+        context.version_store.log_stats()
+        context.version_store.close()
+    context.event_index.log_stats()
+    context.event_index.close()
+
+def log_run_summary(context, page_cache, links_to_process, args):
+    """
+    Log what the run used: AI calls, work per link, browsers, downloads and caches.
+    
+    Args:
+        context (StageContext): The stage context of this run
+        page_cache (PageContentCache): Saved copies of event pages
+        links_to_process (list): Links this process worked on
+        args (Namespace): Command line arguments
+    """
+    llm_strategy = context.llm_strategy
+    
     # Show LLM usage statistics
     if hasattr(llm_strategy, 'show_usage'):
         llm_strategy.show_usage()
+    context.llm_dispatcher.log_stats()
+    llm_strategy.cascade.log_summary()
+    
+    # Show how much work each link needed
+    log_link_work_summary(context.stats, links_to_process, llm_strategy)
+    context.browser_pool.log_stats()
+    log_render_summary(context.stats, args.render_profile)
+    page_cache.log_stats()
+    if context.extraction_memo:
+        context.extraction_memo.log_stats()
+        context.extraction_memo.close()
+    context.stats.log_summary("Step 2 run summary")
+
+async def main(args=None):
+    """
+    Main function to run the event detail collector.
+    
+    Args:
+        args (Namespace, optional): Command line arguments (read from the command line if not given)
+    """
+    print("🔍 STEP 2: COLLECTING DETAILED EVENT INFORMATION 🔍")
+    print("================================================")
+    
+    args = args or parse_args()
+    run_date = setup_logging(args.worker_name if args.worker and not args.coordinator else None)
+    
+    logging.info("🚀 Starting Event Detail Collection (Step 2)")
+    
+    # With --workers this process coordinates worker processes started on this computer
+    if args.workers > 0:
+        if args.discover:
+            logging.warning("⚠️ --workers does not apply to --discover, collecting in this process")
+            args.workers = 0
+        else:
+            args.coordinator = True
+    
+    if args.discover and not args.pipeline:
+        logging.info("🔭 --discover runs in pipeline mode, turning on --pipeline")
+        args.pipeline = True
+    elif args.llm_batch_size > 1 and not args.pipeline:
+        logging.info("📦 --llm-batch-size needs pipeline mode, turning on --pipeline")
+        args.pipeline = True
+    
+    # Every known event by event ID, shared with Step 1
+    event_index = EventIdIndex(os.path.join(OUTPUT_DIRS["event_index"], "event_index.sqlite3"))
+    
+    worker_only = args.worker and not args.coordinator
+    if worker_only:
+        prepared = prepare_worker_run(args)
+    elif args.discover:
+        prepared = prepare_discovery_run(args, run_date)
+    else:
+        prepared = prepare_links_file_run(args, run_date, event_index)
+    if prepared is None:
+        event_index.close()
+        return 1
+    work_queue, links_to_process, output_file = prepared
+    
+    if not links_to_process and not (args.discover or args.worker or args.coordinator):
+        logging.info("✅ Every link of this input file is already done, nothing to do")
+        work_queue.log_stats()
+        work_queue.close()
+        event_index.close()
+        return 0
+    
+    base_context, page_cache = make_stage_context(args, work_queue, event_index)
+    
+    # Setup session ID with timestamp and random component
+    session_id = f"event_detail_scrape_{run_date}_{random.randint(1000, 9999)}"
+    
+    try:
+        if args.coordinator or args.worker:
+            all_results, links_to_process = await run_sharded_mode(base_context, output_file, work_queue.queue, args)
+        elif args.discover:
+            all_results, links_to_process = await run_discovery_mode(base_context, output_file, run_date, args)
+        elif args.pipeline:
+            all_results = await run_pipeline_mode(links_to_process, base_context, output_file, args)
+        elif args.concurrency > 1:
+            all_results = await run_concurrent_mode(links_to_process, base_context, output_file, args)
+        else:
+            all_results = await run_batch_mode(links_to_process, base_context, output_file, session_id, args)
+    finally:
+        await close_stage_context(base_context)
+    
+    log_run_summary(base_context, page_cache, links_to_process, args)
     
     logging.info(f"🎉 Event detail collection completed. Processed {len(links_to_process)} links, " 
                f"successfully extracted {len(all_results)} events.")
                
     print("\n================================================")
     print(f"✅ COLLECTED INFORMATION ABOUT {len(all_results)} EVENTS!")
-    print(f"✅ SAVED TO: {output_file}")
+    if worker_only:
+        print(f"✅ SAVED IN THE SHARED WORK QUEUE: {work_queue.path}")
+        print(f"   (the coordinator writes them to {output_file} once every link is finished)")
+    else:
+        print(f"✅ SAVED TO: {output_file}")
     print("================================================")
     
     return 0
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
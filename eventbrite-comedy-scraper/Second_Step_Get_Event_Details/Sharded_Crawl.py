@@ -0,0 +1,168 @@
+"""
+Coordinator and worker roles for spreading one run over several processes or computers.
+
+The coordinator puts the links of an input file in the shared work queue, reclaims
+links from workers that stopped responding, and writes the output file once every
+link is finished. Each worker leases a batch of links, keeps its lease alive with
+heartbeats while it collects the events, and saves the events in the shared
+results table (each event ID only once).
+
+With --workers, one computer runs the coordinator and starts the workers as
+separate processes, so every worker has its own event loop and browsers and
+the page rendering is spread over all processor cores.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+from typing import Callable, Dict, List, Optional, Tuple
+
+from Concurrent_Event_Collector import collect_events_concurrently
+from Event_Detail_Stages import StageContext
+
+def default_worker_name() -> str:
+    """A worker name that is different for every process on every computer."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+async def _send_heartbeats(work_queue, worker: str, lease_seconds: float) -> None:
+    """Renew the worker's leases a few times per lease period, until cancelled."""
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        work_queue.heartbeat(worker, lease_seconds)
+
+async def run_worker(
+    context: StageContext,
+    worker: str,
+    batch_size: int,
+    concurrency: int = 1,
+    lease_seconds: float = 300,
+    max_attempts: int = 3,
+    poll_seconds: float = 15,
+) -> Tuple[List[str], List[Dict]]:
+    """
+    Lease and process batches of links from the shared work queue until no links are left.
+
+    Args:
+        context (StageContext): Shared stage context (its work_queue is the shared queue)
+        worker (str): Name of this worker
+        batch_size (int): Number of links to lease at a time
+        concurrency (int): Number of event pages in flight within a batch
+        lease_seconds (float): How long a lease lasts without a heartbeat
+        max_attempts (int): Failed links are only taken again while they have fewer attempts than this
+        poll_seconds (float): How long to wait before asking again when other workers hold the remaining links
+
+    Returns:
+        Tuple[List[str], List[Dict]]: Links this worker processed, and the events it collected
+    """
+    work_queue = context.work_queue
+    processed = []
+    collected = []
+    saved = 0
+
+    def on_ready(events: List[Dict]) -> None:
+        nonlocal saved
+        saved += work_queue.save_results(events, worker)
+        collected.extend(events)
+
+    logging.info(f"👷 Worker {worker} started (batches of {batch_size}, leases of {lease_seconds:.0f}s)")
+    heartbeats = asyncio.create_task(_send_heartbeats(work_queue, worker, lease_seconds))
+    try:
+        while True:
+            links = work_queue.lease(worker, batch_size, lease_seconds, max_attempts)
+            if not links:
+                if not work_queue.unfinished(max_attempts):
+                    break
+                # Other workers still hold links; their leases may run out
+                await asyncio.sleep(poll_seconds)
+                continue
+
+            logging.info(f"👷 Worker {worker} leased {len(links)} links")
+            try:
+                await collect_events_concurrently(links, context, concurrency=max(1, concurrency), on_ready=on_ready)
+            finally:
+                # Anything not saved or marked failed goes back for another try
+                work_queue.release(worker)
+            processed.extend(links)
+    finally:
+        heartbeats.cancel()
+
+    logging.info(f"👷 Worker {worker} finished: {len(processed)} links processed, {saved} events saved "
+                 f"({len(collected) - saved} already saved by another worker)")
+    return processed, collected
+
+def start_worker_processes(target: Callable, worker_args: List) -> List[multiprocessing.Process]:
+    """
+    Start one worker process for each set of arguments.
+
+    The processes are spawned rather than forked, so none of them inherits
+    this process's event loop, browsers or database connections.
+
+    Args:
+        target (Callable): Module-level function each process runs with its arguments
+        worker_args (List): Arguments for each worker (each with its own worker_name)
+
+    Returns:
+        List[multiprocessing.Process]: The started processes
+    """
+    spawn = multiprocessing.get_context("spawn")
+    processes = []
+    for args in worker_args:
+        process = spawn.Process(target=target, args=(args,), name=args.worker_name)
+        process.start()
+        processes.append(process)
+    logging.info(f"👷 Started {len(processes)} worker processes: {', '.join(p.name for p in processes)}")
+    return processes
+
+def stop_worker_processes(processes: List[multiprocessing.Process], timeout: float = 60) -> None:
+    """
+    Wait for the worker processes to exit, stopping any that are still running after the timeout.
+
+    Args:
+        processes (List[multiprocessing.Process]): The worker processes
+        timeout (float): Seconds to give each worker to close its browsers and exit
+    """
+    for process in processes:
+        process.join(timeout)
+        if process.is_alive():
+            logging.warning(f"⚠️ Stopping worker {process.name}")
+            process.terminate()
+            process.join()
+        if process.exitcode:
+            logging.warning(f"⚠️ Worker {process.name} exited with code {process.exitcode}")
+
+async def run_coordinator(
+    work_queue,
+    max_attempts: int = 3,
+    poll_seconds: float = 15,
+    stop_when: Optional[Callable[[], bool]] = None,
+) -> List[Dict]:
+    """
+    Wait for the workers to finish every link of the queue, reclaiming expired leases meanwhile.
+
+    Args:
+        work_queue (WorkQueue): The shared work queue (already started with the links)
+        max_attempts (int): Failed links count as finished once they have been tried this many times
+        poll_seconds (float): Seconds between progress checks
+        stop_when (Callable, optional): Stop waiting when this returns True (e.g. when no worker is left)
+
+    Returns:
+        List[Dict]: Every saved event, in input order
+    """
+    logging.info("🧭 Coordinator waiting for workers "
+                 f"(start them with: Run_This_Second_To_Get_Event_Details.py --worker --work-queue {work_queue.path})")
+    while True:
+        work_queue.reclaim_expired()
+        unfinished = work_queue.unfinished(max_attempts)
+        if not unfinished:
+            break
+        if stop_when and stop_when():
+            logging.warning(f"⚠️ No workers left, {unfinished} links are not finished "
+                            "(run again with --resume to collect them)")
+            break
+        counts = work_queue.counts()
+        logging.info(f"🧭 {counts['done']} done, {counts['in-flight']} in flight, {unfinished} still to do")
+        await asyncio.sleep(poll_seconds)
+
+    return work_queue.results()
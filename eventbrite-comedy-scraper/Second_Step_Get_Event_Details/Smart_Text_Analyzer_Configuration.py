@@ -1,79 +1,277 @@
 """
 Configuration for the smart text analyzer (AI/LLM) used to extract event information.
+
+Several AI models can be given, cheapest and fastest first (a model cascade). Each
+analyzer then knows the analyzer for the next model (its next_tier), and all of them
+share one ModelCascadeStats that records how often each model's answer was kept.
 """
 
 import os
 import logging
+from collections import defaultdict
 from dotenv import load_dotenv
-from typing import Dict
+from typing import Dict, List, Optional
 
 from crawl4ai import LLMExtractionStrategy
 
 # Load environment variables from .env file
 load_dotenv()
 
-def get_event_detail_llm_strategy() -> LLMExtractionStrategy:
+# The AI model used when no models are given
+DEFAULT_MODEL = "groq/deepseek-r1-distill-llama-70b"
+
+# Description of each event field, used in the information structure (schema) given to the AI.
+# This matches the required fields in Main_Settings.py
+FIELD_DESCRIPTIONS = {
+    "title": "The title of the comedy event",
+    "venue": "The name of the venue where the event is held",
+    "summary": "A brief summary or description of the event",
+    "address": "The physical address of the venue",
+    "email": "Contact email for the event or venue",
+    "city": "The city where the event is taking place",
+    "province": "The province where the event is taking place",
+    "producers": "The names of individuals or organizations producing the event",
+    "event_link": "URL link to the event page",
+    "date": "The date and time when the event takes place",
+}
+
+# How the AI should extract each field
+FIELD_INSTRUCTIONS = {
+    "title": "Extract the complete title of the event",
+    "venue": "Extract the name of the venue where the event is held",
+    "summary": "Extract a concise description of the event (1-3 sentences)",
+    "address": "Extract the full physical address of the venue",
+    "email": "Extract any contact email address for the event or venue",
+    "city": "Extract only the city name",
+    "province": "Extract only the province name",
+    "producers": "Extract names of individuals or organizations producing/hosting the event",
+    "date": "Extract the date and time of the event",
+}
+
+class ModelCascadeStats:
+    """
+    How each model of a cascade did: how many answers it gave, how many were kept
+    and how many were sent on to the next model, how long its calls took, and
+    how many tokens it used.
+    """
+
+    def __init__(self, models: List[str]):
+        """
+        Args:
+            models (List[str]): The AI models, cheapest first
+        """
+        self.models = list(models)
+        self.tiers = {model: {"calls": 0, "accepted": 0, "escalated": 0, "seconds": 0.0} for model in self.models}
+        # Every analyzer of the cascade, for adding up their token use
+        self.strategies = []
+
+    def record(self, model: str, seconds: float, accepted: bool) -> None:
+        """
+        Record one answer of a model.
+
+        Args:
+            model (str): The model that answered
+            seconds (float): How long the call took
+            accepted (bool): Whether the answer was kept (False if it was sent on to the next model)
+        """
+        tier = self.tiers.setdefault(model, {"calls": 0, "accepted": 0, "escalated": 0, "seconds": 0.0})
+        tier["calls"] += 1
+        tier["seconds"] += seconds
+        tier["accepted" if accepted else "escalated"] += 1
+
+    def tokens(self, model: str) -> Dict[str, int]:
+        """Tokens sent to and received from a model, by all analyzers of the cascade (batches included)."""
+        used = {"prompt": 0, "completion": 0}
+        for strategy in self.strategies:
+            if strategy.provider == model:
+                usage = getattr(strategy, "total_usage", None)
+                used["prompt"] += getattr(usage, "prompt_tokens", 0) or 0
+                used["completion"] += getattr(usage, "completion_tokens", 0) or 0
+        return used
+
+    def log_summary(self) -> None:
+        """Write each model's hit rate, average call time and token use to the log."""
+        if len(self.models) < 2 or not any(tier["calls"] for tier in self.tiers.values()):
+            return
+        logging.info(f"🪜 Model cascade ({' -> '.join(self.models)}):")
+        for model in self.models:
+            tier = self.tiers[model]
+            tokens = self.tokens(model)
+            hit_rate = tier["accepted"] / tier["calls"] if tier["calls"] else 0.0
+            average = tier["seconds"] / tier["calls"] if tier["calls"] else 0.0
+            logging.info(f"   {model}: {tier['calls']} answers, {tier['accepted']} kept ({hit_rate:.0%}), "
+                         f"{tier['escalated']} sent on; {average:.1f}s per call; "
+                         f"{tokens['prompt']} tokens sent, {tokens['completion']} received")
+
+class EventDetailExtractionStrategy(LLMExtractionStrategy):
+    """
+    Smart text analyzer that also counts how many times the AI was asked
+    about each event website, so runs can confirm one AI call per event.
+    In a model cascade, next_tier is the analyzer for the next (larger) model.
+    """
+
+    def __init__(self, *args, llm_calls_by_url=None, models=None, cascade=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.llm_calls_by_url = llm_calls_by_url if llm_calls_by_url is not None else defaultdict(int)
+        # Event websites covered by each batch call, by the address the call is made for
+        self.batch_links = {}
+        self.reduced_strategies = {}
+        # This model and the ones after it in the cascade
+        self.models = list(models or [self.provider])
+        self.cascade = cascade
+        self.next_tier = None
+
+    def extract(self, url: str, ix: int, html: str):
+        """Count the AI call for this website (or each website of a batch), then run the normal extraction."""
+        for link in self.batch_links.get(url, [url]):
+            self.llm_calls_by_url[link] += 1
+        return super().extract(url, ix, html)
+
+    def batch_address(self, urls: List[str]) -> str:
+        """
+        Get the address to make one batch call for several event websites under,
+        so the call is counted once for each of them instead of for the batch itself.
+        
+        Args:
+            urls (List[str]): Event websites covered by the batch call
+            
+        Returns:
+            str: The address to pass to run()
+        """
+        address = f"batch:{urls[0]}"
+        self.batch_links[address] = list(urls)
+        return address
+
+    def for_fields(self, fields: List[str]) -> "EventDetailExtractionStrategy":
+        """
+        Get a smart text analyzer that only asks for some of the event fields.
+        It shares this analyzer's AI call counts and cascade.
+        
+        Args:
+            fields (List[str]): Event fields the AI should extract
+            
+        Returns:
+            EventDetailExtractionStrategy: Configured AI text analyzer for those fields
+        """
+        return self._derived_strategy(fields, batch=False)
+
+    def for_batch(self, fields: List[str]) -> "EventDetailExtractionStrategy":
+        """
+        Get a smart text analyzer that extracts several events from one piece of text
+        and returns a list with one entry per event. It shares this analyzer's AI call counts and cascade.
+        
+        Args:
+            fields (List[str]): Event fields the AI should extract for each event
+            
+        Returns:
+            EventDetailExtractionStrategy: Configured AI text analyzer for batches of events
+        """
+        return self._derived_strategy(fields, batch=True)
+
+    def _derived_strategy(self, fields: List[str], batch: bool) -> "EventDetailExtractionStrategy":
+        """Create (once) and return an analyzer for a set of fields."""
+        key = (tuple(field for field in FIELD_DESCRIPTIONS if field in fields), batch)
+        if key not in self.reduced_strategies:
+            self.reduced_strategies[key] = get_event_detail_llm_strategy(
+                fields=list(key[0]), llm_calls_by_url=self.llm_calls_by_url, batch=batch,
+                models=self.models, cascade=self.cascade
+            )
+        return self.reduced_strategies[key]
+
+def get_event_detail_llm_strategy(fields: Optional[List[str]] = None, llm_calls_by_url=None,
+                                  batch: bool = False, models: Optional[List[str]] = None,
+                                  cascade: Optional[ModelCascadeStats] = None) -> LLMExtractionStrategy:
     """
     Configure the smart text analyzer (AI/LLM) for extracting event details.
     
+    Args:
+        fields (List[str], optional): Event fields to extract (defaults to all of them)
+        llm_calls_by_url (dict, optional): Shared AI call counts to add to
+        batch (bool): Extract several events at once (the text holds one section per event)
+        models (List[str], optional): AI models to use, cheapest first (defaults to DEFAULT_MODEL)
+        cascade (ModelCascadeStats, optional): Shared cascade statistics to add to
+    
     Returns:
-        LLMExtractionStrategy: Configured AI text analyzer
+        LLMExtractionStrategy: Configured AI text analyzer for the first model
+                               (its next_tier is the analyzer for the next model)
     """
-    # Check if API key is available
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        logging.warning("⚠️ GROQ_API_KEY not found in environment variables")
+    models = list(models or [DEFAULT_MODEL])
+    if cascade is None:
+        cascade = ModelCascadeStats(models)
+    
+    # Check if API keys are available (GROQ_API_KEY for "groq/..." models)
+    key_names = {model: f"{model.split('/')[0].upper()}_API_KEY" for model in models}
+    api_keys = {model: os.getenv(key_name) for model, key_name in key_names.items()}
+    for key_name in sorted({key_names[model] for model in models if not api_keys[model]}):
+        logging.warning(f"⚠️ {key_name} not found in environment variables")
         logging.warning("Please create a .env file based on .env.example with your API key")
     
-    # Define the event information structure - this matches the required fields in Main_Settings.py
+    fields = [field for field in FIELD_DESCRIPTIONS if fields is None or field in fields]
+    if batch and "event_link" not in fields:
+        # Each answer in a batch must say which event it belongs to
+        fields.append("event_link")
+    
+    # Define the event information structure
     event_schema = {
         "type": "object",
         "properties": {
-            "title": {"type": "string", "description": "The title of the comedy event"},
-            "venue": {"type": "string", "description": "The name of the venue where the event is held"},
-            "summary": {"type": "string", "description": "A brief summary or description of the event"},
-            "address": {"type": "string", "description": "The physical address of the venue"},
-            "email": {"type": "string", "description": "Contact email for the event or venue"},
-            "city": {"type": "string", "description": "The city where the event is taking place"},
-            "province": {"type": "string", "description": "The province where the event is taking place"},
-            "producers": {"type": "string", "description": "The names of individuals or organizations producing the event"},
-            "event_link": {"type": "string", "description": "URL link to the event page"},
-            "date": {"type": "string", "description": "The date and time when the event takes place"}
+            field: {"type": "string", "description": FIELD_DESCRIPTIONS[field]}
+            for field in fields
         },
-        "required": [
-            "title", "venue", "summary", "address", "email", 
-            "city", "province", "producers", "event_link", "date"
-        ]
+        "required": fields
     }
+    if batch:
+        event_schema = {"type": "array", "items": event_schema}
     
     # Define instructions for the AI on how to extract information
-    extraction_instructions = """
+    field_lines = "\n".join(
+        f"    - {field}: {FIELD_INSTRUCTIONS[field]}"
+        for field in fields if field in FIELD_INSTRUCTIONS
+    )
+    extraction_instructions = f"""
     Extract detailed information about this comedy event. For each field:
     
-    - title: Extract the complete title of the event
-    - venue: Extract the name of the venue where the event is held
-    - summary: Extract a concise description of the event (1-3 sentences)
-    - address: Extract the full physical address of the venue
-    - email: Extract any contact email address for the event or venue
-    - city: Extract only the city name
-    - province: Extract only the province name
-    - producers: Extract names of individuals or organizations producing/hosting the event
-    - date: Extract the date and time of the event
+{field_lines}
     
     If a field is not explicitly found on the page, make your best inference based on
     available information. For email, if not found, return "Not provided".
     """
+    if batch:
+        extraction_instructions = f"""
+    The content below describes several different comedy events. Each event starts with a
+    line "### EVENT <number>" followed by a line "event_link: <address>".
+    Return one object per event, in the same order, and copy its event_link exactly.
+    Never mix information from different events. For each event, extract:
     
-    # Configure and return the AI text analyzer
-    return LLMExtractionStrategy(
-        provider="groq/deepseek-r1-distill-llama-70b",  # AI model to use
-        api_token=api_key,  # API key for authentication
-        schema=event_schema,  # Information structure to extract
-        extraction_type="schema",  # Use structured extraction
-        instruction=extraction_instructions,  # Instructions for the AI
-        input_format="markdown",  # Format of the input content
-        verbose=True,  # Show detailed information during extraction
-    )
+{field_lines}
+    
+    If a field is not explicitly found in that event's section, make your best inference based on
+    available information. For email, if not found, return "Not provided".
+    """
+    
+    # Configure one AI text analyzer per model, each knowing the next one
+    if llm_calls_by_url is None:
+        llm_calls_by_url = defaultdict(int)
+    strategies = [
+        EventDetailExtractionStrategy(
+            provider=model,  # AI model to use
+            api_token=api_keys[model],  # API key for authentication
+            schema=event_schema,  # Information structure to extract
+            extraction_type="schema",  # Use structured extraction
+            instruction=extraction_instructions,  # Instructions for the AI
+            input_format="markdown",  # Format of the input content
+            apply_chunking=False,  # Send each page in one AI call instead of splitting it
+            verbose=True,  # Show detailed information during extraction
+            llm_calls_by_url=llm_calls_by_url,
+            models=models[tier:],
+            cascade=cascade,
+        )
+        for tier, model in enumerate(models)
+    ]
+    for strategy, next_strategy in zip(strategies, strategies[1:]):
+        strategy.next_tier = next_strategy
+    cascade.strategies.extend(strategies)
+    return strategies[0]
 
 def get_usage_stats(llm_strategy: LLMExtractionStrategy) -> Dict:
     """
@@ -0,0 +1,216 @@
+"""
+Tools for reading event information that Eventbrite already puts in the page
+in a machine-readable form: schema.org Event data (JSON-LD) and OpenGraph tags.
+
+Reading these is instant and free, so the smart text analyzer (AI/LLM) only
+needs to be asked about the fields that are still missing afterwards.
+"""
+
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+# Canadian province and territory abbreviations used in addresses
+PROVINCE_NAMES = {
+    "AB": "Alberta",
+    "BC": "British Columbia",
+    "MB": "Manitoba",
+    "NB": "New Brunswick",
+    "NL": "Newfoundland and Labrador",
+    "NS": "Nova Scotia",
+    "NT": "Northwest Territories",
+    "NU": "Nunavut",
+    "ON": "Ontario",
+    "PE": "Prince Edward Island",
+    "QC": "Quebec",
+    "SK": "Saskatchewan",
+    "YT": "Yukon",
+}
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+# Emails that appear on every Eventbrite page and don't belong to the event
+IGNORED_EMAIL_DOMAINS = ("eventbrite.com", "eventbrite.ca", "sentry.io")
+
+def extract_structured_event_data(html_content: str, url: str = "") -> Dict[str, str]:
+    """
+    Fill in as many event fields as possible from the page's structured data.
+
+    Args:
+        html_content (str): The HTML content of the event page
+        url (str): Website address of the event page
+
+    Returns:
+        Dict[str, str]: Event fields that were found (missing fields are left out)
+    """
+    if not html_content:
+        return {}
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    event = _find_json_ld_event(soup)
+    open_graph = _read_meta_tags(soup)
+
+    data = {}
+    if event:
+        location = _first(event.get("location")) or {}
+        address = location.get("address") if isinstance(location, dict) else None
+        organizers = event.get("organizer")
+
+        data["title"] = _clean(event.get("name"))
+        data["summary"] = _short_summary(event.get("description"))
+        data["date"] = _format_date(event.get("startDate"))
+        if isinstance(location, dict):
+            data["venue"] = _clean(location.get("name"))
+        data["address"] = _format_address(address)
+        if isinstance(address, dict):
+            data["city"] = _clean(address.get("addressLocality"))
+            data["province"] = _province_name(address.get("addressRegion"))
+        data["producers"] = ", ".join(
+            _clean(organizer.get("name")) for organizer in _as_list(organizers)
+            if isinstance(organizer, dict) and _clean(organizer.get("name"))
+        )
+        data["email"] = next(
+            (_clean(organizer.get("email")) for organizer in _as_list(organizers)
+             if isinstance(organizer, dict) and _clean(organizer.get("email"))),
+            "",
+        )
+
+    # OpenGraph tags fill in the basics when the JSON-LD is missing or incomplete
+    if not data.get("title"):
+        data["title"] = _clean(open_graph.get("og:title"))
+    if not data.get("summary"):
+        data["summary"] = _short_summary(open_graph.get("og:description") or open_graph.get("description"))
+    if not data.get("date"):
+        data["date"] = _format_date(open_graph.get("event:start_time"))
+
+    # Look for a contact email on the page itself. When there is none, the email is left
+    # for the AI, which often finds the organiser's email written out in the description
+    if not data.get("email"):
+        data["email"] = _find_contact_email(soup)
+
+    if url:
+        data["event_link"] = url
+
+    return {key: value for key, value in data.items() if value}
+
+def has_structured_event_data(html_content: str) -> bool:
+    """
+    Check whether a page contains a schema.org Event (JSON-LD) block.
+
+    Args:
+        html_content (str): The HTML content of the page
+
+    Returns:
+        bool: True if an Event block was found
+    """
+    if not html_content or "application/ld+json" not in html_content:
+        return False
+    return _find_json_ld_event(BeautifulSoup(html_content, "html.parser")) is not None
+
+def _find_json_ld_event(soup: BeautifulSoup) -> Optional[Dict]:
+    """Find the first schema.org Event object in the page's JSON-LD blocks."""
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        try:
+            content = json.loads(script.string or "")
+        except (TypeError, ValueError):
+            logging.debug("Skipping JSON-LD block that is not valid JSON")
+            continue
+
+        candidates = _as_list(content)
+        for candidate in list(candidates):
+            if isinstance(candidate, dict) and "@graph" in candidate:
+                candidates.extend(_as_list(candidate["@graph"]))
+
+        for candidate in candidates:
+            if not isinstance(candidate, dict):
+                continue
+            types = [str(item) for item in _as_list(candidate.get("@type"))]
+            if any(item.endswith("Event") for item in types):
+                return candidate
+    return None
+
+def _read_meta_tags(soup: BeautifulSoup) -> Dict[str, str]:
+    """Collect OpenGraph (and similar) meta tags into a dictionary."""
+    tags = {}
+    for meta in soup.find_all("meta"):
+        name = meta.get("property") or meta.get("name")
+        content = meta.get("content")
+        if name and content and name not in tags:
+            tags[name] = content
+    return tags
+
+def _find_contact_email(soup: BeautifulSoup) -> str:
+    """Find a contact email in mailto links or the visible page text."""
+    candidates = [
+        link.get("href", "")[len("mailto:"):].split("?")[0]
+        for link in soup.select("a[href^='mailto:']")
+    ]
+    candidates.extend(EMAIL_PATTERN.findall(soup.get_text(" ")))
+
+    for email in candidates:
+        email = email.strip()
+        if EMAIL_PATTERN.fullmatch(email) and not email.lower().endswith(IGNORED_EMAIL_DOMAINS):
+            return email
+    return ""
+
+def _as_list(value) -> List:
+    """Wrap a single value in a list (JSON-LD allows both forms)."""
+    if value is None:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+def _first(value):
+    """Get the first item of a value that may or may not be a list."""
+    values = _as_list(value)
+    return values[0] if values else None
+
+def _clean(value) -> str:
+    """Turn a value into a single-line string with extra spaces removed."""
+    if not isinstance(value, str):
+        return ""
+    return " ".join(value.split())
+
+def _short_summary(text, max_sentences: int = 3) -> str:
+    """Shorten a description to its first few sentences."""
+    text = _clean(text)
+    if not text:
+        return ""
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    return " ".join(sentences[:max_sentences])
+
+def _format_date(value) -> str:
+    """Turn an ISO date/time (e.g. 2025-04-05T20:00:00-04:00) into a readable date and time."""
+    value = _clean(value)
+    if not value:
+        return ""
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if "T" not in value:
+        return moment.strftime("%Y-%m-%d")
+    return moment.strftime("%Y-%m-%d %I:%M %p").replace(" 0", " ")
+
+def _format_address(address) -> str:
+    """Turn a schema.org PostalAddress (or plain text) into one address line."""
+    if isinstance(address, str):
+        return _clean(address)
+    if not isinstance(address, dict):
+        return ""
+
+    parts = [
+        _clean(address.get("streetAddress")),
+        _clean(address.get("addressLocality")),
+        _clean(address.get("addressRegion")),
+        _clean(address.get("postalCode")),
+    ]
+    return ", ".join(part for part in parts if part)
+
+def _province_name(region) -> str:
+    """Turn a province abbreviation (e.g. ON) into its full name."""
+    region = _clean(region)
+    return PROVINCE_NAMES.get(region.upper(), region)
@@ -0,0 +1,431 @@
+"""
+Durable record of which event links have been processed.
+
+Every link of an input file is stored in a small SQLite database with its state:
+pending, in-flight, done or failed, plus the number of attempts and the last error.
+When a run is interrupted, --resume picks up exactly where it stopped: links that are
+done are skipped, and links that were in flight or failed are tried again.
+
+Several worker processes (on this computer or others sharing the database file) can
+work on the same queue: each leases a batch of links, renews the lease while it works
+(heartbeat), and saves its events in the results table, where each event ID is kept
+only once. Links whose lease runs out (because the worker died) go back to pending.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path to allow imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Shared_Tools_Both_Steps_Use.Shared_Database import connect_shared_database
+from Shared_Tools_Both_Steps_Use.Url_Tools import event_key
+
+# States a link can be in
+PENDING = "pending"
+IN_FLIGHT = "in-flight"
+DONE = "done"
+FAILED = "failed"
+
+class WorkQueue:
+    """
+    Stores the state of every link of one input file, keyed by the input file's path.
+    """
+
+    def __init__(self, path: str, input_file: Optional[str] = None):
+        """
+        Open (or create) the work queue database.
+
+        Args:
+            path (str): Path to the SQLite file
+            input_file (str, optional): The input CSV file this queue belongs to
+                                        (None joins the most recently started queue, for workers)
+        """
+        self.path = path
+        self.queue = os.path.abspath(input_file) if input_file else None
+        self._lock = threading.Lock()
+        # Worker name and lease ID of every link this process leased, so it only changes
+        # links it still holds (not ones reclaimed and leased by another worker since)
+        self._leases = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = connect_shared_database(path)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS queues (
+                queue TEXT PRIMARY KEY,
+                output_file TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS work_items (
+                queue TEXT NOT NULL,
+                url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (queue, url)
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                queue TEXT NOT NULL,
+                event_key TEXT NOT NULL,
+                url TEXT NOT NULL,
+                record TEXT NOT NULL,
+                worker TEXT,
+                saved_at REAL NOT NULL,
+                PRIMARY KEY (queue, event_key)
+            );
+            """
+        )
+        # Lease columns were added later; add them to older databases
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(work_items)")}
+        for column, column_type in (("lease_owner", "TEXT"), ("lease_id", "TEXT"), ("lease_expires", "REAL")):
+            if column not in columns:
+                self._connection.execute(f"ALTER TABLE work_items ADD COLUMN {column} {column_type}")
+        self._connection.commit()
+
+        if self.queue is None:
+            row = self._connection.execute(
+                "SELECT queue FROM queues ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+            self.queue = row[0] if row else None
+
+    def start(self, links: List[str], output_file: str, resume: bool = False,
+              max_attempts: int = 3) -> Tuple[List[str], str]:
+        """
+        Register the links of this run and get the ones that still need work.
+
+        Args:
+            links (List[str]): All links of the input file, in order
+            output_file (str): Output file to use if this is a new run
+            resume (bool): Continue the previous run of this input file instead of starting over
+            max_attempts (int): Failed links are only tried again while they have fewer attempts than this
+
+        Returns:
+            Tuple[List[str], str]: Links still to process (in input order), and the output file to write to
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT output_file FROM queues WHERE queue = ?", (self.queue,)
+            ).fetchone()
+
+            if resume and row:
+                output_file = row[0] or output_file
+                # Links that were in flight when the last run stopped never finished,
+                # and no worker of the last run holds any link any more
+                self._connection.execute(
+                    "UPDATE work_items SET status = ?, updated_at = ? WHERE queue = ? AND status = ?",
+                    (PENDING, now, self.queue, IN_FLIGHT),
+                )
+                self._connection.execute(
+                    "UPDATE work_items SET lease_owner = NULL, lease_id = NULL, lease_expires = NULL WHERE queue = ?",
+                    (self.queue,),
+                )
+            else:
+                if resume:
+                    logging.info("📋 No earlier run of this input file found, starting from the beginning")
+                self._connection.execute("DELETE FROM work_items WHERE queue = ?", (self.queue,))
+                self._connection.execute("DELETE FROM results WHERE queue = ?", (self.queue,))
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO queues (queue, output_file, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (self.queue, output_file, now, now),
+                )
+
+            # Add any links that are new to the queue (all of them for a new run)
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO work_items (queue, url, position, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(self.queue, link, position, PENDING, now) for position, link in enumerate(links)],
+            )
+            self._connection.commit()
+
+            rows = self._connection.execute(
+                "SELECT url FROM work_items WHERE queue = ? AND (status = ? OR (status = ? AND attempts < ?)) "
+                "ORDER BY position",
+                (self.queue, PENDING, FAILED, max_attempts),
+            ).fetchall()
+
+        return [url for (url,) in rows], output_file
+
+    def add(self, links: List[str]) -> List[str]:
+        """
+        Add links to the queue while the run is going (for links that are still being found).
+
+        Args:
+            links (List[str]): Links to add, in order
+
+        Returns:
+            List[str]: Links that were not in the queue yet
+        """
+        now = time.time()
+        added = []
+        with self._lock:
+            (last_position,) = self._connection.execute(
+                "SELECT COALESCE(MAX(position), -1) FROM work_items WHERE queue = ?", (self.queue,)
+            ).fetchone()
+            for link in links:
+                inserted = self._connection.execute(
+                    "INSERT OR IGNORE INTO work_items (queue, url, position, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (self.queue, link, last_position + 1, PENDING, now),
+                )
+                if inserted.rowcount:
+                    last_position += 1
+                    added.append(link)
+            self._connection.commit()
+        return added
+
+    def lease(self, worker: str, batch_size: int, lease_seconds: float, max_attempts: int = 3) -> List[str]:
+        """
+        Take a batch of links to work on. Expired leases of other workers are reclaimed first.
+
+        Args:
+            worker (str): Name of the worker taking the links
+            batch_size (int): Maximum number of links to take
+            lease_seconds (float): How long the worker may keep the links without a heartbeat
+            max_attempts (int): Failed links are only taken again while they have fewer attempts than this
+
+        Returns:
+            List[str]: The leased links, in input order (empty if none are available)
+        """
+        self.reclaim_expired()
+        now = time.time()
+        lease_id = uuid.uuid4().hex
+        with self._lock:
+            # One statement, so two workers can never lease the same link
+            self._connection.execute(
+                "UPDATE work_items SET status = ?, lease_owner = ?, lease_id = ?, lease_expires = ?, updated_at = ? "
+                "WHERE rowid IN (SELECT rowid FROM work_items WHERE queue = ? "
+                "AND (status = ? OR (status = ? AND attempts < ?)) ORDER BY position LIMIT ?)",
+                (IN_FLIGHT, worker, lease_id, now + lease_seconds, now,
+                 self.queue, PENDING, FAILED, max_attempts, batch_size),
+            )
+            self._connection.commit()
+            rows = self._connection.execute(
+                "SELECT url FROM work_items WHERE queue = ? AND lease_id = ? ORDER BY position",
+                (self.queue, lease_id),
+            ).fetchall()
+            for (url,) in rows:
+                self._leases[url] = (worker, lease_id)
+        return [url for (url,) in rows]
+
+    def heartbeat(self, worker: str, lease_seconds: float) -> int:
+        """
+        Renew the leases of all links a worker is still working on.
+
+        Args:
+            worker (str): Name of the worker
+            lease_seconds (float): How long from now the leases last
+
+        Returns:
+            int: Number of links still leased by the worker
+        """
+        now = time.time()
+        with self._lock:
+            renewed = self._connection.execute(
+                "UPDATE work_items SET lease_expires = ? WHERE queue = ? AND lease_owner = ? AND status = ?",
+                (now + lease_seconds, self.queue, worker, IN_FLIGHT),
+            ).rowcount
+            self._connection.commit()
+        return renewed
+
+    def reclaim_expired(self) -> int:
+        """
+        Put links whose lease has run out (their worker stopped sending heartbeats) back to pending.
+
+        Returns:
+            int: Number of links reclaimed
+        """
+        with self._lock:
+            reclaimed = self._connection.execute(
+                "UPDATE work_items SET status = ?, lease_owner = NULL, lease_id = NULL, lease_expires = NULL "
+                "WHERE queue = ? AND status = ? AND lease_expires IS NOT NULL AND lease_expires < ?",
+                (PENDING, self.queue, IN_FLIGHT, time.time()),
+            ).rowcount
+            self._connection.commit()
+        if reclaimed:
+            logging.warning(f"⚠️ Reclaimed {reclaimed} links whose worker stopped responding")
+        return reclaimed
+
+    def release(self, worker: str) -> int:
+        """
+        Mark links a worker leased but didn't finish as failed, so they can be tried again.
+
+        Args:
+            worker (str): Name of the worker
+
+        Returns:
+            int: Number of links released
+        """
+        with self._lock:
+            released = self._connection.execute(
+                "UPDATE work_items SET status = ?, last_error = 'Not finished by worker', lease_expires = NULL, "
+                "updated_at = ? WHERE queue = ? AND lease_owner = ? AND status = ?",
+                (FAILED, time.time(), self.queue, worker, IN_FLIGHT),
+            ).rowcount
+            self._connection.commit()
+        return released
+
+    def save_results(self, events: List[Dict], worker: str = "") -> int:
+        """
+        Save finished events and mark their links as done, in one step.
+        Each event ID is kept only once, even if two workers collected it.
+
+        Args:
+            events (List[Dict]): Finished event records (with their event_link)
+            worker (str): Name of the worker that collected them
+
+        Returns:
+            int: Number of events that were new
+        """
+        now = time.time()
+        saved = 0
+        with self._lock:
+            for event in events:
+                url = event["event_link"]
+                saved += self._connection.execute(
+                    "INSERT OR IGNORE INTO results (queue, event_key, url, record, worker, saved_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.queue, event_key(url), url, json.dumps(event), worker, now),
+                ).rowcount
+                self._connection.execute(
+                    "UPDATE work_items SET status = ?, last_error = '', lease_expires = NULL, updated_at = ? "
+                    "WHERE queue = ? AND url = ?",
+                    (DONE, now, self.queue, url),
+                )
+            self._connection.commit()
+        return saved
+
+    def results(self) -> List[Dict]:
+        """
+        Get every saved event of this queue, in input order.
+
+        Returns:
+            List[Dict]: Event records
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT results.record FROM results LEFT JOIN work_items "
+                "ON work_items.queue = results.queue AND work_items.url = results.url "
+                "WHERE results.queue = ? ORDER BY work_items.position, results.saved_at",
+                (self.queue,),
+            ).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def output_file(self) -> Optional[str]:
+        """
+        Get the output file the coordinator writes this queue's results to.
+
+        Returns:
+            Optional[str]: Path of the output file (None if no coordinator started the queue)
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT output_file FROM queues WHERE queue = ?", (self.queue,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def unfinished(self, max_attempts: int = 3) -> int:
+        """
+        Count the links that still need work (pending, in flight, or failed with attempts left).
+
+        Args:
+            max_attempts (int): Failed links count as unfinished while they have fewer attempts than this
+
+        Returns:
+            int: Number of unfinished links
+        """
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM work_items WHERE queue = ? "
+                "AND (status IN (?, ?) OR (status = ? AND attempts < ?))",
+                (self.queue, PENDING, IN_FLIGHT, FAILED, max_attempts),
+            ).fetchone()
+        return count
+
+    def _update(self, url: str, status: str, error: Optional[str] = None, attempt: bool = False) -> bool:
+        """
+        Change the state of one link, if this process still holds its lease
+        (or it was never leased, when there are no workers).
+
+        Returns:
+            bool: False if the link is leased by someone else now, and was left alone
+        """
+        worker, lease_id = self._leases.get(url, (None, None))
+        with self._lock:
+            updated = self._connection.execute(
+                "UPDATE work_items SET status = ?, last_error = COALESCE(?, last_error), "
+                "attempts = attempts + ?, updated_at = ? WHERE queue = ? AND url = ? "
+                "AND lease_owner IS ? AND lease_id IS ?",
+                (status, error, 1 if attempt else 0, time.time(), self.queue, url, worker, lease_id),
+            ).rowcount
+            self._connection.commit()
+        if not updated:
+            logging.warning(f"⚠️ {url} is no longer leased by this worker, leaving it as it is")
+        return bool(updated)
+
+    def mark_in_flight(self, url: str) -> None:
+        """
+        Record that work on a link has started.
+
+        Args:
+            url (str): The event link
+        """
+        self._update(url, IN_FLIGHT, attempt=True)
+
+    def mark_done(self, url: str) -> None:
+        """
+        Record that a link's event has been saved to the output file.
+
+        Args:
+            url (str): The event link
+        """
+        self._update(url, DONE, error="")
+
+    def mark_failed(self, url: str, error: str) -> None:
+        """
+        Record that a link could not be processed.
+
+        Args:
+            url (str): The event link
+            error (str): What went wrong
+        """
+        self._update(url, FAILED, error=error or "Unknown error")
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Count the links in each state.
+
+        Returns:
+            Dict[str, int]: Number of links per state
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM work_items WHERE queue = ? GROUP BY status", (self.queue,)
+            ).fetchall()
+        counts = {PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def log_stats(self) -> None:
+        """Write the number of links in each state to the log."""
+        counts = self.counts()
+        logging.info(f"📋 Work queue: {counts[DONE]} done, {counts[FAILED]} failed, "
+                     f"{counts[PENDING] + counts[IN_FLIGHT]} not finished")
+        if counts[PENDING] + counts[IN_FLIGHT] or counts[FAILED]:
+            logging.info("💡 Run again with --resume to continue with the unfinished and failed links")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,166 @@
+"""
+Diagnostic captures (screenshots and HTML snapshots) of web pages.
+
+Captures are only taken when they are useful: when a page fails, or for a sample of
+pages. They are written to disk by a background thread so the search never waits
+for the disk, and the oldest captures are deleted once they grow past their size
+limit (a ring buffer). Only files the recorder wrote itself (named CAPTURE_PREFIX...)
+count towards the limit or are ever deleted; other files in the folder are left alone.
+"""
+
+import logging
+import os
+import queue
+import threading
+from typing import Optional
+
+# When captures are taken
+DIAGNOSTICS_MODES = {
+    "off": "never",
+    "on-failure": "only when a page fails",
+    "sampled": "when a page fails, and for 1 in every N pages that work",
+}
+
+# Captures waiting to be written; when the writer falls this far behind, new captures are skipped
+MAX_PENDING_CAPTURES = 50
+
+# Start of every capture's file name, so the recorder can tell its own files apart from others
+CAPTURE_PREFIX = "capture_"
+CAPTURE_EXTENSIONS = (".png", ".html")
+
+class DiagnosticsRecorder:
+    """
+    Decides which pages to capture and writes the captures in the background.
+    """
+
+    def __init__(self, directory: str, mode: str = "on-failure", sample_every: int = 10, max_mb: float = 50):
+        """
+        Set up the recorder and start its background writer.
+
+        Args:
+            directory (str): Folder for the captures
+            mode (str): "off", "on-failure" or "sampled"
+            sample_every (int): In sampled mode, capture 1 in this many pages that work
+            max_mb (float): Maximum disk space for captures in megabytes (oldest are deleted first)
+        """
+        self.directory = directory
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.stats = {"captured": 0, "skipped": 0, "deleted": 0}
+        self._pages_seen = 0
+        self._queue = queue.Queue(maxsize=MAX_PENDING_CAPTURES)
+        self._writer = None
+
+        if self.mode != "off":
+            os.makedirs(directory, exist_ok=True)
+            self._writer = threading.Thread(target=self._write_captures, name="diagnostics-writer", daemon=True)
+            self._writer.start()
+
+    def should_capture(self, failed: bool) -> bool:
+        """
+        Decide whether the current page should be captured.
+
+        Args:
+            failed (bool): Whether the page failed
+
+        Returns:
+            bool: True if a capture should be taken
+        """
+        if self.mode == "off":
+            return False
+        if failed:
+            return True
+        if self.mode == "sampled":
+            self._pages_seen += 1
+            return (self._pages_seen - 1) % self.sample_every == 0
+        return False
+
+    def capture(self, name: str, screenshot: Optional[bytes] = None, html: Optional[str] = None) -> None:
+        """
+        Hand a capture to the background writer.
+
+        Args:
+            name (str): File name for the capture, without extension
+            screenshot (bytes, optional): PNG screenshot
+            html (str, optional): HTML snapshot of the page
+        """
+        if self._writer is None or (screenshot is None and html is None):
+            return
+        try:
+            self._queue.put_nowait((name, screenshot, html))
+        except queue.Full:
+            # Never make the search wait for the disk
+            self.stats["skipped"] += 1
+
+    def capture_driver(self, driver, name: str, failed: bool = False) -> None:
+        """
+        Capture the page open in a Selenium browser, if the mode says so.
+        Failures get an HTML snapshot as well as the screenshot.
+
+        Args:
+            driver: The Selenium web driver
+            name (str): File name for the capture, without extension
+            failed (bool): Whether the page failed
+        """
+        if not self.should_capture(failed):
+            return
+        screenshot = html = None
+        try:
+            screenshot = driver.get_screenshot_as_png()
+            if failed:
+                html = driver.page_source
+        except Exception as e:
+            logging.debug(f"Could not capture {name}: {e}")
+        self.capture(name, screenshot=screenshot, html=html)
+
+    def _write_captures(self) -> None:
+        """Background writer: save each capture, then delete the oldest ones over the size limit."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            name, screenshot, html = item
+            try:
+                if screenshot is not None:
+                    with open(os.path.join(self.directory, f"{CAPTURE_PREFIX}{name}.png"), "wb") as file:
+                        file.write(screenshot)
+                if html is not None:
+                    with open(os.path.join(self.directory, f"{CAPTURE_PREFIX}{name}.html"), "w", encoding="utf-8") as file:
+                        file.write(html)
+                self.stats["captured"] += 1
+                self._trim()
+            except OSError as e:
+                logging.warning(f"⚠️ Could not save diagnostic capture {name}: {e}")
+
+    def _trim(self) -> None:
+        """Delete the oldest captures until they are within their size limit."""
+        files = []
+        for entry in os.scandir(self.directory):
+            # Leave screenshots from older versions and captures made by hand alone
+            if entry.is_file() and entry.name.startswith(CAPTURE_PREFIX) and entry.name.endswith(CAPTURE_EXTENSIONS):
+                info = entry.stat()
+                files.append((info.st_mtime, info.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.stats["deleted"] += 1
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Finish writing the captures that are waiting, then stop the background writer."""
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        if self.stats["captured"] or self.stats["skipped"]:
+            logging.info(f"📸 Diagnostics ({self.mode}): {self.stats['captured']} captures saved to {self.directory}"
+                         + (f", {self.stats['skipped']} skipped" if self.stats["skipped"] else "")
+                         + (f", {self.stats['deleted']} old files deleted" if self.stats["deleted"] else ""))
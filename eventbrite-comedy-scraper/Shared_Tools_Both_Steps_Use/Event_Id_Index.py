@@ -0,0 +1,165 @@
+"""
+Index of every event ever found, used by both steps of the application.
+
+Events are stored under their numeric Eventbrite event ID (see Url_Tools.event_key),
+so the same event is recognized no matter which address it was found under.
+Step 1 records every event it finds; Step 2 records when each event's details were
+collected, so no event is collected twice within a run or across runs.
+"""
+
+import csv
+import glob
+import logging
+import os
+import threading
+import time
+from typing import Iterable, List
+
+from Shared_Tools_Both_Steps_Use.Shared_Database import connect_shared_database
+from Shared_Tools_Both_Steps_Use.Url_Tools import canonicalize_event_url, dedupe_event_links, event_key, extract_event_id
+
+class EventIdIndex:
+    """
+    Stores every known event in a small SQLite database, keyed by event ID.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the index.
+
+        Args:
+            path (str): Path to the SQLite file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = connect_shared_database(path)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                event_key TEXT PRIMARY KEY,
+                event_id TEXT,
+                url TEXT NOT NULL,
+                source TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                times_seen INTEGER NOT NULL DEFAULT 1,
+                collected_at REAL
+            )
+            """
+        )
+        self._connection.commit()
+
+    def record_discovered(self, urls: Iterable[str], source: str = "") -> List[str]:
+        """
+        Record events found by a search.
+
+        Args:
+            urls (Iterable[str]): Event website addresses
+            source (str): Where the links came from (e.g. the links file name)
+
+        Returns:
+            List[str]: Standard addresses of the events that were never seen before
+        """
+        now = time.time()
+        new_links = []
+        with self._lock:
+            for url in urls:
+                if not url:
+                    continue
+                key = event_key(url)
+                updated = self._connection.execute(
+                    "UPDATE events SET last_seen = ?, times_seen = times_seen + 1 WHERE event_key = ?",
+                    (now, key),
+                )
+                if updated.rowcount == 0:
+                    self._connection.execute(
+                        "INSERT INTO events (event_key, event_id, url, source, first_seen, last_seen) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, extract_event_id(url), canonicalize_event_url(url), source, now, now),
+                    )
+                    new_links.append(canonicalize_event_url(url))
+            self._connection.commit()
+        return new_links
+
+    def import_link_files(self, directory: str, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Merge every event links file in a folder into the index.
+
+        Args:
+            directory (str): Folder with the links files from Step 1
+            exclude (Iterable[str]): File paths to skip
+
+        Returns:
+            List[str]: One standard address per event across all files, oldest file first
+        """
+        excluded = {os.path.abspath(path) for path in exclude}
+        files = sorted(
+            (path for path in glob.glob(os.path.join(directory, "*event_links*.csv"))
+             if os.path.abspath(path) not in excluded),
+            key=os.path.getmtime,
+        )
+
+        links = []
+        for path in files:
+            with open(path, newline="", encoding="utf-8") as file:
+                file_links = [row["event_link"] for row in csv.DictReader(file) if row.get("event_link")]
+            self.record_discovered(file_links, source=os.path.basename(path))
+            links.extend(file_links)
+
+        unique = dedupe_event_links(links)
+        logging.info(f"🆔 Merged {len(files)} links files: {len(links)} links, {len(unique)} different events")
+        return unique
+
+    def mark_collected(self, url: str) -> None:
+        """
+        Record that an event's details were collected.
+
+        Args:
+            url (str): Event website address
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO events (event_key, event_id, url, first_seen, last_seen, collected_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(event_key) DO UPDATE SET collected_at = excluded.collected_at",
+                (event_key(url), extract_event_id(url), canonicalize_event_url(url), now, now, now),
+            )
+            self._connection.commit()
+
+    def collected_within(self, url: str, hours: float) -> bool:
+        """
+        Check whether an event's details were collected recently.
+
+        Args:
+            url (str): Event website address
+            hours (float): How recent counts (0 or less always returns False)
+
+        Returns:
+            bool: True if the event was collected within the last `hours` hours
+        """
+        if hours <= 0:
+            return False
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT collected_at FROM events WHERE event_key = ?", (event_key(url),)
+            ).fetchone()
+        return bool(row and row[0] and time.time() - row[0] < hours * 3600)
+
+    def log_stats(self) -> None:
+        """Write the number of known and collected events to the log."""
+        with self._lock:
+            known, collected = self._connection.execute(
+                "SELECT COUNT(*), COUNT(collected_at) FROM events"
+            ).fetchone()
+        logging.info(f"🆔 Event index: {known} known events, {collected} with collected details")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
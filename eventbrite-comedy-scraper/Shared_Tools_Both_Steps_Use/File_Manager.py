@@ -65,6 +65,18 @@ def find_files_by_date(directory: str, date_str: str, suffix: str = ".csv") -> L
     # Return all matching files
     return glob.glob(pattern)
 
+def event_links_file_name(run_date: str) -> str:
+    """
+    Get the name of the event links file a search run saves.
+    
+    Args:
+        run_date (str): Timestamp of the run
+        
+    Returns:
+        str: File name in the discovered links folder
+    """
+    return f"event_links_{run_date}.csv"
+
 def get_today_str() -> str:
     """
     Get today's date as a string in YYYY-MM-DD format.
@@ -0,0 +1,117 @@
+"""
+Lightweight web page downloader used by both steps of the application.
+
+Many Eventbrite pages already contain everything we need in the HTML the server
+sends, so they can be downloaded in milliseconds without starting a browser.
+Connections are kept open and reused between requests (keep-alive).
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+# aiohttp is listed in requirements.txt; without it, every page goes through the browser
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from Shared_Tools_Both_Steps_Use.Web_Browser_Launcher import BROWSER_USER_AGENT
+
+# Headers of a normal desktop browser (the same one the browser pretends to be),
+# so the server sends the same page a visitor would get
+DEFAULT_HEADERS = {
+    "User-Agent": BROWSER_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-CA,en;q=0.9",
+}
+
+@dataclass
+class HttpResponse:
+    """
+    The result of downloading one page.
+    """
+    url: str
+    status: int = 0
+    text: str = ""
+    # Header names are in lower case
+    headers: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        """True if the server sent the page (status 2xx)."""
+        return 200 <= self.status < 300
+
+class HttpClient:
+    """
+    Downloads pages over a shared pool of kept-alive connections.
+    """
+
+    def __init__(self, max_connections: int = 10, timeout: float = 15.0, headers: Optional[Dict[str, str]] = None):
+        """
+        Set up the client. Connections are opened on the first request.
+
+        Args:
+            max_connections (int): Maximum number of open connections
+            timeout (float): Seconds to wait for a page before giving up
+            headers (Dict[str, str], optional): Headers sent with every request
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self._session = None
+
+    @property
+    def available(self) -> bool:
+        """True if aiohttp is installed."""
+        return aiohttp is not None
+
+    def _get_session(self):
+        """Create the shared session (inside the running event loop) the first time it is needed."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """
+        Download a page.
+
+        Args:
+            url (str): Website address of the page
+            headers (Dict[str, str], optional): Extra headers for this request
+
+        Returns:
+            HttpResponse: The response (status 0 and an error message if the request failed)
+        """
+        if not self.available:
+            return HttpResponse(url=url, error="aiohttp is not installed")
+
+        started = time.perf_counter()
+        try:
+            async with self._get_session().get(url, headers=headers, allow_redirects=True) as response:
+                text = await response.text(errors="replace")
+                return HttpResponse(
+                    url=str(response.url),
+                    status=response.status,
+                    text=text,
+                    headers={name.lower(): value for name, value in response.headers.items()},
+                    elapsed=time.perf_counter() - started,
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.debug(f"HTTP request for {url} failed: {e}")
+            return HttpResponse(url=url, error=str(e) or type(e).__name__, elapsed=time.perf_counter() - started)
+
+    async def close(self) -> None:
+        """Close all open connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,422 @@
+"""
+Request pacing tools used by both steps of the application.
+
+RateLimiter keeps a fixed pace. AdaptiveRateController finds the pace each website
+tolerates: it speeds up a little after every page that works (additive increase),
+and slows down sharply when the website answers "too many requests" (429/503),
+gets slow, or starts failing (multiplicative decrease). The pace it finds is saved,
+so the next run (of either step) starts from it.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+class RateLimiter:
+    """
+    Spaces out requests so that no more than a set number start per minute,
+    no matter how many workers are asking at the same time.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        """
+        Set up the rate limiter.
+
+        Args:
+            requests_per_minute (float): Maximum number of requests to start per minute
+                                         (0 or less means no limit)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> float:
+        """
+        Wait until the next request is allowed to start.
+
+        Returns:
+            float: Number of seconds spent waiting
+        """
+        if not self.interval:
+            return 0.0
+
+        # Reserve the next free time slot while holding the lock,
+        # then sleep outside the lock so other workers can reserve theirs
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return max(delay, 0.0)
+
+# Seconds to wait after a 429/503 that doesn't say how long to wait (no Retry-After header)
+DEFAULT_RETRY_AFTER = 30
+
+# Seconds between log lines about a website's pace while nothing goes wrong
+PACE_LOG_INTERVAL = 60
+
+def parse_retry_after(value) -> Optional[float]:
+    """
+    Read a Retry-After header.
+
+    Args:
+        value: Seconds to wait ("120") or a date ("Wed, 21 Oct 2026 07:28:00 GMT")
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the value can't be read
+    """
+    if value is None or value == "":
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+@dataclass
+class HostPace:
+    """
+    The current pace for one website.
+    """
+    # Requests started per minute
+    rate: float
+    # Requests allowed in flight at the same time
+    concurrency: int
+    next_slot: float = 0.0
+    # No requests before this time (after a Retry-After)
+    resume_at: float = 0.0
+    in_flight: int = 0
+    # Response time (seconds), smoothed, and the lowest smoothed value seen
+    latency: float = 0.0
+    baseline_latency: float = 0.0
+    # Whether each recent request failed
+    recent_failures: deque = field(default_factory=lambda: deque(maxlen=20))
+    last_decrease: float = 0.0
+    last_logged: float = 0.0
+    stats: Dict[str, int] = field(default_factory=lambda: {"requests": 0, "throttled": 0, "errors": 0, "slowdowns": 0})
+
+class AdaptiveRateController:
+    """
+    Paces requests per website from how the website responds (AIMD).
+
+    Call wait(url) before each request and record(url, ...) after it. Works from
+    async code (wait) and from plain code such as Selenium (wait_blocking).
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        start_rate: Optional[float] = None,
+        min_rate: float = 2.0,
+        max_concurrency: int = 1,
+        increase: float = 1.0,
+        throttle_factor: float = 0.5,
+        error_factor: float = 0.75,
+        slow_factor: float = 0.9,
+        slow_latency_factor: float = 2.0,
+        max_error_rate: float = 0.2,
+        jitter: float = 0.0,
+        state_file: Optional[str] = None,
+        name: str = "pages",
+    ):
+        """
+        Set up the controller.
+
+        Args:
+            max_rate (float): Most requests per minute to any one website (0 or less means no limit)
+            start_rate (float, optional): Requests per minute to start with (default half of max_rate,
+                                          or the pace saved by the last run)
+            min_rate (float): Fewest requests per minute, however badly the website responds
+            max_concurrency (int): Most requests in flight at the same time to one website
+            increase (float): Requests per minute added after each request that works
+            throttle_factor (float): Pace is multiplied by this after a 429/503
+            error_factor (float): Pace is multiplied by this when too many recent requests failed
+            slow_factor (float): Pace is multiplied by this when responses get slow
+            slow_latency_factor (float): Responses count as slow when they take this many times
+                                         longer than the fastest the website has been
+            max_error_rate (float): Share of recent requests allowed to fail before slowing down
+            jitter (float): Random variation of the time between requests (0.3 is +/- 30%)
+            state_file (str, optional): JSON file where the pace of each website is saved between runs
+            name (str): What is being requested, for the log (e.g. "search pages")
+        """
+        self.max_rate = max_rate if max_rate > 0 else None
+        self.min_rate = min(min_rate, self.max_rate) if self.max_rate else min_rate
+        self.start_rate = start_rate or (self.max_rate / 2 if self.max_rate else 30.0)
+        self.max_concurrency = max(1, max_concurrency)
+        self.increase = increase
+        self.throttle_factor = throttle_factor
+        self.error_factor = error_factor
+        self.slow_factor = slow_factor
+        self.slow_latency_factor = slow_latency_factor
+        self.max_error_rate = max_error_rate
+        self.jitter = jitter
+        self.state_file = state_file
+        self.name = name
+        self._hosts: Dict[str, HostPace] = {}
+        # Plain lock, as the controller is used from the event loop and from Selenium code alike;
+        # it is only held for a few calculations, never while waiting
+        self._lock = threading.Lock()
+        self._saved = self._load_state()
+
+    def _clamp(self, rate: float) -> float:
+        """Keep a pace between the minimum and the maximum."""
+        rate = max(self.min_rate, rate)
+        return min(self.max_rate, rate) if self.max_rate else rate
+
+    def _pace(self, url: str) -> HostPace:
+        """Get the pace of a URL's website, starting it from the saved pace if there is one."""
+        host = urlparse(url).netloc.lower() if url else ""
+        pace = self._hosts.get(host)
+        if pace is None:
+            saved = self._saved.get(host, {})
+            pace = HostPace(rate=self._clamp(saved.get("rate") or self.start_rate), concurrency=1)
+            # Keep honouring a Retry-After that an earlier run was given
+            pause = saved.get("resume_at", 0) - time.time()
+            if pause > 0:
+                pace.resume_at = time.monotonic() + pause
+            self._update_concurrency(pace)
+            self._hosts[host] = pace
+        return pace
+
+    def _reserve(self, url: str) -> Optional[float]:
+        """
+        Reserve the next request slot for a URL's website.
+
+        Returns:
+            Optional[float]: Seconds until the slot, or None if the website already has
+                             as many requests in flight as it is allowed
+        """
+        with self._lock:
+            pace = self._pace(url)
+            if pace.in_flight >= pace.concurrency:
+                return None
+            now = time.monotonic()
+            slot = max(now, pace.next_slot, pace.resume_at)
+            interval = 60.0 / pace.rate
+            if self.jitter:
+                interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+            pace.next_slot = slot + interval
+            pace.in_flight += 1
+            pace.stats["requests"] += 1
+            return slot - now
+
+    async def wait(self, url: str = "") -> float:
+        """
+        Wait until the next request to a URL's website is allowed to start.
+
+        Args:
+            url (str): The URL about to be requested
+
+        Returns:
+            float: Number of seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self._reserve(url)
+            if delay is not None:
+                break
+            await asyncio.sleep(0.1)
+            waited += 0.1
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # The request will never run, so give its slot back
+                self.release(url)
+                raise
+        return waited + delay
+
+    def wait_blocking(self, url: str = "") -> float:
+        """
+        Same as wait(), for code that doesn't run in an event loop (e.g. Selenium).
+
+        Args:
+            url (str): The URL about to be requested
+
+        Returns:
+            float: Number of seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self._reserve(url)
+            if delay is not None:
+                break
+            time.sleep(0.1)
+            waited += 0.1
+        if delay > 0:
+            time.sleep(delay)
+        return waited + delay
+
+    def release(self, url: str = "") -> None:
+        """
+        Give back a slot taken by wait() for a request that never ran.
+        Nothing is learned about the website, so its pace stays the same.
+
+        Args:
+            url (str): The URL that was not requested
+        """
+        with self._lock:
+            pace = self._pace(url)
+            pace.in_flight = max(0, pace.in_flight - 1)
+
+    def record(self, url: str = "", status: int = 0, latency: float = 0.0, error: bool = False,
+               retry_after=None) -> None:
+        """
+        Tell the controller how a request went, and adjust the website's pace.
+
+        Args:
+            url (str): The URL that was requested
+            status (int): HTTP status of the response (0 if unknown)
+            latency (float): Seconds the request took
+            error (bool): Whether the request failed (no page, connection error, ...)
+            retry_after: The response's Retry-After header, if it had one
+        """
+        with self._lock:
+            pace = self._pace(url)
+            pace.in_flight = max(0, pace.in_flight - 1)
+            now = time.monotonic()
+            throttled = status in (429, 503)
+            failed = error or throttled or status >= 500
+            pace.recent_failures.append(failed)
+
+            if latency > 0:
+                pace.latency = latency if not pace.latency else 0.7 * pace.latency + 0.3 * latency
+                if not pace.baseline_latency or pace.latency < pace.baseline_latency:
+                    pace.baseline_latency = pace.latency
+
+            host = urlparse(url).netloc.lower() if url else ""
+            if throttled:
+                pause = parse_retry_after(retry_after)
+                pause = DEFAULT_RETRY_AFTER if pause is None else pause
+                pace.resume_at = max(pace.resume_at, now + pause)
+                pace.stats["throttled"] += 1
+                # One slow-down per wave of 429s: the requests already in flight get them too
+                if now - pace.last_decrease > pause:
+                    self._decrease(pace, host, self.throttle_factor,
+                                   f"website said too many requests ({status}), pausing {pause:.0f}s", now)
+            elif failed:
+                pace.stats["errors"] += 1
+                failures = sum(pace.recent_failures)
+                if len(pace.recent_failures) >= 5 and failures / len(pace.recent_failures) > self.max_error_rate:
+                    self._decrease(pace, host, self.error_factor,
+                                   f"{failures} of the last {len(pace.recent_failures)} requests failed", now)
+                    pace.recent_failures.clear()
+            elif pace.baseline_latency and pace.latency > self.slow_latency_factor * pace.baseline_latency:
+                if now - pace.last_decrease > 60.0 / pace.rate:
+                    pace.stats["slowdowns"] += 1
+                    self._decrease(pace, host, self.slow_factor,
+                                   f"responses take {pace.latency:.1f}s (fastest {pace.baseline_latency:.1f}s)", now)
+            else:
+                pace.rate = self._clamp(pace.rate + self.increase)
+                self._update_concurrency(pace)
+                if now - pace.last_logged > PACE_LOG_INTERVAL:
+                    pace.last_logged = now
+                    logging.info(f"🚦 {host or self.name}: {pace.rate:.1f} {self.name}/min, "
+                                 f"{pace.concurrency} at a time, responses in {pace.latency:.1f}s")
+
+    def record_response(self, url: str, response) -> None:
+        """
+        Tell the controller how a download went.
+
+        Args:
+            url (str): The URL that was requested
+            response (HttpResponse): The response from HttpClient.get
+        """
+        self.record(url, status=response.status, latency=response.elapsed, error=bool(response.error),
+                    retry_after=response.headers.get("retry-after"))
+
+    def record_crawl_result(self, url: str, result, latency: float) -> None:
+        """
+        Tell the controller how a browser page load went.
+
+        Args:
+            url (str): The URL that was requested
+            result: The crawl4ai result (None if loading the page raised an error)
+            latency (float): Seconds the page load took
+        """
+        if result is None:
+            self.record(url, latency=latency, error=True)
+            return
+        headers = {name.lower(): value for name, value in (getattr(result, "response_headers", None) or {}).items()}
+        self.record(url, status=getattr(result, "status_code", None) or 0, latency=latency,
+                    error=not result.success, retry_after=headers.get("retry-after"))
+
+    def _decrease(self, pace: HostPace, host: str, factor: float, reason: str, now: float) -> None:
+        """Slow a website's pace down and log why."""
+        pace.rate = self._clamp(pace.rate * factor)
+        pace.last_decrease = now
+        pace.last_logged = now
+        self._update_concurrency(pace)
+        logging.warning(f"🚦 Slowing down {host or self.name} to {pace.rate:.1f} {self.name}/min, "
+                        f"{pace.concurrency} at a time: {reason}")
+
+    def _update_concurrency(self, pace: HostPace) -> None:
+        """
+        Allow as many requests in flight as the pace needs, given how long responses take
+        (requests per second x seconds per response), within max_concurrency.
+        """
+        needed = math.ceil(pace.rate / 60.0 * (pace.latency or 1.0))
+        pace.concurrency = max(1, min(self.max_concurrency, needed))
+
+    def current_rate(self, url: str = "") -> float:
+        """The current pace (requests per minute) for a URL's website."""
+        with self._lock:
+            return self._pace(url).rate
+
+    def _load_state(self) -> Dict[str, Dict]:
+        """Read the paces saved by earlier runs."""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ Could not read saved pacing from {self.state_file}: {e}")
+            return {}
+
+    def close(self) -> None:
+        """Log the pace of each website and save it for the next run."""
+        with self._lock:
+            hosts = dict(self._hosts)
+        for host, pace in hosts.items():
+            logging.info(f"🚦 {host or self.name}: ended at {pace.rate:.1f} {self.name}/min after "
+                         f"{pace.stats['requests']} requests ({pace.stats['throttled']} throttled, "
+                         f"{pace.stats['errors']} failed, {pace.stats['slowdowns']} slow-downs for slow responses)")
+
+        if not self.state_file or not hosts:
+            return
+        state = dict(self._load_state())
+        for host, pace in hosts.items():
+            state[host] = {
+                "rate": round(pace.rate, 2),
+                "resume_at": time.time() + max(0.0, pace.resume_at - time.monotonic()),
+                "saved_at": time.time(),
+            }
+        try:
+            directory = os.path.dirname(self.state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Several processes may save at the same time, so write a temporary file and swap it in
+            temp_path = f"{self.state_file}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(state, file, indent=2)
+            os.replace(temp_path, self.state_file)
+        except OSError as e:
+            logging.warning(f"⚠️ Could not save pacing to {self.state_file}: {e}")
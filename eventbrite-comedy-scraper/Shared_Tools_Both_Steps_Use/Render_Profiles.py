@@ -0,0 +1,218 @@
+"""
+Render profiles used by both steps of the application.
+
+A render profile decides which parts of a web page the browser is allowed to download.
+We only need the text of Eventbrite pages, so the "text-only" profile blocks images,
+fonts, videos, scripts from other websites, and known analytics, advertising and map
+tile websites before the browser requests them. The "full" profile loads everything,
+like a normal browser.
+
+Every page load is measured (bytes transferred and load time) so the two profiles
+can be compared in the run summary. Blocked downloads are counted, but their size is
+never known because the browser doesn't request them: the data saved by "text-only"
+shows by comparing its average page weight with a run using the "full" profile.
+"""
+
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Profiles that can be selected with --render-profile
+RENDER_PROFILES = {
+    "full": "load everything, like a normal browser",
+    "text-only": "block images, fonts, videos, scripts from other websites, analytics, ads and map tiles",
+}
+
+# Kinds of downloads blocked by the text-only profile (Playwright resource types)
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# File endings of the same kinds of downloads, for browsers that can only block by address (Selenium)
+BLOCKED_FILE_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+]
+
+# Websites that never carry event information: analytics, advertising, tracking and map tiles
+BLOCKED_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "bat.bing.com",
+    "analytics.tiktok.com",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "amplitude.com",
+    "mixpanel.com",
+    "optimizely.com",
+    "nr-data.net",
+    "newrelic.com",
+    "branch.io",
+    "sentry.io",
+    "maps.googleapis.com",
+    "maps.gstatic.com",
+    "api.mapbox.com",
+    "tiles.mapbox.com",
+    "tile.openstreetmap.org",
+]
+
+# Eventbrite's own websites; scripts from anywhere else are blocked by the text-only profile
+FIRST_PARTY_DOMAINS = ["eventbrite.ca", "eventbrite.com", "evbuc.com", "evbstatic.com"]
+
+# JavaScript that reports how many bytes the page transferred and how long it took to load
+PAGE_WEIGHT_SCRIPT = """
+(() => {
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    let bytes = navigation ? navigation.transferSize : 0;
+    for (const entry of resources) {
+        bytes += entry.transferSize || 0;
+    }
+    let loadMs = 0;
+    if (navigation) {
+        loadMs = (navigation.loadEventEnd || navigation.domContentLoadedEventEnd || performance.now()) - navigation.startTime;
+    }
+    return {bytes: bytes, load_ms: loadMs, requests: resources.length + 1};
+})()
+"""
+
+def _host_matches(host: str, domains) -> bool:
+    """Check whether a host is one of the domains or a subdomain of one."""
+    host = host.lower()
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+def should_block(profile: str, url: str, resource_type: str = "") -> bool:
+    """
+    Decide whether the browser should skip a download.
+
+    Args:
+        profile (str): Name of the render profile
+        url (str): Address of the download
+        resource_type (str): Kind of download (e.g. "image", "script"), if known
+
+    Returns:
+        bool: True if the download should be blocked
+    """
+    if profile != "text-only":
+        return False
+
+    host = urlparse(url).hostname or ""
+    if _host_matches(host, BLOCKED_DOMAINS):
+        return True
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    if resource_type == "script" and host and not _host_matches(host, FIRST_PARTY_DOMAINS):
+        return True
+    return False
+
+def record_page_weight(stats, profile: str, weight: Optional[Dict]) -> None:
+    """
+    Add one page's measurements to the run statistics, under the profile's name.
+
+    Args:
+        stats (RunStatistics): Statistics for this run
+        profile (str): Name of the render profile
+        weight (Dict, optional): Result of PAGE_WEIGHT_SCRIPT
+    """
+    if not stats or not isinstance(weight, dict):
+        return
+    stats.increment(f"render_{profile}_pages")
+    stats.increment(f"render_{profile}_bytes", int(weight.get("bytes") or 0))
+    stats.increment(f"render_{profile}_requests", int(weight.get("requests") or 0))
+    stats.add_time(f"render_{profile}_load_time", (weight.get("load_ms") or 0) / 1000)
+
+def attach_render_profile(crawler, profile: str, stats=None) -> None:
+    """
+    Apply a render profile to a crawl4ai crawler, using request interception.
+    Call this before the crawler opens its first page.
+
+    Args:
+        crawler (AsyncWebCrawler): The crawler
+        profile (str): Name of the render profile
+        stats (RunStatistics, optional): Statistics for this run (for blocked downloads and page weight)
+    """
+    async def block_requests(route):
+        request = route.request
+        if should_block(profile, request.url, request.resource_type):
+            if stats:
+                stats.increment(f"render_{profile}_blocked_requests")
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def on_page_context_created(page, **kwargs):
+        if profile != "full":
+            await page.route("**/*", block_requests)
+        return page
+
+    async def before_return_html(page, html, **kwargs):
+        try:
+            record_page_weight(stats, profile, await page.evaluate(PAGE_WEIGHT_SCRIPT))
+        except Exception as e:
+            logging.debug(f"Could not measure page weight: {e}")
+        return page
+
+    crawler.crawler_strategy.set_hook("on_page_context_created", on_page_context_created)
+    crawler.crawler_strategy.set_hook("before_return_html", before_return_html)
+
+def apply_render_profile_to_driver(driver, profile: str) -> None:
+    """
+    Apply a render profile to a Selenium Chrome browser.
+    Chrome can only block by address here, so scripts from other websites are only
+    blocked when they come from one of the blocked domains.
+
+    Args:
+        driver: The Selenium Chrome web driver
+        profile (str): Name of the render profile
+    """
+    if profile != "text-only":
+        return
+
+    patterns = list(BLOCKED_FILE_PATTERNS)
+    patterns.extend(f"*{domain}*" for domain in BLOCKED_DOMAINS)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        logging.warning(f"⚠️ Could not apply the {profile} render profile: {e}")
+
+def measure_driver_page(driver, stats, profile: str) -> None:
+    """
+    Measure the page that is currently open in a Selenium browser.
+
+    Args:
+        driver: The Selenium web driver
+        stats (RunStatistics): Statistics for this run
+        profile (str): Name of the render profile
+    """
+    try:
+        record_page_weight(stats, profile, driver.execute_script("return " + PAGE_WEIGHT_SCRIPT.strip()))
+    except Exception as e:
+        logging.debug(f"Could not measure page weight: {e}")
+
+def log_render_summary(stats, profile: str) -> None:
+    """
+    Write the average page weight and load time of a render profile to the log.
+
+    Args:
+        stats (RunStatistics): Statistics for this run
+        profile (str): Name of the render profile
+    """
+    pages = stats.get(f"render_{profile}_pages")
+    if not pages:
+        return
+    kilobytes = stats.get(f"render_{profile}_bytes") / 1024 / pages
+    seconds = stats.timings.get(f"render_{profile}_load_time", 0.0) / pages
+    blocked = stats.get(f"render_{profile}_blocked_requests")
+    logging.info(f"🪶 Render profile '{profile}': {pages} pages, average {kilobytes:.0f} KB transferred "
+                 f"and {seconds:.1f}s to load" + (f", {blocked} downloads blocked" if blocked else ""))
+    if profile == "full":
+        logging.info("💡 Run with --render-profile text-only to compare")
+    else:
+        logging.info("💡 Blocked downloads are never transferred, so their size is unknown; "
+                     "run with --render-profile full to see how much data this profile saves")
@@ -0,0 +1,101 @@
+"""
+Run statistics tools used by both steps of the application.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+class RunStatistics:
+    """
+    Keeps simple counters and timings for a single run.
+    Counters can also be tracked per link so the run summary can show
+    how much work each event website needed.
+    """
+
+    def __init__(self):
+        """Set up empty counters and timings."""
+        self.counters = defaultdict(int)
+        self.timings = defaultdict(float)
+        self.per_link = defaultdict(lambda: defaultdict(int))
+
+    def increment(self, name: str, amount: int = 1, link: Optional[str] = None) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): Name of the counter
+            amount (int): How much to add
+            link (str, optional): Event link the counter belongs to
+        """
+        self.counters[name] += amount
+        if link:
+            self.per_link[link][name] += amount
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Add time (in seconds) to a named timing.
+
+        Args:
+            name (str): Name of the timing
+            seconds (float): Number of seconds to add
+        """
+        self.timings[name] += seconds
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Time a block of code and add the result to a named timing.
+
+        Args:
+            name (str): Name of the timing
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def get(self, name: str) -> int:
+        """
+        Get the current value of a counter.
+
+        Args:
+            name (str): Name of the counter
+
+        Returns:
+            int: Counter value (0 if never incremented)
+        """
+        return self.counters.get(name, 0)
+
+    def per_link_distribution(self, name: str, links=None) -> Dict[int, int]:
+        """
+        Count how many links ended up with each value of a per-link counter.
+
+        Args:
+            name (str): Name of the counter
+            links (list, optional): Links to include (defaults to all tracked links)
+
+        Returns:
+            Dict[int, int]: Mapping of counter value to number of links
+        """
+        links = links if links is not None else list(self.per_link)
+        distribution = defaultdict(int)
+        for link in links:
+            distribution[self.per_link[link].get(name, 0)] += 1
+        return dict(sorted(distribution.items()))
+
+    def log_summary(self, title: str = "Run summary") -> None:
+        """
+        Write all counters and timings to the log.
+
+        Args:
+            title (str): Heading for the summary
+        """
+        logging.info(f"📊 {title}")
+        for name in sorted(self.counters):
+            logging.info(f"   {name}: {self.counters[name]}")
+        for name in sorted(self.timings):
+            logging.info(f"   {name}: {self.timings[name]:.2f}s")
@@ -0,0 +1,27 @@
+"""
+Opening the SQLite databases that workers share (memory of AI answers, work queue,
+event versions and the event index).
+"""
+
+import sqlite3
+
+# Seconds a write waits for another process's write to finish before failing
+BUSY_TIMEOUT_SECONDS = 30
+
+def connect_shared_database(path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database that several threads and worker processes use.
+
+    The connection may be used from any thread, so the caller must guard it with its
+    own lock. Worker processes open the same file, so a write waits for theirs instead
+    of failing, and write-ahead logging lets them read while another process writes.
+
+    Args:
+        path (str): Path of the database file
+
+    Returns:
+        sqlite3.Connection: The open connection
+    """
+    connection = sqlite3.connect(path, check_same_thread=False, timeout=BUSY_TIMEOUT_SECONDS)
+    connection.execute("PRAGMA journal_mode=WAL")
+    return connection
@@ -0,0 +1,79 @@
+"""
+Website address (URL) tools used by both steps of the application.
+"""
+
+import re
+from typing import Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+def canonicalize_event_url(url: str) -> str:
+    """
+    Turn an event website address into one standard form, so the same event
+    always gets the same address no matter how it was linked.
+
+    Tracking parameters (like ?aff=ebdssbdestsearch) and #fragments are removed,
+    the domain is lowercased, and any trailing slash is dropped.
+
+    Args:
+        url (str): Event website address
+
+    Returns:
+        str: Standard form of the address
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    netloc = parts.netloc.lower()
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, netloc, path, "", ""))
+
+# Eventbrite event addresses end in the event's numeric ID, e.g. /e/comedy-night-tickets-123456789012
+EVENT_ID_PATTERN = re.compile(r"/e/(?:[^/]*-)?(\d{6,})$")
+
+def extract_event_id(url: str) -> Optional[str]:
+    """
+    Get the numeric Eventbrite event ID from an event website address.
+
+    Args:
+        url (str): Event website address
+
+    Returns:
+        Optional[str]: The event ID, or None if the address doesn't contain one
+    """
+    match = EVENT_ID_PATTERN.search(urlsplit(url.strip()).path.rstrip("/"))
+    return match.group(1) if match else None
+
+def event_key(url: str) -> str:
+    """
+    Get the key that identifies an event, so the same event is recognized under any address
+    (different tracking parameters, eventbrite.ca or eventbrite.com, a changed title).
+
+    Args:
+        url (str): Event website address
+
+    Returns:
+        str: "eventbrite:<event ID>", or the standard form of the address if it has no event ID
+    """
+    event_id = extract_event_id(url)
+    return f"eventbrite:{event_id}" if event_id else canonicalize_event_url(url)
+
+def dedupe_event_links(urls: Iterable[str]) -> List[str]:
+    """
+    Remove duplicate events from a list of links, keeping the first address of each event
+    (in its standard form) and the original order.
+
+    Args:
+        urls (Iterable[str]): Event website addresses
+
+    Returns:
+        List[str]: One standard address per event
+    """
+    seen = set()
+    unique = []
+    for url in urls:
+        if not url:
+            continue
+        key = event_key(url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(canonicalize_event_url(url))
+    return unique
@@ -4,6 +4,9 @@ Web browser setup tool used by both steps of the application.
 
 from crawl4ai import BrowserConfig
 
+# Spoofed User-Agent, also sent by the downloader (Http_Client.py) so both identify themselves the same way
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
 def get_browser_config(headless: bool = True) -> BrowserConfig:
     """
     Returns the browser configuration for the crawler.
@@ -18,7 +21,7 @@ def get_browser_config(headless: bool = True) -> BrowserConfig:
         browser_type="chromium",  # Type of browser to simulate
         headless=headless,  # Run in headless mode (no GUI)
         verbose=True,  # Enable verbose logging
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",  # Spoofed User-Agent
+        user_agent=BROWSER_USER_AGENT,  # Spoofed User-Agent
         window_size={"width": 1920, "height": 1080},  # Window size
         timeout=30000,  # Timeout in milliseconds
         viewport={"width": 1920, "height": 1080},  # Viewport size
@@ -0,0 +1,11 @@
+"""
+Shared test setup: make the step folders importable the same way the scripts do.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in (ROOT, os.path.join(ROOT, "Second_Step_Get_Event_Details"), os.path.join(ROOT, "First_Step_Find_All_Events")):
+    if folder not in sys.path:
+        sys.path.append(folder)
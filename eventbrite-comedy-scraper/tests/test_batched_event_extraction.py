@@ -0,0 +1,76 @@
+"""
+Tests for extracting several events with one AI call: matching answers to events,
+extracting left-out events on their own, and counting AI calls per event.
+"""
+
+import asyncio
+import re
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from crawl4ai import LLMExtractionStrategy
+
+from Batched_Event_Extraction import extract_event_details_batch
+from Event_Detail_Stages import FetchedPage, StageContext
+from Shared_Tools_Both_Steps_Use.Run_Statistics import RunStatistics
+from Smart_Text_Analyzer_Configuration import get_event_detail_llm_strategy
+
+REQUIRED_KEYS = ["title", "venue", "date", "event_link"]
+LINKS = [f"https://www.eventbrite.ca/e/show-tickets-{1000 + number}" for number in range(3)]
+
+def _answer(link, event_link=None):
+    return {"title": f"Show {link[-4:]}", "venue": "The Rivoli", "date": "2025-05-05 8:00 PM",
+            "event_link": event_link or link}
+
+@pytest.fixture
+def ai(monkeypatch):
+    """Stands in for the AI: answers every event in the content it is sent, and records each call."""
+    ai = {"calls": [], "leave_out": set(), "reverse": False}
+
+    def extract(strategy, url, ix, content):
+        ai["calls"].append(url)
+        links = re.findall(r"^event_link: (\S+)$", content, flags=re.MULTILINE)
+        if not links:
+            # A single event's page
+            return [_answer(url)]
+        # The AI may copy the link with a tracking parameter
+        answers = [_answer(link, link + "?aff=ebdssbdestsearch") for link in links if link not in ai["leave_out"]]
+        return answers[::-1] if ai["reverse"] else answers
+
+    monkeypatch.setattr(LLMExtractionStrategy, "extract", extract)
+    return ai
+
+def _extract(pages):
+    context = StageContext(crawler=None, llm_strategy=get_event_detail_llm_strategy(models=["groq/test-model"]),
+                           required_keys=REQUIRED_KEYS, stats=RunStatistics())
+    results = asyncio.run(extract_event_details_batch(context, pages))
+    return context, results
+
+def _pages():
+    return [FetchedPage(url=link, markdown=f"# Show {link[-4:]}\n\nAt The Rivoli.") for link in LINKS]
+
+def test_one_call_is_counted_for_each_event_in_the_batch(ai):
+    context, results = _extract(_pages())
+
+    assert len(ai["calls"]) == 1
+    assert dict(context.llm_strategy.llm_calls_by_url) == {link: 1 for link in LINKS}
+
+def test_answers_are_matched_to_their_event_by_event_id(ai):
+    ai["reverse"] = True
+
+    _, results = _extract(_pages())
+
+    assert [result["title"] for result in results] == [f"Show {link[-4:]}" for link in LINKS]
+    assert [result["event_link"] for result in results] == LINKS
+
+def test_event_left_out_of_the_answer_is_extracted_on_its_own(ai):
+    ai["leave_out"] = {LINKS[1]}
+
+    context, results = _extract(_pages())
+
+    assert all(results)
+    assert ai["calls"][1:] == [LINKS[1]]
+    assert context.llm_strategy.llm_calls_by_url[LINKS[1]] == 2
+    assert context.stats.get("llm_batch_fallbacks") == 1
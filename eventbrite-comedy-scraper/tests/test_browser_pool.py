@@ -0,0 +1,56 @@
+"""
+Tests for the browser pool's recycling.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+import Browser_Pool
+from Browser_Pool import BrowserPool
+
+class FakeCrawler:
+    """Stands in for a real browser: starting and closing it does nothing."""
+
+    started = 0
+
+    def __init__(self, config=None):
+        self.closed = False
+
+    async def start(self):
+        FakeCrawler.started += 1
+
+    async def close(self):
+        self.closed = True
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(Browser_Pool, "AsyncWebCrawler", FakeCrawler)
+    monkeypatch.setattr(Browser_Pool, "psutil", None)
+    FakeCrawler.started = 0
+    return BrowserPool(lambda: None, size=1, max_pages=2, max_memory_mb=0, max_error_streak=3)
+
+def _serve_pages(pool, pages, success=True):
+    async def serve():
+        for _ in range(pages):
+            async with pool.lease() as browser:
+                browser.record_result(success)
+    # A pool that never hands out the recycled browser would wait forever
+    asyncio.run(asyncio.wait_for(serve(), timeout=5))
+
+def test_leases_past_max_pages_with_one_browser(pool):
+    _serve_pages(pool, 5)
+
+    # Recycled after pages 2 and 4, each counted once
+    assert pool.recycles == {"pages served": 2}
+    assert FakeCrawler.started == 3
+    assert pool.browsers[0].pages_served == 1
+
+def test_recycles_after_error_streak(pool):
+    pool.max_pages = 0
+    _serve_pages(pool, 4, success=False)
+
+    assert pool.recycles == {"error streak": 1}
+    assert pool.browsers[0].error_streak == 1
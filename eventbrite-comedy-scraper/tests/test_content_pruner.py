@@ -0,0 +1,79 @@
+"""
+Tests for trimming event pages down to what the AI needs, within a token budget.
+"""
+
+from Content_Pruner import estimate_tokens, prune_event_markdown
+
+PAGE = """[Find events](https://www.eventbrite.ca/d/) | [Create events](https://www.eventbrite.ca/organizer/)
+
+# Late Night Laughs
+
+![Poster](https://img.evbuc.com/poster.jpg)
+
+## Date and time
+
+Saturday, May 10 · 8 - 10pm EDT
+
+## Location
+
+The Rivoli, 334 Queen St W, Toronto
+
+## About this event
+
+Five of Toronto's sharpest comics take the stage. Hosted by [Sam Jones](https://www.instagram.com/samjones).
+
+## Organized by
+
+Rivoli Comedy. Questions? [laughs@rivoli.ca](mailto:laughs@rivoli.ca)
+
+## More events from this organizer
+
+Open Mic Monday, Improv Night, Sketch Sunday
+
+## Report this event
+
+Site terms and refund policy
+"""
+
+def test_keeps_the_event_and_drops_menus_and_related_listings():
+    pruned = prune_event_markdown(PAGE, token_budget=1500)
+
+    for kept in ("# Late Night Laughs", "Saturday, May 10", "The Rivoli, 334 Queen St W",
+                 "Five of Toronto's sharpest comics", "Rivoli Comedy"):
+        assert kept in pruned
+    for dropped in ("Find events", "Open Mic Monday", "refund policy", "img.evbuc.com"):
+        assert dropped not in pruned
+
+def test_links_keep_their_text_and_email_addresses():
+    pruned = prune_event_markdown(PAGE, token_budget=1500)
+
+    assert "Hosted by Sam Jones." in pruned
+    assert "instagram.com" not in pruned
+    assert "mailto:laughs@rivoli.ca" in pruned
+
+def test_sections_stay_in_page_order():
+    pruned = prune_event_markdown(PAGE, token_budget=1500)
+
+    positions = [pruned.index(text) for text in ("# Late Night Laughs", "## Date and time", "## Location",
+                                                 "## About this event", "## Organized by")]
+    assert positions == sorted(positions)
+
+def test_least_important_sections_are_trimmed_to_fit_the_budget():
+    page = PAGE.replace("Five of Toronto's sharpest comics take the stage.",
+                        "Five of Toronto's sharpest comics take the stage. " * 40)
+
+    pruned = prune_event_markdown(page, token_budget=60)
+
+    assert estimate_tokens(pruned) <= 60 + 1
+    # The title, date, location and organizer come first; the long description is cut short
+    for kept in ("# Late Night Laughs", "Saturday, May 10", "The Rivoli", "Rivoli Comedy"):
+        assert kept in pruned
+    assert "Five of …" in pruned
+
+def test_page_without_known_sections_is_only_cleaned():
+    page = "Late Night Laughs\n\n![Poster](https://img.evbuc.com/poster.jpg)\n\nSaturday at The Rivoli"
+
+    assert prune_event_markdown(page, token_budget=1500) == "Late Night Laughs\n\nSaturday at The Rivoli"
+
+def test_zero_budget_keeps_the_whole_page():
+    assert prune_event_markdown(PAGE, token_budget=0) == PAGE
@@ -0,0 +1,25 @@
+"""
+Tests for keeping diagnostic captures within their size limit.
+"""
+
+import os
+
+from Shared_Tools_Both_Steps_Use.Diagnostics import CAPTURE_PREFIX, DiagnosticsRecorder
+
+def test_only_the_recorders_own_captures_are_deleted(tmp_path):
+    # A screenshot saved by an older version, and one saved by hand
+    for name in ("run_page_1.png", "bot_check_example.html"):
+        (tmp_path / name).write_bytes(b"x" * 20000)
+        os.utime(tmp_path / name, (0, 0))
+
+    recorder = DiagnosticsRecorder(str(tmp_path), mode="on-failure", max_mb=0.02)
+    for number in range(5):
+        recorder.capture(f"run_page_{number}_no_links", html="<html>" + "x" * 5000 + "</html>")
+    recorder.close()
+
+    names = sorted(os.listdir(tmp_path))
+    assert "run_page_1.png" in names and "bot_check_example.html" in names
+    captures = [name for name in names if name.startswith(CAPTURE_PREFIX)]
+    assert sum(os.path.getsize(tmp_path / name) for name in captures) <= 0.02 * 1024 * 1024
+    assert f"{CAPTURE_PREFIX}run_page_4_no_links.html" in captures
+    assert recorder.stats["deleted"] > 0
@@ -0,0 +1,139 @@
+"""
+Tests for the fetch stage's incremental re-crawl: conditional requests, remembered headers,
+content fingerprints and recently collected events.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+from Event_Detail_Stages import FetchedPage, StageContext, extract_event_details, fetch_event_page, page_fingerprint
+from Event_Version_Store import EventVersionStore
+from Shared_Tools_Both_Steps_Use.Event_Id_Index import EventIdIndex
+from Shared_Tools_Both_Steps_Use.Http_Client import HttpResponse
+from Shared_Tools_Both_Steps_Use.Run_Statistics import RunStatistics
+
+URL = "https://www.eventbrite.ca/e/late-night-laughs-tickets-123456789"
+REQUIRED_KEYS = ["title", "venue", "event_link"]
+MARKDOWN = "# Late Night Laughs\n\nStand-up comedy at The Rivoli, with five comics."
+RECORD = {"title": "Late Night Laughs", "venue": "The Rivoli", "event_link": URL}
+HTML = f"""<html><head><title>Late Night Laughs</title>
+<script type="application/ld+json">{json.dumps({"@type": "Event", "name": "Late Night Laughs"})}</script>
+</head><body><nav>Find events</nav><main><h1>Late Night Laughs</h1>
+<p>{"Five of Toronto's sharpest comics take the stage at The Rivoli for a night of stand-up. " * 6}</p>
+</main></body></html>"""
+
+class FakeHttpClient:
+    """Answers every request with the same page and an ETag, like the server would."""
+
+    async def get(self, url, headers=None):
+        return HttpResponse(url=url, status=200, text=HTML, headers={"etag": '"v1"'})
+
+class RecordingHttpClient:
+    """Answers with the given status and remembers the headers of every request."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.requests = []
+
+    async def get(self, url, headers=None):
+        self.requests.append(headers)
+        return HttpResponse(url=url, status=self.status, text=HTML if self.status == 200 else "",
+                            headers={"etag": '"v2"'} if self.status == 200 else {})
+
+async def _no_browser(crawler, url, config):
+    raise AssertionError("the page should not be loaded in the browser")
+
+def _browser(markdown, html=""):
+    """A visit function that answers like the browser, without any headers."""
+    async def visit(crawler, url, config):
+        return SimpleNamespace(success=True, markdown=markdown, html=html, error_message="")
+    return visit
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventVersionStore(str(tmp_path / "event_versions.sqlite3"))
+    yield store
+    store.close()
+
+def _context(store, visit=None, http_client=None, **options):
+    return StageContext(crawler=None, llm_strategy=None, required_keys=REQUIRED_KEYS, stats=RunStatistics(),
+                        version_store=store, visit=visit, http_client=http_client, **options)
+
+def _collect(context):
+    async def collect():
+        page = await fetch_event_page(context, URL)
+        return await extract_event_details(context, page)
+    return asyncio.run(collect())
+
+def test_browser_page_keeps_the_headers_saved_last_time(store):
+    store.put(URL, RECORD, fingerprint=page_fingerprint(FetchedPage(url=URL, markdown=MARKDOWN)),
+              etag='"v1"', last_modified="Mon, 05 May 2025 10:00:00 GMT")
+
+    event = _collect(_context(store, _browser(MARKDOWN)))
+
+    assert event == RECORD
+    version = store.get(URL)
+    assert version["etag"] == '"v1"'
+    assert version["last_modified"] == "Mon, 05 May 2025 10:00:00 GMT"
+
+def test_same_page_has_the_same_fingerprint_through_both_tiers(store):
+    downloaded = asyncio.run(fetch_event_page(_context(store, http_client=FakeHttpClient()), URL))
+    # The browser's own markdown is made differently from the downloaded page's
+    loaded = asyncio.run(fetch_event_page(_context(store, visit=_browser("Late Night Laughs | Eventbrite", HTML)), URL))
+
+    assert downloaded.etag == '"v1"' and not loaded.etag
+    assert downloaded.fingerprint
+    assert loaded.fingerprint == downloaded.fingerprint
+
+def test_not_modified_page_reuses_the_last_record_without_the_browser_or_ai(store):
+    store.put(URL, RECORD, fingerprint="abc", etag='"v1"', last_modified="Mon, 05 May 2025 10:00:00 GMT")
+    client = RecordingHttpClient(status=304)
+
+    event = _collect(_context(store, _no_browser, client))
+
+    assert client.requests == [{"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 05 May 2025 10:00:00 GMT"}]
+    assert event == RECORD
+    assert store.stats["not_modified"] == 1
+
+def test_first_download_is_not_conditional(store):
+    client = RecordingHttpClient()
+
+    page = asyncio.run(fetch_event_page(_context(store, http_client=client), URL))
+
+    assert client.requests == [None]
+    assert page.previous_event is None
+    assert store.stats["new"] == 1
+
+def test_page_with_the_same_content_reuses_the_last_record(store):
+    store.put(URL, RECORD, fingerprint=page_fingerprint(FetchedPage(url=URL, html=HTML)), etag='"v1"')
+
+    page = asyncio.run(fetch_event_page(_context(store, http_client=RecordingHttpClient()), URL))
+
+    assert page.previous_event == RECORD
+    assert store.stats["same_fingerprint"] == 1
+
+def test_changed_page_is_extracted_again(store):
+    store.put(URL, RECORD, fingerprint="fingerprint of an older version", etag='"v1"')
+
+    page = asyncio.run(fetch_event_page(_context(store, http_client=RecordingHttpClient()), URL))
+
+    assert page.previous_event is None and page.etag == '"v2"'
+    assert store.stats["changed"] == 1
+
+@pytest.mark.parametrize("hours, skipped", [(24, True), (0, False)])
+def test_recently_collected_event_is_not_loaded_again(store, tmp_path, hours, skipped):
+    store.put(URL, RECORD, fingerprint="abc")
+    index = EventIdIndex(str(tmp_path / "event_index.sqlite3"))
+    index.mark_collected(URL)
+
+    context = _context(store, _browser(MARKDOWN), event_index=index, recollect_after_hours=hours)
+    page = asyncio.run(fetch_event_page(context, URL))
+    index.close()
+
+    assert page.skipped is skipped
+    assert (page.previous_event == RECORD) is skipped
@@ -0,0 +1,38 @@
+"""
+Tests for deciding when a search has reached the end of its results.
+"""
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import Main_Settings
+from Event_Finder import choose_last_page, is_rate_limit_page, page_stop_reason
+
+EVENT_A = "https://www.eventbrite.ca/e/show-a-tickets-1001"
+EVENT_B = "https://www.eventbrite.ca/e/show-b-tickets-1002"
+
+def test_stops_on_no_results_page():
+    assert page_stop_reason("<h1>No Results Found</h1>", [EVENT_A], set()) != ""
+
+def test_stops_when_a_page_only_repeats_earlier_events():
+    seen = set()
+    assert page_stop_reason("<html></html>", [EVENT_A, EVENT_B], seen) == ""
+    assert page_stop_reason("<html></html>", [EVENT_B, EVENT_A], seen) == "the page has no new events"
+
+def test_page_without_links_is_not_the_end():
+    # A bot check or "too many requests" page is tried again, not taken as the last page
+    html = "<title>429 Too Many Requests</title>"
+    assert is_rate_limit_page("429 Too Many Requests", html)
+    assert page_stop_reason(html, [], {"1001"}) == ""
+
+FIRST_PAGE = '<script>{"page_number": 1, "page_count": 6}</script>'
+
+def test_search_stops_at_the_page_count_of_the_first_page():
+    assert choose_last_page(FIRST_PAGE, start=1) == 6
+    assert choose_last_page(FIRST_PAGE, start=1, end=3) == 3
+    assert choose_last_page(FIRST_PAGE, start=8) == 8
+
+def test_unknown_page_count_searches_up_to_the_limit():
+    assert choose_last_page("", start=1, end=20) == 20
+    assert choose_last_page("<html></html>", start=3) == 3 + Main_Settings.MAX_PAGES - 1
@@ -0,0 +1,47 @@
+"""
+Tests for the shared index of every event found, keyed by event ID.
+"""
+
+import os
+
+import pytest
+
+from Shared_Tools_Both_Steps_Use.Event_Id_Index import EventIdIndex
+
+SHOW = "https://www.eventbrite.ca/e/late-night-laughs-tickets-123456789"
+OPEN_MIC = "https://www.eventbrite.ca/e/open-mic-tickets-222222222"
+
+@pytest.fixture
+def index(tmp_path):
+    index = EventIdIndex(str(tmp_path / "event_index.sqlite3"))
+    yield index
+    index.close()
+
+def _write_links(path, links, modified):
+    path.write_text("event_link\n" + "\n".join(links) + "\n", encoding="utf-8")
+    os.utime(path, (modified, modified))
+
+def test_only_events_never_seen_before_are_new(index):
+    assert index.record_discovered([SHOW + "?aff=ebdssbdestsearch"], source="first run") == [SHOW]
+
+    new_links = index.record_discovered(["https://www.eventbrite.com/e/renamed-tickets-123456789", OPEN_MIC, ""])
+
+    assert new_links == [OPEN_MIC]
+
+def test_link_files_are_merged_oldest_first_with_each_event_once(index, tmp_path):
+    _write_links(tmp_path / "event_links_1.csv", [SHOW + "?aff=x", OPEN_MIC], modified=1000)
+    _write_links(tmp_path / "event_links_2.csv", [OPEN_MIC + "/", SHOW], modified=2000)
+    merged = tmp_path / "all_event_links.csv"
+    _write_links(merged, ["https://www.eventbrite.ca/e/old-merge-tickets-999999999"], modified=3000)
+
+    links = index.import_link_files(str(tmp_path), exclude=[str(merged)])
+
+    assert links == [SHOW, OPEN_MIC]
+    assert index.record_discovered([SHOW, OPEN_MIC]) == []
+
+def test_collected_events_are_recognized_under_any_address(index):
+    index.mark_collected(SHOW + "?aff=x")
+
+    assert index.collected_within("https://www.eventbrite.com/e/123456789", hours=1)
+    assert not index.collected_within(SHOW, hours=0)
+    assert not index.collected_within(OPEN_MIC, hours=1)
@@ -0,0 +1,103 @@
+"""
+Tests for the two-stage pipeline: result order, streamed links, the bounded queue,
+and stopping both stages when one of them fails.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+
+import Event_Pipeline
+from Event_Detail_Stages import FetchedPage, StageContext
+from Event_Pipeline import EventPipeline
+from Shared_Tools_Both_Steps_Use.Run_Statistics import RunStatistics
+
+LINKS = [f"https://www.eventbrite.ca/e/show-tickets-{1000 + number}" for number in range(12)]
+
+@pytest.fixture(autouse=True)
+def stages(monkeypatch):
+    """Stands in for the browser and the AI; both take a moment per page."""
+    async def fetch(context, url):
+        # Some pages load much slower than others, so they finish out of order
+        await asyncio.sleep(0.001 * (int(url[-1]) % 4))
+        return FetchedPage(url=url, markdown=f"# Show {url[-4:]}")
+
+    async def extract(context, page):
+        await asyncio.sleep(0.002)
+        return {"title": f"Show {page.url[-4:]}", "event_link": page.url}
+
+    monkeypatch.setattr(Event_Pipeline, "fetch_event_page", fetch)
+    monkeypatch.setattr(Event_Pipeline, "extract_event_details", extract)
+    monkeypatch.setattr(Event_Pipeline, "record_failure", lambda context, url, error="": None)
+
+def _pipeline(**options):
+    context = StageContext(crawler=None, llm_strategy=None, required_keys=["title"], stats=RunStatistics())
+    return EventPipeline(context, report_interval=0, **options)
+
+def _run(pipeline, on_ready=None, links=LINKS):
+    async def run():
+        try:
+            return await asyncio.wait_for(pipeline.run(links() if callable(links) else links, on_ready=on_ready),
+                                          timeout=5)
+        finally:
+            # Every worker of both stages was stopped before run() returned
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            assert pending == []
+    return asyncio.run(run())
+
+def _titles(events):
+    return [event["title"] for event in events]
+
+def test_events_are_saved_in_link_order():
+    saved = []
+
+    results = _run(_pipeline(fetch_concurrency=3, extract_concurrency=2), on_ready=saved.extend)
+
+    assert _titles(results) == [f"Show {link[-4:]}" for link in LINKS]
+    assert saved == results
+
+def test_links_streamed_while_they_are_found_are_collected_in_order():
+    async def found_links():
+        for link in LINKS:
+            await asyncio.sleep(0.001)
+            yield link
+
+    results = _run(_pipeline(fetch_concurrency=2, extract_concurrency=2), links=found_links)
+
+    assert _titles(results) == [f"Show {link[-4:]}" for link in LINKS]
+
+def test_fetch_workers_wait_for_room_in_the_queue_when_the_ai_is_slower(monkeypatch):
+    async def slow_extract(context, page):
+        await asyncio.sleep(0.01)
+        return {"title": page.url}
+    monkeypatch.setattr(Event_Pipeline, "extract_event_details", slow_extract)
+    pipeline = _pipeline(fetch_concurrency=3, extract_concurrency=1, queue_size=2)
+
+    results = _run(pipeline)
+
+    assert len(results) == len(LINKS)
+    assert pipeline.max_depth <= 2
+    assert pipeline.report()["fetch_blocked_share"] > 0.25
+
+def test_failing_fetch_worker_stops_the_extract_stage(monkeypatch):
+    pipeline = _pipeline(fetch_concurrency=2, extract_concurrency=2, queue_size=2)
+    samples = []
+
+    def sample_depth():
+        samples.append(1)
+        if len(samples) == 3:
+            raise RuntimeError("queue depth went wrong")
+    monkeypatch.setattr(pipeline, "_sample_depth", sample_depth)
+
+    with pytest.raises(RuntimeError, match="queue depth"):
+        _run(pipeline)
+
+def test_failing_extract_stage_stops_the_fetch_workers():
+    def on_ready(events):
+        raise OSError("disk full")
+
+    # The fetch workers would otherwise wait forever for room in the full queue
+    with pytest.raises(OSError, match="disk full"):
+        _run(_pipeline(fetch_concurrency=2, extract_concurrency=1, queue_size=1), on_ready=on_ready)
@@ -0,0 +1,183 @@
+"""
+Tests for keeping AI calls within the provider's quotas, with a clock the tests move by hand.
+"""
+
+import asyncio
+
+import pytest
+
+from LLM_Dispatcher import (
+    LLMDispatcher,
+    _QuotaListener,
+    LLMRateLimitError,
+    TokenBucket,
+    parse_reset_duration,
+    retry_wait_from_error,
+)
+
+class FakeClock:
+    """A clock that only moves when the dispatcher sleeps."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class RateLimitError(Exception):
+    """Named like litellm's error for a refused call."""
+
+class FakeStrategy:
+    """Answers from a list: an exception is raised, anything else is returned."""
+
+    def __init__(self, answers, provider="groq/llama-3.1-8b-instant"):
+        self.answers = list(answers)
+        self.provider = provider
+        self.instruction = "Extract the event"
+        self.schema = {}
+        self.calls = 0
+
+    def run(self, url, content):
+        self.calls += 1
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def _dispatcher(clock, **settings):
+    settings.setdefault("requests_per_minute", 0)
+    settings.setdefault("tokens_per_minute", 0)
+    return LLMDispatcher(clock=clock, sleep=clock.sleep, **settings)
+
+# Token bucket
+
+def test_bucket_waits_for_refill():
+    bucket = TokenBucket(60, now=0.0)
+
+    assert bucket.reserve(60, now=0.0) == 0.0
+    # One unit per second comes back
+    assert bucket.reserve(30, now=0.0) == pytest.approx(30.0)
+    assert bucket.reserve(1, now=31.0) == pytest.approx(0.0)
+
+def test_bucket_refill_never_exceeds_capacity():
+    bucket = TokenBucket(60, now=0.0)
+    bucket.reserve(60, now=0.0)
+
+    assert bucket.reserve(60, now=3600.0) == 0.0
+    assert bucket.reserve(1, now=3600.0) == pytest.approx(1.0)
+
+def test_bucket_follows_reported_quota():
+    bucket = TokenBucket(6000, now=0.0)
+    bucket.sync(100, now=0.0)
+
+    assert bucket.reserve(200, now=0.0) == pytest.approx(1.0)
+
+def test_bucket_without_limit_never_waits():
+    bucket = TokenBucket(0, now=0.0)
+    assert bucket.reserve(10**6, now=0.0) == 0.0
+
+# Reading how long to wait
+
+@pytest.mark.parametrize("value, seconds", [
+    ("30", 30.0),
+    ("2m59.56s", 179.56),
+    ("7.66s", 7.66),
+    ("120ms", 0.12),
+    ("1h", 3600.0),
+    ("soon", None),
+    (None, None),
+])
+def test_parse_reset_duration(value, seconds):
+    assert parse_reset_duration(value) == (pytest.approx(seconds) if seconds is not None else None)
+
+def test_retry_after_header_comes_first():
+    headers = {"Retry-After": "12", "x-ratelimit-reset-tokens": "40s"}
+    assert retry_wait_from_error("Rate limit reached", headers) == 12.0
+
+def test_waits_for_the_quota_that_ran_out():
+    headers = {"llm_provider-x-ratelimit-reset-requests": "2m0s", "llm_provider-x-ratelimit-reset-tokens": "7.5s"}
+    assert retry_wait_from_error("Rate limit reached on tokens per minute (TPM)", headers) == 7.5
+    assert retry_wait_from_error("Rate limit reached on requests per minute (RPM)", headers) == 120.0
+    assert retry_wait_from_error("Rate limit reached", headers) == 120.0
+
+def test_reads_try_again_in_message():
+    message = "Rate limit reached for model. Please try again in 2m59.56s. Visit the console"
+    assert retry_wait_from_error(message) == pytest.approx(179.56)
+    assert retry_wait_from_error("Rate limit reached") is None
+
+# Dispatcher
+
+def test_refused_call_is_retried_after_the_wait(clock):
+    dispatcher = _dispatcher(clock)
+    strategy = FakeStrategy([RateLimitError("Rate limit reached. Please try again in 5s."), [{"title": "Show"}]])
+
+    assert asyncio.run(dispatcher.run(strategy, "https://example.com/e/1", "page")) == [{"title": "Show"}]
+    assert strategy.calls == 2
+    assert 5.0 < clock.sleeps[-1] <= 5.5
+    assert dispatcher.stats["retries"] == 1
+
+def test_quota_used_up_for_longer_than_max_wait_fails_fast(clock):
+    dispatcher = _dispatcher(clock, max_wait=600)
+    strategy = FakeStrategy([RateLimitError("Rate limit reached on tokens per day. Please try again in 20m0s.")])
+
+    with pytest.raises(LLMRateLimitError):
+        asyncio.run(dispatcher.run(strategy, "https://example.com/e/1", "page"))
+    assert dispatcher._quotas["llama-3.1-8b-instant"].exhausted_until == pytest.approx(clock.now + 1200)
+
+    # Later calls to the same model fail without asking the provider
+    with pytest.raises(LLMRateLimitError):
+        asyncio.run(dispatcher.run(strategy, "https://example.com/e/2", "page"))
+    assert strategy.calls == 1
+    assert dispatcher.stats["gave_up"] == 2
+
+def test_other_models_keep_their_own_quota(clock):
+    dispatcher = _dispatcher(clock, max_wait=600)
+    small = FakeStrategy([RateLimitError("Please try again in 1h")])
+    large = FakeStrategy([[{"title": "Show"}]], provider="groq/deepseek-r1-distill-llama-70b")
+
+    with pytest.raises(LLMRateLimitError):
+        asyncio.run(dispatcher.run(small, "https://example.com/e/1", "page"))
+    assert asyncio.run(dispatcher.run(large, "https://example.com/e/1", "page")) == [{"title": "Show"}]
+
+def test_reported_refusal_pauses_only_that_model(clock):
+    dispatcher = _dispatcher(clock)
+    dispatcher.note_rate_limit("Rate limit reached", {"retry-after": "30"}, model="llama-3.1-8b-instant")
+
+    asyncio.run(dispatcher.run(FakeStrategy([[]], provider="groq/deepseek-r1-distill-llama-70b"), "u", "page"))
+    assert clock.sleeps == []
+    asyncio.run(dispatcher.run(FakeStrategy([[]]), "u", "page"))
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+def test_calls_wait_for_the_requests_per_minute(clock):
+    dispatcher = _dispatcher(clock, requests_per_minute=2)
+
+    for _ in range(3):
+        asyncio.run(dispatcher.run(FakeStrategy([[]]), "u", "page"))
+
+    # The third call in the same minute waits for a request to come back
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+def test_listener_follows_reported_quota_and_refusals(clock):
+    dispatcher = _dispatcher(clock, tokens_per_minute=6000)
+    listener = _QuotaListener(dispatcher)
+
+    # After a call, the provider reports only 600 tokens left for the minute
+    response = type("Response", (), {"_hidden_params": {"additional_headers": {
+        "llm_provider-x-ratelimit-remaining-tokens": "600"}}})()
+    listener.log_success_event({"model": "llama-3.1-8b-instant"}, response, None, None)
+    quota = dispatcher._quotas["llama-3.1-8b-instant"]
+    assert quota.tokens.reserve(1200, clock.now) == pytest.approx(6.0)
+
+    # A refused call pauses the model until its quota resets
+    error = RateLimitError("Rate limit reached. Please try again in 9s.")
+    listener.log_failure_event({"model": "llama-3.1-8b-instant", "exception": error}, None, None, None)
+    assert quota.paused_until == pytest.approx(clock.now + 9.0)
@@ -0,0 +1,89 @@
+"""
+Tests for the model cascade: checking the small model's answers and sending them on to the next model.
+"""
+
+import asyncio
+
+import pytest
+
+from Event_Information_Collector import find_invalid_fields
+
+URL = "https://www.eventbrite.ca/e/late-night-laughs-tickets-123456789"
+REQUIRED_KEYS = ["title", "date", "city", "email"]
+GOOD = {"title": "Late Night Laughs", "date": "2025-05-10 8:00 PM", "city": "Toronto", "email": "laughs@rivoli.ca"}
+
+@pytest.mark.parametrize("changes, invalid", [
+    ({}, []),
+    ({"email": "Not provided"}, []),
+    ({"title": ""}, ["title (missing)"]),
+    ({"title": "N/A"}, ["title (placeholder)"]),
+    ({"city": "Not provided in the listing"}, ["city (placeholder)"]),
+    ({"date": "Saturday evening"}, ["date (no day or time)"]),
+    ({"city": "Toronto, Ontario"}, ["city (more than a name)"]),
+    ({"email": "the organizer's website"}, ["email (not an email address)"]),
+])
+def test_answers_that_dont_look_right_are_found(changes, invalid):
+    assert find_invalid_fields({**GOOD, **changes}, REQUIRED_KEYS) == invalid
+
+class FakeModel:
+    """Stands in for one model of the cascade: gives the same answer every time and counts its calls."""
+
+    def __init__(self, provider, answer, cascade, next_tier=None):
+        self.provider = provider
+        self.answer = answer
+        self.cascade = cascade
+        self.next_tier = next_tier
+        self.calls = 0
+
+    def run(self, url, sections):
+        self.calls += 1
+        return [self.answer]
+
+@pytest.fixture
+def cascade():
+    pytest.importorskip("crawl4ai")
+    from Smart_Text_Analyzer_Configuration import ModelCascadeStats
+    return ModelCascadeStats(["small", "large"])
+
+def _extract(cascade, small_answer, large_answer):
+    from Event_Detail_Stages import ExtractionJob, FetchedPage, StageContext, extract_job_with_llm
+    from Shared_Tools_Both_Steps_Use.Run_Statistics import RunStatistics
+
+    large = FakeModel("large", large_answer, cascade)
+    small = FakeModel("small", small_answer, cascade, next_tier=large)
+    context = StageContext(crawler=None, llm_strategy=small, required_keys=REQUIRED_KEYS, stats=RunStatistics())
+    job = ExtractionJob(page=FetchedPage(url=URL, markdown="# Late Night Laughs"), missing=REQUIRED_KEYS,
+                        strategy=small, content="# Late Night Laughs")
+    event = asyncio.run(extract_job_with_llm(context, job))
+    return event, small, large, job
+
+def test_good_answer_of_the_small_model_is_kept(cascade):
+    event, small, large, job = _extract(cascade, GOOD, GOOD)
+
+    assert event["title"] == "Late Night Laughs"
+    assert (small.calls, large.calls) == (1, 0)
+    assert job.strategy is small
+    assert cascade.tiers["small"]["accepted"] == 1
+
+def test_answer_with_a_placeholder_goes_to_the_next_model(cascade):
+    large_answer = {**GOOD, "city": "Mississauga"}
+
+    event, small, large, job = _extract(cascade, {**GOOD, "city": "Unknown"}, large_answer)
+
+    assert event["city"] == "Mississauga"
+    assert (small.calls, large.calls) == (1, 1)
+    assert job.strategy is large
+    assert cascade.tiers["small"]["escalated"] == 1 and cascade.tiers["large"]["accepted"] == 1
+
+def test_last_models_answer_is_kept_when_no_field_is_missing(cascade):
+    event, _, large, _ = _extract(cascade, {**GOOD, "date": "TBD"}, {**GOOD, "date": "Saturday evening"})
+
+    assert event["date"] == "Saturday evening"
+    assert large.calls == 1
+
+def test_no_event_when_the_last_model_leaves_a_field_out(cascade):
+    event, small, large, _ = _extract(cascade, {**GOOD, "title": ""}, {**GOOD, "title": ""})
+
+    assert event is None
+    assert (small.calls, large.calls) == (1, 1)
+    assert cascade.tiers["large"]["escalated"] == 1
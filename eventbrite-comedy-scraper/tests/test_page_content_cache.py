@@ -0,0 +1,70 @@
+"""
+Tests for sharing the page cache folder between worker processes.
+"""
+
+import asyncio
+import os
+
+import Page_Content_Cache
+from Page_Content_Cache import PageContentCache
+
+def _url(number):
+    return f"https://www.eventbrite.ca/e/show-tickets-{1000 + number}"
+
+def test_page_saved_by_another_worker_is_found(tmp_path):
+    first = PageContentCache(str(tmp_path), max_mb=10)
+    second = PageContentCache(str(tmp_path), max_mb=10)
+
+    asyncio.run(first.put(_url(1), "markdown", "<html></html>"))
+    page = asyncio.run(second.get(_url(1)))
+
+    assert page is not None and page["markdown"] == "markdown"
+    assert second.stats["hits"] == 1
+
+def test_size_budget_holds_for_all_workers_together(tmp_path):
+    # Random text, so each compressed page is about 10 KB
+    pages = [os.urandom(10000).hex() for _ in range(12)]
+    budget_mb = 0.07
+    # Count the folder again on every save, as if a minute passed between them
+    workers = [PageContentCache(str(tmp_path), max_mb=budget_mb, rescan_seconds=0) for _ in range(2)]
+
+    for number, markdown in enumerate(pages):
+        asyncio.run(workers[number % 2].put(_url(number), markdown, ""))
+
+    on_disk = sum(entry.stat().st_size for entry in os.scandir(tmp_path) if entry.name.endswith(".json.gz"))
+    assert on_disk <= budget_mb * 1024 * 1024
+    assert sum(worker.stats["evictions"] for worker in workers) > 0
+
+def test_page_evicted_by_another_worker_is_a_miss(tmp_path):
+    first = PageContentCache(str(tmp_path), max_mb=10)
+    second = PageContentCache(str(tmp_path), max_mb=10)
+    asyncio.run(first.put(_url(1), "markdown", ""))
+    assert asyncio.run(second.get(_url(1))) is not None
+
+    for entry in os.scandir(tmp_path):
+        os.remove(entry.path)
+
+    assert asyncio.run(second.get(_url(1))) is None
+    assert second.stats["misses"] == 1
+
+def test_saving_does_not_scan_the_folder_while_under_budget(tmp_path, monkeypatch):
+    cache = PageContentCache(str(tmp_path), max_mb=10)
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(Page_Content_Cache.os, "scandir", lambda path: scans.append(path) or real_scandir(path))
+
+    for number in range(20):
+        asyncio.run(cache.put(_url(number), "markdown", ""))
+
+    assert scans == []
+    assert cache.stats["writes"] == 20
+
+def test_going_over_budget_scans_the_folder_and_evicts(tmp_path):
+    cache = PageContentCache(str(tmp_path), max_mb=0.03)
+
+    for number in range(6):
+        asyncio.run(cache.put(_url(number), os.urandom(10000).hex(), ""))
+
+    on_disk = sum(entry.stat().st_size for entry in os.scandir(tmp_path) if entry.name.endswith(".json.gz"))
+    assert on_disk <= 0.03 * 1024 * 1024
+    assert cache.stats["evictions"] > 0
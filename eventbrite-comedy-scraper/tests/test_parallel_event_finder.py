@@ -0,0 +1,102 @@
+"""
+Tests for the parallel search: page order, the page limit, events found by several searches,
+and when it stops loading more results pages.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("crawl4ai")
+pytest.importorskip("selenium")
+
+from Parallel_Event_Finder import ParallelEventFinder
+
+SEARCH = "https://www.eventbrite.ca/d/canada--ontario/stand-up-comedy/"
+
+def _links(page_number):
+    return [f"https://www.eventbrite.ca/e/show-tickets-{page_number}{number:03d}" for number in range(3)]
+
+@pytest.fixture
+def finder(tmp_path, monkeypatch):
+    # The pace and any diagnostics are written below the current folder
+    monkeypatch.chdir(tmp_path)
+    finder = ParallelEventFinder(concurrency=1, max_rate=0)
+    finder.loaded = []
+    return finder
+
+def _serve(finder, pages):
+    """Answer each results page with the (links, html) given for it, counting every load."""
+    async def load_links(url):
+        page_number = int(url.rsplit("=", 1)[1])
+        finder.loaded.append(page_number)
+        return pages.get(page_number, (_links(page_number), "<html>results</html>"))
+    finder._load_links = load_links
+
+def test_page_without_links_after_every_retry_ends_the_search(finder):
+    _serve(finder, {2: ([], "<html>Checking your browser</html>")})
+
+    links = asyncio.run(finder.search_multiple_pages(SEARCH, start=1, retry=2))
+
+    assert links == _links(1)
+    # Page 2 was tried twice, and no page after it was loaded
+    assert finder.loaded == [1, 2, 2]
+
+def test_page_that_fails_to_load_does_not_end_the_search(finder):
+    async def load_links(url):
+        page_number = int(url.rsplit("=", 1)[1])
+        finder.loaded.append(page_number)
+        if page_number == 2:
+            raise RuntimeError("connection reset")
+        return _links(page_number), "<html>results</html>"
+    finder._load_links = load_links
+
+    links = asyncio.run(finder.search_multiple_pages(SEARCH, start=1, end=3, retry=1))
+
+    assert links == _links(1) + _links(3)
+
+def test_links_come_out_in_page_order_when_pages_finish_out_of_order(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    finder = ParallelEventFinder(concurrency=3, max_rate=0)
+    loading = {"now": 0, "most": 0}
+    found = []
+
+    async def load_links(url):
+        page_number = int(url.rsplit("=", 1)[1])
+        loading["now"] += 1
+        loading["most"] = max(loading["most"], loading["now"])
+        # Later pages load faster than earlier ones
+        await asyncio.sleep(0.002 * (6 - page_number))
+        loading["now"] -= 1
+        return _links(page_number), '<script>{"page_count": 5}</script>'
+    finder._load_links = load_links
+
+    links = asyncio.run(finder.search_multiple_pages(SEARCH, start=1, on_links=found.extend))
+
+    assert links == [url for page_number in range(1, 6) for url in _links(page_number)]
+    assert sorted(found) == sorted(links)
+    assert loading["most"] == 3
+
+def test_pages_past_the_page_count_are_not_loaded(finder):
+    _serve(finder, {1: (_links(1), '<script>{"page_count": 3, "page_number": 1}</script>')})
+
+    links = asyncio.run(finder.search_multiple_pages(SEARCH, start=1, end=10))
+
+    assert finder.loaded == [1, 2, 3]
+    assert len(links) == 9
+
+def test_event_found_by_several_searches_is_kept_once(finder):
+    improv = "https://www.eventbrite.ca/d/canada--ontario/improv/"
+
+    async def load_links(url):
+        page_number = int(url.rsplit("=", 1)[1])
+        if url.startswith(improv):
+            # The improv search finds one of the comedy search's events, under another address
+            return [_links(1)[1] + "?aff=ebdssbdestsearch", _links(9)[0]], '<script>{"page_count": 1}</script>'
+        return _links(page_number), '<script>{"page_count": 1}</script>'
+    finder._load_links = load_links
+
+    links = asyncio.run(finder.search_seeds([SEARCH, improv]))
+
+    assert links == _links(1) + [_links(9)[0]]
+    assert [len(seed_links) for _, seed_links, _ in finder.seed_results] == [3, 2]
@@ -0,0 +1,104 @@
+"""
+Tests for the adaptive rate controller: speeding up, slowing down, Retry-After and the saved pace.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from Shared_Tools_Both_Steps_Use.Rate_Limiter import DEFAULT_RETRY_AFTER, AdaptiveRateController, parse_retry_after
+
+URL = "https://www.eventbrite.ca/e/late-night-laughs-tickets-123456789"
+
+def _controller(**options):
+    options.setdefault("start_rate", 10)
+    return AdaptiveRateController(60, min_rate=2, **options)
+
+def _record(controller, times=1, **response):
+    for _ in range(times):
+        controller.record(URL, **response)
+
+def test_retry_after_in_seconds_or_as_a_date():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("-5") == 0
+    in_a_minute = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    assert 55 <= parse_retry_after(in_a_minute) <= 60
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("") is None and parse_retry_after(None) is None
+
+def test_pace_goes_up_a_little_after_each_page_that_works():
+    controller = _controller()
+
+    _record(controller, times=3, status=200)
+
+    assert controller.current_rate(URL) == 13
+
+def test_pace_never_goes_above_the_maximum():
+    controller = _controller(start_rate=59.5)
+
+    _record(controller, times=3, status=200)
+
+    assert controller.current_rate(URL) == 60
+
+def test_too_many_requests_halves_the_pace_and_pauses_for_retry_after():
+    controller = _controller(start_rate=40)
+
+    _record(controller, status=429, retry_after="120")
+
+    assert controller.current_rate(URL) == 20
+    pace = controller._pace(URL)
+    assert 119 <= pace.resume_at - time.monotonic() <= 120
+    # The next request waits for the pause, not just for the pace
+    assert controller._reserve(URL) >= 119
+
+def test_a_wave_of_429s_slows_down_only_once():
+    controller = _controller(start_rate=40, max_concurrency=4)
+
+    _record(controller, times=3, status=429, retry_after="30")
+
+    assert controller.current_rate(URL) == 20
+    assert controller._pace(URL).stats["throttled"] == 3
+
+def test_429_without_retry_after_pauses_for_the_default():
+    controller = _controller()
+
+    _record(controller, status=503)
+
+    assert controller._pace(URL).resume_at - time.monotonic() > DEFAULT_RETRY_AFTER - 1
+
+def test_pace_slows_down_when_too_many_requests_fail():
+    controller = _controller(start_rate=20)
+
+    _record(controller, times=3, status=200)
+    _record(controller, times=2, error=True)
+
+    # 2 failures out of the last 5 requests is more than the 20% allowed
+    assert controller.current_rate(URL) == pytest.approx(23 * 0.75)
+
+def test_pace_never_goes_below_the_minimum():
+    controller = _controller(start_rate=3)
+
+    _record(controller, status=429, retry_after="0")
+
+    assert controller.current_rate(URL) == 2
+
+def test_website_gets_no_more_requests_in_flight_than_allowed():
+    controller = _controller(max_concurrency=1)
+
+    assert controller._reserve(URL) is not None
+    assert controller._reserve(URL) is None
+    controller.release(URL)
+    assert controller._reserve(URL) is not None
+
+def test_pace_and_pause_are_saved_for_the_next_run(tmp_path):
+    state_file = str(tmp_path / "host_pace.json")
+    controller = _controller(start_rate=40, state_file=state_file)
+    _record(controller, status=429, retry_after="300")
+    controller.close()
+
+    next_run = _controller(state_file=state_file)
+
+    assert next_run.current_rate(URL) == 20
+    assert next_run._pace(URL).resume_at - time.monotonic() > 290
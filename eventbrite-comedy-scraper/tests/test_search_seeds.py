@@ -0,0 +1,31 @@
+"""
+Tests for building the location and category searches and reporting what each one found.
+"""
+
+import logging
+
+from Search_Seeds import build_search_urls, log_seed_yield
+
+def test_one_search_for_every_location_in_every_category():
+    assert build_search_urls(["canada--toronto", " canada--ottawa"], ["stand-up-comedy", "improv "]) == [
+        "https://www.eventbrite.ca/d/canada--toronto/stand-up-comedy/",
+        "https://www.eventbrite.ca/d/canada--toronto/improv/",
+        "https://www.eventbrite.ca/d/canada--ottawa/stand-up-comedy/",
+        "https://www.eventbrite.ca/d/canada--ottawa/improv/",
+    ]
+
+def test_yield_counts_events_new_to_each_search(caplog):
+    show = "https://www.eventbrite.ca/e/show-tickets-123456789"
+    open_mic = "https://www.eventbrite.ca/e/open-mic-tickets-222222222"
+    seed_results = [
+        ("toronto/comedy", [show + "?aff=x", open_mic], 2),
+        ("toronto/improv", [show], 1),
+    ]
+
+    with caplog.at_level(logging.INFO):
+        log_seed_yield(seed_results)
+
+    assert "(2 different events in total)" in caplog.text
+    assert "toronto/comedy: 2 pages, 2 events, 2 new (1.0 new per page), 1 found by no other search" in caplog.text
+    assert "toronto/improv: 1 pages, 1 events, 0 new (0.0 new per page), 0 found by no other search" in caplog.text
+    assert "Every event of toronto/improv was also found by another search" in caplog.text
@@ -0,0 +1,77 @@
+"""
+Tests for reading event fields from a page's JSON-LD and OpenGraph data.
+"""
+
+import json
+
+from Structured_Data_Reader import extract_structured_event_data
+
+URL = "https://www.eventbrite.ca/e/late-night-laughs-tickets-123456789"
+
+def _page(event=None, meta="", body=""):
+    script = f'<script type="application/ld+json">{json.dumps(event)}</script>' if event else ""
+    return f"<html><head>{script}{meta}</head><body>{body}</body></html>"
+
+EVENT = {
+    "@context": "https://schema.org",
+    "@type": "ComedyEvent",
+    "name": "Late  Night\nLaughs",
+    "description": "Five comics. One stage. No filler! Doors open at 7. Bring a friend.",
+    "startDate": "2025-05-10T20:00:00-04:00",
+    "location": {
+        "@type": "Place",
+        "name": "The Rivoli",
+        "address": {"@type": "PostalAddress", "streetAddress": "334 Queen St W",
+                    "addressLocality": "Toronto", "addressRegion": "ON", "postalCode": "M5V 2A2"},
+    },
+    "organizer": [{"@type": "Organization", "name": "Rivoli Comedy", "email": "laughs@rivoli.ca"},
+                  {"@type": "Person", "name": "Sam Jones"}],
+}
+
+def test_json_ld_event_fields_are_mapped():
+    data = extract_structured_event_data(_page(EVENT), URL)
+
+    assert data == {
+        "title": "Late Night Laughs",
+        "summary": "Five comics. One stage. No filler!",
+        "date": "2025-05-10 8:00 PM",
+        "venue": "The Rivoli",
+        "address": "334 Queen St W, Toronto, ON, M5V 2A2",
+        "city": "Toronto",
+        "province": "Ontario",
+        "producers": "Rivoli Comedy, Sam Jones",
+        "email": "laughs@rivoli.ca",
+        "event_link": URL,
+    }
+
+def test_event_inside_a_graph_is_found():
+    graph = {"@context": "https://schema.org", "@graph": [{"@type": "WebPage", "name": "Eventbrite"}, EVENT]}
+
+    assert extract_structured_event_data(_page(graph), URL)["venue"] == "The Rivoli"
+
+def test_opengraph_tags_fill_in_missing_basics():
+    meta = ('<meta property="og:title" content="Late Night Laughs">'
+            '<meta property="og:description" content="Stand-up at The Rivoli.">'
+            '<meta property="event:start_time" content="2025-05-10">')
+
+    data = extract_structured_event_data(_page(meta=meta), URL)
+
+    assert data == {"title": "Late Night Laughs", "summary": "Stand-up at The Rivoli.",
+                    "date": "2025-05-10", "event_link": URL}
+
+def test_invalid_json_ld_is_skipped():
+    html = ('<html><head><script type="application/ld+json">{not json</script>'
+            '<meta property="og:title" content="Late Night Laughs"></head></html>')
+
+    assert extract_structured_event_data(html, URL)["title"] == "Late Night Laughs"
+
+def test_email_is_left_for_the_ai_when_the_page_has_none():
+    data = extract_structured_event_data(_page({"@type": "Event", "name": "Late Night Laughs"}), URL)
+
+    assert "email" not in data
+
+def test_contact_email_in_the_page_text_is_used():
+    html = _page({"@type": "Event", "name": "Late Night Laughs"},
+                 body="<p>Questions? Write to laughs@rivoli.ca or help@eventbrite.com</p>")
+
+    assert extract_structured_event_data(html, URL)["email"] == "laughs@rivoli.ca"
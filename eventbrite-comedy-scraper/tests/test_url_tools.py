@@ -0,0 +1,60 @@
+"""
+Tests for recognizing the same event under different website addresses.
+"""
+
+import pytest
+
+from Shared_Tools_Both_Steps_Use.Url_Tools import (
+    canonicalize_event_url, dedupe_event_links, event_key, extract_event_id
+)
+
+URL = "https://www.eventbrite.ca/e/late-night-laughs-tickets-123456789012"
+
+@pytest.mark.parametrize("linked", [
+    URL + "?aff=ebdssbdestsearch",
+    URL + "/",
+    URL + "#tickets",
+    "HTTPS://WWW.EVENTBRITE.CA/e/late-night-laughs-tickets-123456789012",
+    "  " + URL + "?aff=erelexpmlt&keep_tld=1  ",
+])
+def test_tracking_parameters_and_formatting_are_removed(linked):
+    assert canonicalize_event_url(linked) == URL
+
+def test_address_without_a_scheme_gets_https():
+    assert canonicalize_event_url("//www.eventbrite.ca/e/show-tickets-123456789") == \
+        "https://www.eventbrite.ca/e/show-tickets-123456789"
+
+@pytest.mark.parametrize("url, event_id", [
+    (URL, "123456789012"),
+    ("https://www.eventbrite.com/e/123456789012", "123456789012"),
+    ("https://www.eventbrite.ca/e/late-night-laughs-tickets-123456789012/?aff=x", "123456789012"),
+    ("https://www.eventbrite.ca/d/canada--ontario/comedy/", None),
+    ("https://www.eventbrite.ca/e/tickets-12345", None),
+])
+def test_event_id_is_read_from_the_address(url, event_id):
+    assert extract_event_id(url) == event_id
+
+def test_same_event_id_is_the_same_event_on_any_domain_or_title():
+    assert event_key(URL) == "eventbrite:123456789012"
+    assert event_key("https://www.eventbrite.com/e/renamed-show-tickets-123456789012?aff=x") == event_key(URL)
+
+def test_address_without_an_event_id_is_keyed_by_its_standard_form():
+    url = "https://www.eventbrite.ca/o/rivoli-comedy-1234/?aff=x"
+
+    assert event_key(url) == "https://www.eventbrite.ca/o/rivoli-comedy-1234"
+
+def test_duplicates_are_removed_keeping_the_first_address_and_the_order():
+    links = [
+        URL + "?aff=ebdssbdestsearch",
+        "https://www.eventbrite.ca/e/open-mic-tickets-222222222",
+        "",
+        "https://www.eventbrite.com/e/late-night-laughs-tickets-123456789012",
+        "https://www.eventbrite.ca/e/open-mic-tickets-222222222/",
+        "https://www.eventbrite.ca/e/improv-night-tickets-333333333",
+    ]
+
+    assert dedupe_event_links(links) == [
+        URL,
+        "https://www.eventbrite.ca/e/open-mic-tickets-222222222",
+        "https://www.eventbrite.ca/e/improv-night-tickets-333333333",
+    ]
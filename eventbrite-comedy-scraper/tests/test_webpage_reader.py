@@ -0,0 +1,54 @@
+"""
+Tests for reading event links and the page count from search results pages.
+"""
+
+import pytest
+
+from Webpage_Reader import extract_event_links_from_html, extract_pagination_info
+
+def test_event_card_links_are_read_in_page_order():
+    html = """
+    <a class="eds-event-card-content__action-link" href="https://www.eventbrite.ca/e/show-a-tickets-1001">A</a>
+    <a href="https://www.eventbrite.ca/organizer/">Create events</a>
+    <a class="eds-event-card-content__action-link" href="/e/show-b-tickets-1002?aff=ebdssbdestsearch">B</a>
+    <a href="/e/suggested-show-tickets-9999">Suggested</a>
+    """
+
+    assert extract_event_links_from_html(html) == [
+        "https://www.eventbrite.ca/e/show-a-tickets-1001",
+        "https://www.eventbrite.ca/e/show-b-tickets-1002?aff=ebdssbdestsearch",
+    ]
+
+def test_any_event_link_is_read_when_the_cards_have_another_layout():
+    html = """
+    <section class="event-card"><a href="/e/show-a-tickets-1001">A</a></section>
+    <a href="https://www.eventbrite.ca/d/canada--ontario/comedy/">Comedy</a>
+    <a>No address</a>
+    <section class="event-card"><a href="https://www.eventbrite.com/e/show-b-tickets-1002">B</a></section>
+    """
+
+    assert extract_event_links_from_html(html) == [
+        "https://www.eventbrite.ca/e/show-a-tickets-1001",
+        "https://www.eventbrite.com/e/show-b-tickets-1002",
+    ]
+
+def test_page_without_events_has_no_links():
+    assert extract_event_links_from_html("<html><body><h1>Comedy</h1></body></html>") == []
+
+@pytest.mark.parametrize("html, total_pages", [
+    # The search data Eventbrite embeds in the page
+    ('<script>window.__SERVER_DATA__ = {"pagination": {"page_number": 2, "page_count": 14}}</script>', 14),
+    # The "1 of 12" text of the pagination bar
+    ('<nav aria-label="Pagination"><span>1 of 12</span></nav>', 12),
+    # The highest page linked from the pagination bar
+    ('<ul class="eds-pagination"><a href="?page=2">2</a><a href="/d/comedy/?q=x&page=7">7</a></ul>', 7),
+])
+def test_page_count_is_read_from_the_results_page(html, total_pages):
+    pagination = extract_pagination_info(html)
+
+    assert pagination["found"]
+    assert pagination["total_pages"] == total_pages
+
+def test_page_count_is_unknown_without_pagination():
+    assert extract_pagination_info("<p>Page 3 of the list: 1 of 12 comics</p>")["found"] is False
+    assert extract_pagination_info("")["found"] is False
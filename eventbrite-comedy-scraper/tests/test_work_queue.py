@@ -0,0 +1,126 @@
+"""
+Tests for leasing links from the shared work queue, using a temporary SQLite file.
+"""
+
+import pytest
+
+import Work_Queue
+from Work_Queue import WorkQueue
+
+LINKS = [f"https://www.eventbrite.ca/e/show-tickets-{1000 + number}" for number in range(6)]
+
+class FakeClock:
+    """A clock the test moves forward by hand."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(Work_Queue, "time", clock)
+    return clock
+
+@pytest.fixture
+def queue_path(tmp_path, clock):
+    path = str(tmp_path / "work_queue.sqlite3")
+    coordinator = WorkQueue(path, input_file=str(tmp_path / "links.csv"))
+    coordinator.start(LINKS, output_file="events.csv")
+    yield path
+    coordinator.close()
+
+def _event(url):
+    return {"event_link": url, "title": f"Show {url[-4:]}"}
+
+def test_two_workers_lease_without_overlap(queue_path):
+    first, second = WorkQueue(queue_path), WorkQueue(queue_path)
+
+    first_links = first.lease("worker-1", batch_size=4, lease_seconds=300)
+    second_links = second.lease("worker-2", batch_size=4, lease_seconds=300)
+
+    assert first_links == LINKS[:4]
+    assert second_links == LINKS[4:]
+    assert second.lease("worker-2", batch_size=4, lease_seconds=300) == []
+
+def test_expired_lease_is_reclaimed(queue_path, clock):
+    queue = WorkQueue(queue_path)
+    leased = queue.lease("worker-1", batch_size=2, lease_seconds=300)
+
+    clock.now += 299
+    assert queue.reclaim_expired() == 0
+
+    clock.now += 2
+    assert queue.reclaim_expired() == 2
+    assert queue.lease("worker-2", batch_size=2, lease_seconds=300) == leased
+
+def test_heartbeat_keeps_lease_alive(queue_path, clock):
+    queue = WorkQueue(queue_path)
+    queue.lease("worker-1", batch_size=2, lease_seconds=300)
+
+    clock.now += 200
+    assert queue.heartbeat("worker-1", lease_seconds=300) == 2
+    clock.now += 200
+    assert queue.reclaim_expired() == 0
+
+def test_late_result_from_reclaimed_lease_is_saved_once(queue_path, clock):
+    slow, fast = WorkQueue(queue_path), WorkQueue(queue_path)
+    leased = slow.lease("slow-worker", batch_size=2, lease_seconds=300)
+
+    # The slow worker stops sending heartbeats; its links go to another worker
+    clock.now += 301
+    assert fast.lease("fast-worker", batch_size=2, lease_seconds=300) == leased
+    assert fast.save_results([_event(url) for url in leased], "fast-worker") == 2
+
+    # The slow worker delivers the same batch late, then once more
+    assert slow.save_results([_event(url) for url in leased], "slow-worker") == 0
+    assert slow.save_results([_event(url) for url in leased], "slow-worker") == 0
+
+    results = fast.results()
+    assert [event["event_link"] for event in results] == leased
+    assert fast.counts()["done"] == 2
+
+def test_worker_cannot_change_links_after_its_lease_was_reclaimed(queue_path, clock):
+    slow, fast = WorkQueue(queue_path), WorkQueue(queue_path)
+    url = slow.lease("slow-worker", batch_size=1, lease_seconds=300)[0]
+
+    clock.now += 301
+    assert fast.lease("fast-worker", batch_size=1, lease_seconds=300) == [url]
+    fast.mark_in_flight(url)
+
+    # The slow worker finally gives up on the link it no longer holds
+    slow.mark_in_flight(url)
+    slow.mark_failed(url, "Timed out")
+
+    assert fast.counts()["in-flight"] == 1
+    assert fast.heartbeat("fast-worker", lease_seconds=300) == 1
+    assert fast.release("fast-worker") == 1
+
+def test_links_without_workers_are_updated_as_before(queue_path):
+    queue = WorkQueue(queue_path)
+    queue.mark_in_flight(LINKS[0])
+    queue.mark_failed(LINKS[1], "No event details extracted")
+
+    counts = queue.counts()
+    assert counts["in-flight"] == 1 and counts["failed"] == 1
+
+def test_same_event_under_two_addresses_is_saved_once(queue_path):
+    queue = WorkQueue(queue_path)
+    url = LINKS[0]
+    tracked = f"{url}?aff=newsletter"
+
+    assert queue.save_results([_event(url), _event(tracked)], "worker-1") == 1
+    assert len(queue.results()) == 1
+
+def test_unfinished_links_are_released_as_failed(queue_path):
+    queue = WorkQueue(queue_path)
+    queue.lease("worker-1", batch_size=3, lease_seconds=300)
+
+    assert queue.release("worker-1") == 3
+    # Failed links are taken again while they have attempts left
+    assert queue.unfinished() == len(LINKS)
+
+def test_worker_knows_the_coordinators_output_file(queue_path):
+    assert WorkQueue(queue_path).output_file() == "events.csv"